@@ -115,7 +115,7 @@ def get_job_details(job_id):
 def get_videos(mode=None, value=None, limit=50):
     """Get videos list"""
     try:
-        params = {"limit": limit}
+        params = {"limit": limit, "include_total": True}
         if mode:
             params["mode"] = mode
         if value:
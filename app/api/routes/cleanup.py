@@ -1,9 +1,11 @@
 """
 Cleanup API endpoints
 """
-from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from app.scheduler.cleanup_task import cleanup_task
+from app.scheduler.orphan_reconciler import orphan_reconciler
 from app.core.logging import log
 
 router = APIRouter(prefix="/api/v1/cleanup", tags=["cleanup"])
@@ -13,28 +15,79 @@ class CleanupStatus(BaseModel):
     running: bool
     max_age_hours: int
     cleanup_interval_seconds: int
+    high_watermark: float
+    low_watermark: float
+    disk_usage: float
+    last_report: Optional[Dict[str, Any]] = None
+    last_orphan_report: Optional[Dict[str, Any]] = None
 
 
 @router.get("/status", response_model=CleanupStatus)
 async def get_cleanup_status():
-    """Get cleanup task status"""
+    """Get cleanup task status, current disk usage and the last cycle's report"""
     return CleanupStatus(
         running=cleanup_task.running,
         max_age_hours=cleanup_task.max_age_hours,
-        cleanup_interval_seconds=cleanup_task.cleanup_interval
+        cleanup_interval_seconds=cleanup_task.cleanup_interval,
+        high_watermark=cleanup_task.high_watermark,
+        low_watermark=cleanup_task.low_watermark,
+        disk_usage=cleanup_task.disk_usage()[0],
+        last_report=cleanup_task.last_report,
+        last_orphan_report=orphan_reconciler.last_report
     )
 
 
 @router.post("/run-now")
-async def trigger_cleanup_now():
-    """Manually trigger cleanup cycle"""
+async def trigger_cleanup_now(
+    dry_run: bool = Query(False, description="Report what would be deleted without deleting")
+):
+    """
+    Manually trigger cleanup cycle
+    
+    With dry_run=true the cycle runs inline and its report is returned.
+    """
     try:
+        if dry_run:
+            report = await cleanup_task.run_cleanup(dry_run=True)
+            if report is None:
+                raise HTTPException(status_code=500, detail="Cleanup dry run failed, see logs")
+            return {
+                "success": True,
+                "report": report
+            }
+        
         import asyncio
         asyncio.create_task(cleanup_task.run_cleanup())
         return {
             "success": True,
             "message": "Cleanup cycle started"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error triggering cleanup: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/orphans")
+async def reconcile_orphans(
+    dry_run: bool = Query(False, description="Report what would be reclaimed without deleting")
+):
+    """
+    Scan the downloads tree and reclaim files no video points at
+    
+    Runs inline and returns the report (files scanned, reclaimed bytes per kind).
+    """
+    try:
+        report = await orphan_reconciler.run(dry_run=dry_run)
+        if report is None:
+            raise HTTPException(status_code=500, detail="Orphan scan failed, see logs")
+        return {
+            "success": True,
+            "report": report
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error reconciling orphans: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -2,7 +2,7 @@
 Database management endpoints
 """
 from fastapi import APIRouter, HTTPException
-from app.models.database import init_db, engine, Base
+from app.models.database import init_db, run_migrations, engine, Base
 from app.core.logging import log
 
 router = APIRouter(prefix="/api/v1/database", tags=["database"])
@@ -39,14 +39,17 @@ async def recreate_database():
         
         # Import models to register them
         from app.models import models  # noqa: F401
+        from app.models.search import drop_search_index
         
         async with engine.begin() as conn:
             # Drop all tables
+            await conn.run_sync(drop_search_index)
             await conn.run_sync(Base.metadata.drop_all)
+            await conn.exec_driver_sql("DROP TABLE IF EXISTS alembic_version")
             log.info("All tables dropped")
             
             # Create all tables
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(run_migrations)
             log.info("All tables recreated")
         
         return {
@@ -0,0 +1,58 @@
+"""
+Bulk export endpoints
+"""
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.models.models import VideoStatus
+from app.utils.archive_export import EXPORT_FORMATS, EXPORT_TABLES, pyarrow_available, stream_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    format: str = "parquet",
+    mode: str = None,
+    value: str = None,
+    author_username: str = None,
+    hashtag: str = None,
+    status: VideoStatus = None,
+    chunk_size: int = Query(None, ge=100, le=100000),
+):
+    """
+    Stream a whole table for offline analysis
+    
+    - **table**: `videos` or `jobs`
+    - **format**: `parquet` (zstd), `arrow` (IPC stream, zstd) or `ndjson.gz`
+    - **mode/value/author_username/hashtag/status**: Same filters as GET /videos (videos only)
+    - **chunk_size**: Rows per Parquet row group / Arrow batch
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table, expected one of {list(EXPORT_TABLES)}")
+    
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format, expected one of {list(EXPORT_FORMATS)}")
+    
+    if format != 'ndjson.gz' and not pyarrow_available():
+        raise HTTPException(status_code=501, detail="pyarrow is not installed, use format=ndjson.gz")
+    
+    filters = {}
+    if table == 'videos':
+        filters = dict(
+            mode=mode,
+            value=value,
+            author_username=author_username,
+            hashtag=hashtag,
+            status=status.value if status else None
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"{table}_{datetime.utcnow():%Y%m%d_%H%M%S}{extension}"
+    
+    return StreamingResponse(
+        stream_export(table, format, chunk_size=chunk_size, **filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,16 +1,19 @@
 import uuid
+import json
 import asyncio
-from typing import List
+from typing import List, Literal
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
+from sqlalchemy.orm import selectinload
+from app.models.database import get_db, get_read_db
 from app.models.models import Job, Video, JobStatus, VideoStatus
 from app.models.schemas import (
     JobCreate, JobResponse, JobStatusResponse, VideoResponse,
     VideoQuery, VideoListResponse, ErrorResponse
 )
 from app.workers.job_processor import JobProcessor
+from app.utils.ndjson import ndjson_response
 from app.core.logging import log
 from app.core.job_queue import job_queue
 
@@ -68,10 +71,16 @@ async def create_job(
 @router.get("/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: str,
-    db: AsyncSession = Depends(get_db)
+    include_raw: bool = False,
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get detailed job status including all videos and Drive links
+    
+    - **include_raw**: Include the full TikTok metadata JSON for each video
+    - **format**: `ndjson` streams `{"job": ...}` followed by one video per line
+      (Drive links can be built from each video's drive_file_id)
     """
     try:
         # Get job
@@ -82,9 +91,15 @@ async def get_job_status(
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Get videos
-        result = await db.execute(
-            select(Video).where(Video.job_id == job_id)
-        )
+        query = select(Video).where(Video.job_id == job_id)
+        if include_raw:
+            query = query.options(selectinload(Video.raw_metadata_row))
+        
+        if format == "ndjson":
+            header = json.dumps({'job': JobResponse.model_validate(job).model_dump(mode='json')})
+            return ndjson_response(query, VideoResponse, header=header)
+        
+        result = await db.execute(query)
         videos = result.scalars().all()
         
         # Build Drive links
@@ -116,10 +131,13 @@ async def list_jobs(
     status: JobStatus = None,
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all jobs with optional status filter
+    
+    - **format**: `ndjson` streams one job per line instead of a JSON array
     """
     try:
         query = select(Job).order_by(Job.created_at.desc())
@@ -129,6 +147,9 @@ async def list_jobs(
         
         query = query.limit(limit).offset(offset)
         
+        if format == "ndjson":
+            return ndjson_response(query, JobResponse)
+        
         result = await db.execute(query)
         jobs = result.scalars().all()
         
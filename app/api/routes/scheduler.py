@@ -3,7 +3,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
+from app.models.database import get_db, get_read_db
 from app.models.models import ScheduledJob
 from app.models.schemas import ScheduledJobCreate, ScheduledJobResponse
 from app.core.logging import log
@@ -48,7 +48,7 @@ async def create_scheduled_job(
 @router.get("", response_model=List[ScheduledJobResponse])
 async def list_scheduled_jobs(
     enabled: bool = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all scheduled jobs
@@ -72,7 +72,7 @@ async def list_scheduled_jobs(
 @router.get("/{job_id}", response_model=ScheduledJobResponse)
 async def get_scheduled_job(
     job_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific scheduled job
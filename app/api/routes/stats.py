@@ -1,8 +1,11 @@
+import time
+from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
-from app.models.models import Job, Video, ScheduledJob, JobStatus, VideoStatus
+from app.models.database import get_db, get_read_db
+from app.models.models import JobStatus, VideoStatus
+from app.models.counters import aggregate_counters, read_counters
 from app.models.schemas import SystemStats, HealthCheck
 from app.core.config import settings
 from app.core.logging import log
@@ -10,84 +13,52 @@ from app.core.logging import log
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
 
+# Cached response shared by all /stats callers: (expires_at, stats)
+_stats_cache: Tuple[float, Optional[SystemStats]] = (0.0, None)
+
+
+def _stats_from_counters(counters: Dict[str, int]) -> SystemStats:
+    """Build the response from counter names like 'jobs.pending'"""
+    return SystemStats(
+        total_jobs=counters['jobs.total'],
+        pending_jobs=counters[f"jobs.{JobStatus.PENDING.value}"],
+        running_jobs=counters[f"jobs.{JobStatus.RUNNING.value}"],
+        completed_jobs=counters[f"jobs.{JobStatus.COMPLETED.value}"],
+        failed_jobs=counters[f"jobs.{JobStatus.FAILED.value}"],
+        total_videos=counters['videos.total'],
+        downloaded_videos=counters[f"videos.{VideoStatus.DOWNLOADED.value}"],
+        uploaded_videos=counters[f"videos.{VideoStatus.UPLOADED.value}"],
+        failed_videos=counters[f"videos.{VideoStatus.FAILED.value}"],
+        total_storage_bytes=counters['videos.storage_bytes'],
+        scheduled_jobs_count=counters['scheduled.total'],
+        active_scheduled_jobs=counters['scheduled.enabled']
+    )
+
+
 @router.get("", response_model=SystemStats)
-async def get_system_stats(db: AsyncSession = Depends(get_db)):
+async def get_system_stats(db: AsyncSession = Depends(get_read_db)):
     """
     Get overall system statistics
+    
+    Reads materialized counters when STATS_USE_COUNTERS is on, otherwise
+    aggregates with one GROUP BY query per table. Results are cached for
+    STATS_CACHE_TTL_SECONDS so dashboard polling doesn't hit the database.
     """
+    global _stats_cache
+    
+    expires_at, cached = _stats_cache
+    if cached and time.monotonic() < expires_at:
+        return cached
+    
     try:
-        # Job statistics
-        total_jobs_result = await db.execute(select(func.count(Job.id)))
-        total_jobs = total_jobs_result.scalar()
-        
-        pending_jobs_result = await db.execute(
-            select(func.count(Job.id)).where(Job.status == JobStatus.PENDING.value)
-        )
-        pending_jobs = pending_jobs_result.scalar()
-        
-        running_jobs_result = await db.execute(
-            select(func.count(Job.id)).where(Job.status == JobStatus.RUNNING.value)
-        )
-        running_jobs = running_jobs_result.scalar()
-        
-        completed_jobs_result = await db.execute(
-            select(func.count(Job.id)).where(Job.status == JobStatus.COMPLETED.value)
-        )
-        completed_jobs = completed_jobs_result.scalar()
-        
-        failed_jobs_result = await db.execute(
-            select(func.count(Job.id)).where(Job.status == JobStatus.FAILED.value)
-        )
-        failed_jobs = failed_jobs_result.scalar()
-        
-        # Video statistics
-        total_videos_result = await db.execute(select(func.count(Video.id)))
-        total_videos = total_videos_result.scalar()
-        
-        downloaded_videos_result = await db.execute(
-            select(func.count(Video.id)).where(Video.status == VideoStatus.DOWNLOADED.value)
-        )
-        downloaded_videos = downloaded_videos_result.scalar()
-        
-        uploaded_videos_result = await db.execute(
-            select(func.count(Video.id)).where(Video.status == VideoStatus.UPLOADED.value)
-        )
-        uploaded_videos = uploaded_videos_result.scalar()
-        
-        failed_videos_result = await db.execute(
-            select(func.count(Video.id)).where(Video.status == VideoStatus.FAILED.value)
-        )
-        failed_videos = failed_videos_result.scalar()
-        
-        # Storage statistics
-        total_storage_result = await db.execute(
-            select(func.sum(Video.file_size)).where(Video.file_size.isnot(None))
-        )
-        total_storage = total_storage_result.scalar() or 0
-        
-        # Scheduled jobs
-        scheduled_jobs_result = await db.execute(select(func.count(ScheduledJob.id)))
-        scheduled_jobs_count = scheduled_jobs_result.scalar()
-        
-        active_scheduled_result = await db.execute(
-            select(func.count(ScheduledJob.id)).where(ScheduledJob.enabled == True)
-        )
-        active_scheduled_jobs = active_scheduled_result.scalar()
-        
-        return SystemStats(
-            total_jobs=total_jobs,
-            pending_jobs=pending_jobs,
-            running_jobs=running_jobs,
-            completed_jobs=completed_jobs,
-            failed_jobs=failed_jobs,
-            total_videos=total_videos,
-            downloaded_videos=downloaded_videos,
-            uploaded_videos=uploaded_videos,
-            failed_videos=failed_videos,
-            total_storage_bytes=total_storage,
-            scheduled_jobs_count=scheduled_jobs_count,
-            active_scheduled_jobs=active_scheduled_jobs
-        )
+        if settings.STATS_USE_COUNTERS:
+            counters = await read_counters(db)
+        else:
+            counters = await aggregate_counters(db)
+        
+        stats = _stats_from_counters(counters)
+        _stats_cache = (time.monotonic() + settings.STATS_CACHE_TTL_SECONDS, stats)
+        return stats
         
     except Exception as e:
         log.error(f"Error getting system stats: {str(e)}")
@@ -1,19 +1,84 @@
-from typing import List
-from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
-from sqlalchemy import select, func, or_
+import base64
+import time
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
+from sqlalchemy.orm import selectinload
+from app.models.database import get_db, get_read_db
 from app.models.models import Video, VideoStatus
-from app.models.schemas import VideoResponse, VideoQuery, VideoListResponse
+from app.models.filters import apply_video_filters
+from app.models.schemas import VideoResponse, VideoQuery, VideoListResponse, VideoSearchResponse
+from app.models.search import search_videos as full_text_search
+from app.scheduler.access_tracker import access_tracker
+from app.storage.media_resolver import media_resolver
 from app.workers.job_processor import JobProcessor
+from app.utils.ndjson import ndjson_response
 from app.core.logging import log
 from app.core.config import settings
 
 router = APIRouter(prefix="/videos", tags=["Videos"])
 
 
+# Cached totals per filter set: key -> (expires_at, total)
+_count_cache: Dict[Tuple, Tuple[float, int]] = {}
+COUNT_CACHE_MAX_ENTRIES = 1000
+
+
+def encode_cursor(video: Video) -> str:
+    """Opaque cursor pointing just past a video in (scraped_at, id) order"""
+    scraped_at = video.scraped_at.isoformat() if video.scraped_at else ""
+    raw = f"{scraped_at}|{video.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """Parse a cursor from encode_cursor (scraped_at is None for undated videos)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        scraped_at, video_id = raw.split('|', 1)
+        return (datetime.fromisoformat(scraped_at) if scraped_at else None), video_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(query, cursor: str):
+    """Restrict a newest-first video query (undated videos last) to rows after the cursor"""
+    cursor_scraped_at, cursor_id = decode_cursor(cursor)
+    if cursor_scraped_at is None:
+        return query.where(Video.scraped_at.is_(None), Video.id < cursor_id)
+    return query.where(or_(
+        Video.scraped_at < cursor_scraped_at,
+        and_(Video.scraped_at == cursor_scraped_at, Video.id < cursor_id),
+        Video.scraped_at.is_(None)
+    ))
+
+
+async def _count_videos(db: AsyncSession, query, cache_key: Tuple) -> int:
+    """Count the filtered set, cached for VIDEO_COUNT_CACHE_TTL_SECONDS"""
+    now = time.monotonic()
+    cached = _count_cache.get(cache_key)
+    if cached and now < cached[0]:
+        return cached[1]
+    
+    # Unfiltered or status-only totals are already kept as stats counters
+    mode, value, author_username, hashtag, status = cache_key
+    if settings.STATS_USE_COUNTERS and not (mode or value or author_username or hashtag):
+        from app.models.counters import read_counters
+        counters = await read_counters(db)
+        total = counters[f"videos.{status}" if status else 'videos.total']
+    else:
+        total_result = await db.execute(select(func.count()).select_from(query.subquery()))
+        total = total_result.scalar()
+    
+    if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    _count_cache[cache_key] = (now + settings.VIDEO_COUNT_CACHE_TTL_SECONDS, total)
+    return total
+
+
 @router.get("", response_model=VideoListResponse)
 async def list_videos(
     mode: str = None,
@@ -23,7 +88,11 @@ async def list_videos(
     status: VideoStatus = None,
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    include_raw: bool = False,
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Query videos with various filters
@@ -33,64 +102,116 @@ async def list_videos(
     - **author_username**: Filter by video author
     - **hashtag**: Filter by hashtag in video
     - **status**: Filter by video status
+    - **cursor**: `next_cursor` from the previous page (preferred over offset)
+    - **include_total**: Also return the (cached) number of matching videos
+    - **include_raw**: Include the full TikTok metadata JSON for each video
+    - **format**: `ndjson` streams up to `limit` videos, one per line (no total/cursor)
     """
     try:
-        # Build query
-        query = select(Video)
-        
-        # Apply filters
-        if author_username:
-            query = query.where(Video.author_username == author_username)
+        status_value = status.value if status else None
+        query = apply_video_filters(
+            select(Video),
+            mode=mode,
+            value=value,
+            author_username=author_username,
+            hashtag=hashtag,
+            status=status_value
+        )
         
-        if hashtag:
-            # Search in hashtags JSON array
-            query = query.where(Video.hashtags.contains([hashtag]))
+        total = None
+        if include_total and format == "json":
+            total = await _count_videos(db, query, (mode, value, author_username, hashtag, status_value))
         
-        if status:
-            query = query.where(Video.status == status)
+        # Keyset pagination: newest first, id breaks ties between equal timestamps
+        if cursor:
+            query = _after_cursor(query, cursor)
+        elif offset:
+            query = query.offset(offset)
         
-        # Join with Job to filter by mode/value
-        if mode or value:
-            from app.models.models import Job
-            query = query.join(Video.job)
-            
-            if mode:
-                query = query.where(Job.mode == mode)
-            
-            if value:
-                query = query.where(Job.value == value)
+        # NULLS LAST spelled out: PostgreSQL sorts NULLs first for DESC
+        query = query.order_by(Video.scraped_at.desc().nulls_last(), Video.id.desc())
+        if include_raw:
+            query = query.options(selectinload(Video.raw_metadata_row))
         
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        if format == "ndjson":
+            return ndjson_response(query.limit(limit), VideoResponse)
         
-        # Apply pagination
-        query = query.order_by(Video.scraped_at.desc()).limit(limit).offset(offset)
+        query = query.limit(limit + 1)
         
         result = await db.execute(query)
         videos = result.scalars().all()
         
+        next_cursor = None
+        if len(videos) > limit:
+            videos = videos[:limit]
+            next_cursor = encode_cursor(videos[-1])
+        
         return {
             'total': total,
-            'videos': videos
+            'videos': videos,
+            'next_cursor': next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error listing videos: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search", response_model=VideoSearchResponse)
+async def search_videos(
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Full-text search over descriptions, music titles/authors and author nicknames
+    
+    Results are ranked by relevance; the last word matches as a prefix on SQLite.
+    """
+    try:
+        hits = await full_text_search(db, q, limit=limit + 1, offset=offset)
+        
+        next_offset = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_offset = offset + limit
+        
+        result = await db.execute(select(Video).where(Video.id.in_([video_id for video_id, _, _ in hits])))
+        videos = {video.id: video for video in result.scalars().all()}
+        
+        return {
+            'results': [
+                {'video': videos[video_id], 'rank': rank, 'snippet': snippet}
+                for video_id, rank, snippet in hits if video_id in videos
+            ],
+            'next_offset': next_offset
+        }
+        
+    except Exception as e:
+        log.error(f"Error searching videos: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: str,
-    db: AsyncSession = Depends(get_db)
+    include_raw: bool = False,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get detailed information about a specific video
+    
+    - **include_raw**: Include the full TikTok metadata JSON
     """
     try:
-        result = await db.execute(select(Video).where(Video.id == video_id))
+        query = select(Video).where(Video.id == video_id)
+        if include_raw:
+            query = query.options(selectinload(Video.raw_metadata_row))
+        
+        result = await db.execute(query)
         video = result.scalar_one_or_none()
         
         if not video:
@@ -147,10 +268,60 @@ async def retry_video_download(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{video_id}/download")
-async def download_video(
+async def _set_pinned(video_id: str, pinned: bool, db: AsyncSession) -> Video:
+    result = await db.execute(select(Video).where(Video.id == video_id))
+    video = result.scalar_one_or_none()
+    
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    video.pinned = pinned
+    await db.commit()
+    await db.refresh(video)
+    
+    log.info(f"{'Pinned' if pinned else 'Unpinned'} video {video_id}")
+    return video
+
+
+@router.put("/{video_id}/pin", response_model=VideoResponse)
+async def pin_video(
     video_id: str,
     db: AsyncSession = Depends(get_db)
+):
+    """
+    Pin a video so the cleanup task never deletes its local file
+    """
+    try:
+        return await _set_pinned(video_id, True, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error pinning video: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/{video_id}/pin", response_model=VideoResponse)
+async def unpin_video(
+    video_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Unpin a video (its local file becomes eligible for cleanup again)
+    """
+    try:
+        return await _set_pinned(video_id, False, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error unpinning video: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.api_route("/{video_id}/download", methods=["GET", "HEAD"])
+async def download_video(
+    video_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Download video file as binary
@@ -163,33 +334,26 @@ async def download_video(
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
         
-        # Check if video has local path
-        if not video.local_path:
-            raise HTTPException(
-                status_code=404, 
-                detail="Video file not available locally. Video may be uploaded to Drive only."
-            )
-        
-        video_path = Path(video.local_path)
+        if request.method == "GET":
+            access_tracker.touch(video.id)
         
-        # Check if file exists
-        if not video_path.exists():
-            raise HTTPException(
-                status_code=404,
-                detail="Video file not found on disk"
-            )
-        
-        # Return file for download
+        # Return file for download (local file, cache, or Drive fallback)
         filename = f"{video.author_username}_{video.id}.mp4"
         
-        return FileResponse(
-            path=str(video_path),
-            media_type="video/mp4",
-            filename=filename,
+        response = await media_resolver.response(
+            request,
+            video,
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"'
             }
         )
+        if response is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Video file not available locally or on Drive"
+            )
+        
+        return response
         
     except HTTPException:
         raise
@@ -198,13 +362,18 @@ async def download_video(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{video_id}/stream")
+@router.api_route("/{video_id}/stream", methods=["GET", "HEAD"])
 async def stream_video(
     video_id: str,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Stream video file (for preview in browser)
+    
+    Supports Range (single and multiple), If-Range, If-None-Match and
+    If-Modified-Since with a strong ETag from the video ID and file size/mtime.
+    Falls back to Google Drive (redirect or proxy) once the local file is gone.
     """
     try:
         result = await db.execute(select(Video).where(Video.id == video_id))
@@ -213,28 +382,18 @@ async def stream_video(
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
         
-        if not video.local_path:
-            raise HTTPException(
-                status_code=404,
-                detail="Video file not available locally"
-            )
-        
-        video_path = Path(video.local_path)
+        if request.method == "GET":
+            access_tracker.touch(video.id)
         
-        if not video_path.exists():
+        # Range/conditional aware, so browsers can seek and reuse cached bytes
+        response = await media_resolver.response(request, video)
+        if response is None:
             raise HTTPException(
                 status_code=404,
-                detail="Video file not found on disk"
+                detail="Video file not available locally or on Drive"
             )
         
-        # Return file for streaming
-        return FileResponse(
-            path=str(video_path),
-            media_type="video/mp4",
-            headers={
-                "Accept-Ranges": "bytes"
-            }
-        )
+        return response
         
     except HTTPException:
         raise
@@ -30,6 +30,17 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./tiktok_scraper.db"
+    DATABASE_READ_URL: Optional[str] = None  # read-only endpoints (default: DATABASE_URL)
+    DATABASE_ECHO: bool = False  # log every SQL statement
+    DATABASE_POOL_SIZE: int = 10  # PostgreSQL connection pool
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
     
     # Google Drive
     GOOGLE_DRIVE_CREDENTIALS_FILE: str = "./credentials/credentials.json"
@@ -40,15 +51,29 @@ class Settings(BaseSettings):
     
     # TikTok Scraping
     TIKTOK_MAX_VIDEOS_PER_REQUEST: int = 50
-    TIKTOK_REQUEST_DELAY_MIN: float = 3.0
-    TIKTOK_REQUEST_DELAY_MAX: float = 6.0
     TIKTOK_MAX_RETRIES: int = 5
     TIKTOK_TIMEOUT: int = 60
     TIKTOK_USE_PLAYWRIGHT_FALLBACK: bool = True
     
+    # Outbound pacing (per site, adaptive: +increase per success, *decrease on 429/403)
+    OUTBOUND_RATE_PER_SECOND: float = 0.25  # starting rate
+    OUTBOUND_MIN_RATE: float = 0.05
+    OUTBOUND_MAX_RATE: float = 2.0
+    OUTBOUND_BURST: int = 2
+    OUTBOUND_RATE_INCREASE: float = 0.02  # req/s added per successful response
+    OUTBOUND_RATE_DECREASE: float = 0.5  # rate multiplier on 429/403
+    OUTBOUND_BACKOFF_SECONDS: float = 30.0  # pause on 429/403 without Retry-After
+    OUTBOUND_JITTER: float = 0.3  # waits are stretched by up to this fraction
+    OUTBOUND_SITE_RATES: str = "tiktokcdn.com=10,tiktokcdn-us.com=10,tiktokv.com=10,ibytedtos.com=10"  # site=fixed ceiling
+    
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 100
+    # memory:// (per worker), sqlite:///./data/ratelimit.db (workers on one host) or redis://...
+    RATE_LIMIT_STORAGE_URL: str = "memory://"
+    RATE_LIMIT_EXEMPT_PATHS: str = "/,/health,/docs,/redoc,/openapi.json"  # globs, comma-separated
+    # "[METHOD ]glob=cost" rules, first match wins, unmatched requests cost 1
+    RATE_LIMIT_ROUTE_COSTS: str = "GET /api/v1/videos/*/download=5,GET /api/v1/export/*=10,POST /api/v1/jobs*=3"
     
     # Proxy
     USE_PROXY: bool = False
@@ -75,6 +100,58 @@ class Settings(BaseSettings):
     LOCAL_STORAGE_PATH: str = "./downloads"
     MAX_CONCURRENT_DOWNLOADS: int = 5
     
+    # Media serving: none (app serves files; chunked reads under uvicorn, which has
+    # no zero-copy support), x-accel-redirect (nginx) or x-sendfile (Apache/lighttpd)
+    MEDIA_OFFLOAD_MODE: str = "none"
+    MEDIA_ACCEL_PREFIX: str = "/protected-media/"  # internal nginx location aliased to LOCAL_STORAGE_PATH
+    # When the local file is gone: none (404), proxy (stream from Drive) or
+    # redirect (to the Drive link; only works for publicly shared files)
+    MEDIA_DRIVE_FALLBACK: str = "proxy"
+    MEDIA_CACHE_DIR: str = "./downloads/media_cache"  # re-hydrated Drive videos
+    MEDIA_CACHE_MAX_BYTES: int = 0  # 0 disables the re-hydration cache
+    
+    # Retention (local video files)
+    RETENTION_MAX_AGE_HOURS: int = 24  # since last download/stream, or scrape if never accessed
+    RETENTION_HIGH_WATERMARK: float = 0.85  # disk usage fraction that triggers LRU eviction
+    RETENTION_LOW_WATERMARK: float = 0.75  # eviction stops below this
+    RETENTION_INTERVAL_SECONDS: int = 3600  # full age sweep
+    RETENTION_CHECK_SECONDS: int = 60  # disk pressure check
+    RETENTION_BATCH_SIZE: int = 500
+    ACCESS_FLUSH_SECONDS: int = 30  # batch last_accessed_at writes
+    ORPHAN_SCAN_ENABLED: bool = True  # reclaim unreferenced files on each full sweep
+    ORPHAN_GRACE_MINUTES: int = 60  # newer files may still be in use
+    ORPHAN_BATCH_SIZE: int = 1000  # files matched against the DB per query
+    
+    # yt-dlp Workers
+    YTDLP_WORKERS: int = 2
+    YTDLP_JOB_TIMEOUT: int = 600  # seconds
+    YTDLP_BATCH_MODE: bool = True
+    YTDLP_BATCH_PARALLELISM: int = 3
+    YTDLP_CONCURRENT_FRAGMENTS: int = 4
+    YTDLP_DOWNLOAD_ARCHIVE: str = "./downloads/ytdlp_archive.txt"
+    
+    # Subtitles / Transcription
+    WHISPER_MODEL: str = "base"
+    TRANSCRIPTION_WORKERS: int = 1
+    SUBTITLE_CHUNK_SECONDS: int = 600  # audio per Whisper pass for long videos
+    # burn (captions drawn into *_subtitled.mp4) or soft (opt-in: mov_text
+    # track, no re-encode, but many players hide it by default)
+    SUBTITLE_MODE: str = "burn"
+    SUBTITLE_BURN_PRESET: str = "veryfast"
+    SUBTITLE_BURN_CRF: int = 23
+    SUBTITLE_BURN_THREADS: int = 2
+    SUBTITLE_BURN_WORKERS: int = 0  # 0 = cpu_count / SUBTITLE_BURN_THREADS
+    TRANSCRIPT_CACHE_DIR: str = "./cache/transcripts"
+    TRANSCRIPT_CACHE_MAX_MB: int = 200
+    
+    # Stats
+    STATS_CACHE_TTL_SECONDS: int = 5
+    STATS_USE_COUNTERS: bool = False  # maintain stat_counters on every write
+    VIDEO_COUNT_CACHE_TTL_SECONDS: int = 30  # GET /videos?include_total=true
+    
+    # Export
+    EXPORT_CHUNK_SIZE: int = 10000  # rows per Parquet row group / Arrow batch
+    
     @property
     def api_keys_list(self) -> List[str]:
         """Parse API keys from comma-separated string"""
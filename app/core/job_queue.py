@@ -2,19 +2,22 @@
 Job Queue Manager to prevent concurrent TikTok requests
 """
 import asyncio
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from typing import Dict
+from datetime import datetime
 from app.core.logging import log
 
 
 class JobQueue:
-    """Manages job execution queue to prevent rate limiting"""
+    """
+    Manages job execution queue to prevent rate limiting
+    
+    Jobs run one at a time; the requests they make are paced by the
+    outbound governor, so there is no fixed delay between jobs.
+    """
     
     def __init__(self):
         self.queue: asyncio.Queue = asyncio.Queue()
         self.processing = False
-        self.last_request_time: Optional[datetime] = None
-        self.min_delay_seconds = 10  # Minimum 10 seconds between jobs
         self.active_jobs: Dict[str, datetime] = {}
         
     async def add_job(self, job_id: str, processor_func, *args, **kwargs):
@@ -39,14 +42,6 @@ class JobQueue:
                 job_id, processor_func, args, kwargs = await self.queue.get()
                 
                 try:
-                    # Wait minimum delay between jobs
-                    if self.last_request_time:
-                        elapsed = (datetime.utcnow() - self.last_request_time).total_seconds()
-                        if elapsed < self.min_delay_seconds:
-                            wait_time = self.min_delay_seconds - elapsed
-                            log.info(f"Waiting {wait_time:.1f}s before processing job {job_id}")
-                            await asyncio.sleep(wait_time)
-                    
                     # Mark job as active
                     self.active_jobs[job_id] = datetime.utcnow()
                     log.info(f"Processing job {job_id} from queue")
@@ -54,9 +49,6 @@ class JobQueue:
                     # Process job
                     await processor_func(*args, **kwargs)
                     
-                    # Update last request time
-                    self.last_request_time = datetime.utcnow()
-                    
                 except Exception as e:
                     log.error(f"Error processing job {job_id}: {e}")
                 finally:
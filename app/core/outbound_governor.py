@@ -0,0 +1,189 @@
+"""
+Outbound Governor - Shared pacing for every request sent to TikTok
+
+Scrapers, the video downloader, Playwright navigations and yt-dlp jobs all
+ask the governor before contacting a host. Each site (the last two labels of
+the host, so www.tiktok.com and m.tiktok.com share a budget) gets a token
+bucket whose rate adapts to how TikTok responds (AIMD):
+
+- Additive increase: every successful response raises the rate by
+  OUTBOUND_RATE_INCREASE requests/second, up to the site's maximum
+- Multiplicative decrease: a 429 or 403 multiplies the rate by
+  OUTBOUND_RATE_DECREASE and pauses the site for Retry-After seconds (or
+  OUTBOUND_BACKOFF_SECONDS)
+
+so requests go out as fast as TikTok tolerates instead of behind fixed sleeps.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.core.logging import log
+
+# Statuses TikTok answers with when it wants clients to slow down
+THROTTLE_STATUSES = (429, 403)
+
+
+def site_of(url: str) -> str:
+    """Budget key for a URL or host name: its last two labels"""
+    host = urlsplit(url).hostname if '//' in url else url
+    host = (host or '').lower().rstrip('.')
+    if host.replace('.', '').isdigit():
+        return host  # IP address
+    return '.'.join(host.split('.')[-2:])
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (HTTP dates are ignored)"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+class HostBucket:
+    """Token bucket for one site with an AIMD-controlled refill rate"""
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, burst: int, now: float):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = 1.0
+        self.updated = now
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()  # waiters are served in arrival order
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + max(now - self.updated, 0.0) * self.rate)
+        self.updated = max(now, self.updated)
+
+    def delay(self, now: float) -> float:
+        """Take a token and return 0, or return the seconds to wait for one"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def success(self, increase: float):
+        self.rate = min(self.max_rate, self.rate + increase)
+
+    def throttled(self, now: float, decrease: float, pause: float) -> bool:
+        """
+        Back off after a 429/403
+
+        Returns:
+            False if the site was already paused: responses to requests
+            that were in flight report the same overload and only extend it
+        """
+        first = now >= self.paused_until
+        if first:
+            self.rate = max(self.min_rate, self.rate * decrease)
+        self.paused_until = max(self.paused_until, now + pause)
+        # Nothing accumulates during the pause
+        self.tokens = 0.0
+        self.updated = self.paused_until
+        return first
+
+
+class OutboundGovernor:
+    """Per-site adaptive rate limits for outbound TikTok traffic"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.rate = settings.OUTBOUND_RATE_PER_SECOND
+        self.min_rate = settings.OUTBOUND_MIN_RATE
+        self.max_rate = settings.OUTBOUND_MAX_RATE
+        self.burst = settings.OUTBOUND_BURST
+        self.increase = settings.OUTBOUND_RATE_INCREASE
+        self.decrease = settings.OUTBOUND_RATE_DECREASE
+        self.backoff_seconds = settings.OUTBOUND_BACKOFF_SECONDS
+        self.jitter = settings.OUTBOUND_JITTER
+        # Sites with their own fixed ceiling (e.g. media CDNs), started at it
+        self.site_rates: Dict[str, float] = {}
+        for item in settings.OUTBOUND_SITE_RATES.split(','):
+            site, _, rate = item.strip().partition('=')
+            if site and rate:
+                self.site_rates[site.lower()] = float(rate)
+        self.buckets: Dict[str, HostBucket] = {}
+
+    def bucket(self, url: str) -> HostBucket:
+        site = site_of(url)
+        bucket = self.buckets.get(site)
+        if bucket is None:
+            site_rate = self.site_rates.get(site)
+            bucket = HostBucket(
+                site_rate or self.rate,
+                min(self.min_rate, site_rate or self.min_rate),
+                site_rate or self.max_rate,
+                self.burst,
+                self.clock()
+            )
+            self.buckets[site] = bucket
+        return bucket
+
+    async def acquire(self, url: str):
+        """Wait until a request to the URL's site may be sent"""
+        bucket = self.bucket(url)
+        async with bucket.lock:
+            while True:
+                wait = bucket.delay(self.clock())
+                if wait <= 0:
+                    return
+                # Jitter so requests don't go out on a machine-regular beat
+                await asyncio.sleep(wait * (1 + random.uniform(0, self.jitter)))
+
+    def record(self, url: str, status: int, retry_after: Optional[float] = None):
+        """
+        Feed a response back into the site's rate
+
+        Args:
+            url: Requested URL (or host)
+            status: HTTP status code
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        bucket = self.bucket(url)
+        if status in THROTTLE_STATUSES:
+            pause = retry_after if retry_after is not None else self.backoff_seconds
+            if bucket.throttled(self.clock(), self.decrease, pause):
+                log.warning(
+                    f"🐢 {site_of(url)} answered {status}: pausing {pause:.0f}s, "
+                    f"rate now {bucket.rate:.2f} req/s"
+                )
+        elif status < 400:
+            bucket.success(self.increase)
+
+    def interval(self, url: str) -> float:
+        """Current seconds between requests to the URL's site"""
+        return 1.0 / self.bucket(url).rate
+
+    def httpx_hooks(self) -> Dict:
+        """event_hooks for httpx.AsyncClient that route every request through the governor"""
+        return {'request': [self._on_request], 'response': [self._on_response]}
+
+    async def _on_request(self, request):
+        await self.acquire(request.url.host)
+
+    async def _on_response(self, response):
+        self.record(
+            response.request.url.host,
+            response.status_code,
+            parse_retry_after(response.headers.get('retry-after'))
+        )
+
+    async def goto(self, page, url: str, **kwargs):
+        """Playwright page.goto() paced and fed back through the governor"""
+        await self.acquire(url)
+        response = await page.goto(url, **kwargs)
+        if response is not None:
+            self.record(url, response.status, parse_retry_after(response.headers.get('retry-after')))
+        return response
+
+
+# Global outbound governor instance
+outbound_governor = OutboundGovernor()
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional, Dict
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
 
 
@@ -28,7 +29,8 @@ class VideoDownloader:
             http2=True,
             timeout=60.0,
             follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            event_hooks=outbound_governor.httpx_hooks()
         )
         log.info("Video downloader session initialized")
     
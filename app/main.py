@@ -12,7 +12,7 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.logging import log
 from app.models.database import init_db
-from app.api.routes import jobs, videos, scheduler, stats, cleanup, database
+from app.api.routes import jobs, videos, scheduler, stats, cleanup, database, export
 from app.middleware import RateLimitMiddleware
 
 
@@ -32,7 +32,8 @@ async def lifespan(app: FastAPI):
     # Start cleanup task
     from app.scheduler.cleanup_task import cleanup_task
     asyncio.create_task(cleanup_task.start())
-    log.info("Cleanup Task started (deletes files older than 24 hours)")
+    log.info(f"Cleanup Task started (files unused for {settings.RETENTION_MAX_AGE_HOURS} hours, "
+             f"LRU eviction above {settings.RETENTION_HIGH_WATERMARK:.0%} disk usage)")
     
     # Create required directories
     settings.local_storage_path_obj.mkdir(parents=True, exist_ok=True)
@@ -43,6 +44,20 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     log.info("Application shutting down")
+    
+    # Stop yt-dlp and transcription worker processes
+    from app.workers.ytdlp_pool import ytdlp_pool
+    from app.workers.transcription_pool import transcription_service
+    ytdlp_pool.shutdown()
+    transcription_service.shutdown()
+    
+    # Write pending video access times
+    from app.scheduler.access_tracker import access_tracker
+    await access_tracker.flush()
+    
+    # Close the Drive media client and cancel pending re-hydrations
+    from app.storage.media_resolver import media_resolver
+    await media_resolver.aclose()
 
 
 # Create FastAPI app
@@ -92,6 +107,7 @@ app.include_router(jobs.router, prefix="/api/v1")
 app.include_router(videos.router, prefix="/api/v1")
 app.include_router(scheduler.router, prefix="/api/v1")
 app.include_router(stats.router, prefix="/api/v1")
+app.include_router(export.router, prefix="/api/v1")
 app.include_router(cleanup.router)
 app.include_router(database.router)
 
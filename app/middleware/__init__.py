@@ -1,3 +1,4 @@
 from .rate_limiter import RateLimitMiddleware
+from .gcra import GCRALimiter, MemoryStore, SQLiteStore, RedisStore, create_store
 
-__all__ = ['RateLimitMiddleware']
+__all__ = ['RateLimitMiddleware', 'GCRALimiter', 'MemoryStore', 'SQLiteStore', 'RedisStore', 'create_store']
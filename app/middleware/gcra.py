@@ -0,0 +1,183 @@
+"""
+GCRA rate limiting (Generic Cell Rate Algorithm, a token bucket in one number)
+
+Each key stores a single "theoretical arrival time" (TAT), so checking a
+request is O(1) in time and memory however many requests were made. The TAT
+lives in a pluggable store:
+
+- memory://                 per-process dict (single worker)
+- sqlite:///path/to/file.db shared by all workers on one host
+- redis://host:port/db      shared across hosts (needs the `redis` package)
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+import anyio
+from app.core.logging import log
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int  # burst size
+    remaining: int  # requests allowed right now
+    retry_after: float  # seconds until the request would be allowed (0 if allowed)
+    reset_after: float  # seconds until the bucket is full again
+
+
+class MemoryStore:
+    """TATs in a dict; atomic because the event loop runs one check at a time"""
+
+    def __init__(self, cleanup_interval: float = 300):
+        self.tats: Dict[str, float] = {}
+        self.cleanup_interval = cleanup_interval
+        self.last_cleanup = time.time()
+
+    async def update(self, key: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        tat = max(self.tats.get(key, now), now)
+        new_tat = tat + increment
+        allowed = new_tat - now <= limit
+        if allowed:
+            self.tats[key] = new_tat
+
+        if now - self.last_cleanup > self.cleanup_interval:
+            self._cleanup(now)
+        return allowed, new_tat if allowed else tat
+
+    def _cleanup(self, now: float):
+        """Drop keys whose bucket is full again (equivalent to no entry)"""
+        expired = [key for key, tat in self.tats.items() if tat <= now]
+        for key in expired:
+            del self.tats[key]
+        self.last_cleanup = now
+        if expired:
+            log.debug(f"Cleaned up {len(expired)} idle rate limit keys")
+
+
+class SQLiteStore:
+    """
+    TATs in a SQLite file shared by every worker process on the host
+
+    The check is a single UPSERT ... RETURNING in autocommit mode, so it is
+    atomic across processes without an explicit transaction. Queries run in a
+    worker thread so a busy database (busy_timeout) never stalls the event loop.
+    """
+
+    def __init__(self, path: str, cleanup_interval: float = 300):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")  # rate limit state is disposable
+        self.connection.execute("PRAGMA busy_timeout=1000")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+        self.cleanup_interval = cleanup_interval
+        self.last_cleanup = time.time()
+        # One connection is shared by the worker threads
+        self.lock = threading.Lock()
+
+    async def update(self, key: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        return await anyio.to_thread.run_sync(self._update, key, now, increment, limit)
+
+    def _update(self, key: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        params = {'key': key, 'now': now, 'inc': increment, 'limit': limit}
+        with self.lock:
+            row = self.connection.execute(
+                "INSERT INTO rate_limits (key, tat) VALUES (:key, :now + :inc) "
+                "ON CONFLICT(key) DO UPDATE SET tat = max(tat, :now) + :inc "
+                "WHERE max(tat, :now) + :inc - :now <= :limit "
+                "RETURNING tat",
+                params
+            ).fetchone()
+
+            if now - self.last_cleanup > self.cleanup_interval:
+                self.last_cleanup = now
+                self.connection.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+
+            if row:
+                return True, row[0]
+            current = self.connection.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+        return False, max(current[0], now) if current else now
+
+
+class RedisStore:
+    """TATs in Redis (or a compatible server), updated by one Lua script"""
+
+    SCRIPT = """
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local increment = tonumber(ARGV[1])
+    local limit = tonumber(ARGV[2])
+    local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+    local new_tat = tat + increment
+    if new_tat - now <= limit then
+        redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1)
+        return {1, tostring(new_tat), tostring(now)}
+    end
+    return {0, tostring(tat), tostring(now)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("Redis rate limit storage requires the 'redis' package (pip install redis)")
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+        self.prefix = prefix
+
+    async def update(self, key: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        allowed, tat, server_now = await self.script(keys=[self.prefix + key], args=[increment, limit])
+        # Report relative to our clock; the server clock decides
+        return bool(allowed), float(tat) - float(server_now) + now
+
+
+def create_store(url: Optional[str]):
+    """Rate limit store for a storage URL (memory://, sqlite:///path, redis://...)"""
+    if not url or url.startswith("memory://"):
+        return MemoryStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    raise ValueError(f"Unsupported rate limit storage: {url}")
+
+
+class GCRALimiter:
+    """
+    Allow `rate_per_minute` requests per key on average, with bursts of up to
+    `burst` back to back
+    """
+
+    def __init__(self, rate_per_minute: int, burst: int, store=None, clock=time.time):
+        self.burst = burst
+        self.clock = clock
+        self.interval = 60.0 / rate_per_minute  # seconds per request at the sustained rate
+        # How far ahead of now the TAT may run (plus slack for float rounding)
+        self.tolerance = self.interval * burst + 1e-6
+        self.store = store or MemoryStore()
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """
+        Count a request against a key
+
+        Args:
+            key: Client identifier (e.g. IP address)
+            cost: Requests this one counts as
+
+        Returns:
+            RateLimitResult; when not allowed nothing is recorded
+        """
+        now = self.clock()
+        increment = self.interval * min(cost, self.burst)
+        allowed, tat = await self.store.update(key, now, increment, self.tolerance)
+
+        ahead = tat - now  # how much of the burst is in use
+        if allowed:
+            remaining = int((self.tolerance - ahead) / self.interval)
+            return RateLimitResult(True, self.burst, remaining, 0.0, ahead)
+
+        retry_after = ahead + increment - self.tolerance
+        return RateLimitResult(False, self.burst, 0, max(retry_after, 0.0), ahead)
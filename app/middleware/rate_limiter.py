@@ -1,142 +1,151 @@
 """
 Rate limiting middleware for API protection
+
+A plain ASGI middleware (no BaseHTTPMiddleware): allowed requests are passed
+straight through to the app, so streaming responses such as /stream and
+/download are not wrapped in an extra task and memory stream.
 """
+import re
 import time
-from collections import defaultdict, deque
-from typing import Callable
-from fastapi import Request, Response, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fnmatch import translate
+from typing import List, Optional, Pattern, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import settings
 from app.core.logging import log
+from app.middleware.gcra import GCRALimiter, create_store
+
+# (method or None for any, compiled path glob, cost)
+CostRule = Tuple[Optional[str], Pattern, int]
+
+
+def parse_cost_rules(spec: str) -> List[CostRule]:
+    """
+    Parse "[METHOD ]glob=cost" rules separated by commas
+
+    e.g. "GET /api/v1/videos/*/download=5, /health=0". Cost 0 exempts the
+    path; the first matching rule wins and unmatched requests cost 1.
+    """
+    rules = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        pattern, _, cost = item.rpartition('=')
+        method, _, path = pattern.strip().rpartition(' ')
+        rules.append((method.upper() or None, re.compile(translate(path)), int(cost)))
+    return rules
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    Rate limiting middleware using sliding window algorithm
+    Rate limiting middleware using GCRA (O(1) token bucket per client IP)
+    
+    Clients get `requests_per_minute` on average and may burst up to `burst`
+    requests (capped at one minute's worth). Requests are weighted by
+    RATE_LIMIT_ROUTE_COSTS (e.g. downloads cost more) and RATE_LIMIT_EXEMPT_PATHS
+    are never limited. State lives in RATE_LIMIT_STORAGE_URL so it can be
+    shared by workers.
     """
     
-    def __init__(self, app, requests_per_minute: int = None, burst: int = None):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = None,
+        burst: int = None,
+        storage_url: str = None,
+        exempt_paths: str = None,
+        route_costs: str = None
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute or settings.RATE_LIMIT_REQUESTS_PER_MINUTE
-        self.burst = burst or settings.RATE_LIMIT_BURST
+        self.burst = min(burst or settings.RATE_LIMIT_BURST, self.requests_per_minute)
         
-        # Store request timestamps per IP
-        self.request_times = defaultdict(deque)
+        self.limiter = GCRALimiter(
+            self.requests_per_minute,
+            self.burst,
+            create_store(storage_url or settings.RATE_LIMIT_STORAGE_URL)
+        )
         
-        # Cleanup interval (seconds)
-        self.cleanup_interval = 300  # 5 minutes
-        self.last_cleanup = time.time()
+        # Exemptions are cost-0 rules checked before the weighted ones
+        exempt = exempt_paths if exempt_paths is not None else settings.RATE_LIMIT_EXEMPT_PATHS
+        costs = route_costs if route_costs is not None else settings.RATE_LIMIT_ROUTE_COSTS
+        self.rules = parse_cost_rules(','.join(f"{path.strip()}=0" for path in exempt.split(',') if path.strip()))
+        self.rules += parse_cost_rules(costs)
         
         log.info(f"Rate limiter initialized: {self.requests_per_minute} req/min, burst: {self.burst}")
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and apply rate limiting
-        """
-        # Skip rate limiting for health checks and docs
-        if request.url.path in ["/health", "/", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
-        
-        # Get client IP
-        client_ip = self._get_client_ip(request)
-        
-        # Check rate limit
-        current_time = time.time()
-        
-        # Cleanup old entries periodically
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            self._cleanup_old_entries(current_time)
-            self.last_cleanup = current_time
-        
-        # Get request times for this IP
-        times = self.request_times[client_ip]
-        
-        # Remove requests older than 1 minute
-        cutoff_time = current_time - 60
-        while times and times[0] < cutoff_time:
-            times.popleft()
-        
-        # Check if rate limit exceeded
-        if len(times) >= self.requests_per_minute:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        cost = self._cost(scope["method"], scope["path"])
+        if cost == 0:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        client_ip = self._get_client_ip(scope, headers)
+        
+        result = await self.limiter.hit(client_ip, cost)
+        rate_headers = [
+            (b"x-ratelimit-limit", str(self.requests_per_minute).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+            (b"x-ratelimit-reset", str(int(time.time() + result.reset_after)).encode()),
+        ]
+        
+        if not result.allowed:
             log.warning(f"Rate limit exceeded for IP: {client_ip}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
+            response = JSONResponse(
+                status_code=429,
+                content={
                     "error": "Too many requests",
                     "message": f"Rate limit exceeded. Maximum {self.requests_per_minute} requests per minute allowed.",
-                    "retry_after": 60 - (current_time - times[0])
-                }
+                    "retry_after": round(result.retry_after, 2)
+                },
+                headers={"Retry-After": str(int(result.retry_after) + 1)}
             )
+            response.raw_headers.extend(rate_headers)
+            await response(scope, receive, send)
+            return
         
-        # Check burst limit (requests in last 10 seconds)
-        burst_cutoff = current_time - 10
-        burst_count = sum(1 for t in times if t > burst_cutoff)
-        
-        if burst_count >= self.burst:
-            log.warning(f"Burst limit exceeded for IP: {client_ip}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": "Too many requests",
-                    "message": f"Burst limit exceeded. Maximum {self.burst} requests per 10 seconds allowed.",
-                    "retry_after": 10
-                }
-            )
-        
-        # Add current request time
-        times.append(current_time)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(self.requests_per_minute - len(times))
-        response.headers["X-RateLimit-Reset"] = str(int(times[0] + 60)) if times else str(int(current_time + 60))
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _cost(self, method: str, path: str) -> int:
+        """Weight of a request under the first matching rule (HEAD counts as GET)"""
+        if method == "HEAD":
+            method = "GET"
+        for rule_method, pattern, cost in self.rules:
+            if (rule_method is None or rule_method == method) and pattern.match(path):
+                return cost
+        return 1
+    
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """
         Get client IP address from request
         Handles proxies and load balancers
         """
         # Check X-Forwarded-For header (for proxies/load balancers)
-        forwarded = request.headers.get("X-Forwarded-For")
+        forwarded = headers.get("x-forwarded-for")
         if forwarded:
             # Get first IP in the chain
             return forwarded.split(",")[0].strip()
         
         # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip.strip()
         
         # Fall back to direct client IP
-        if request.client:
-            return request.client.host
+        client = scope.get("client")
+        if client:
+            return client[0]
         
         return "unknown"
-    
-    def _cleanup_old_entries(self, current_time: float):
-        """
-        Remove old entries to prevent memory leaks
-        """
-        cutoff_time = current_time - 300  # 5 minutes
-        ips_to_remove = []
-        
-        for ip, times in self.request_times.items():
-            # Remove old timestamps
-            while times and times[0] < cutoff_time:
-                times.popleft()
-            
-            # If no recent requests, mark for removal
-            if not times:
-                ips_to_remove.append(ip)
-        
-        # Remove empty entries
-        for ip in ips_to_remove:
-            del self.request_times[ip]
-        
-        if ips_to_remove:
-            log.debug(f"Cleaned up {len(ips_to_remove)} inactive IPs from rate limiter")
@@ -0,0 +1,164 @@
+"""
+Materialized stats counters
+
+Job, video and scheduled-job state transitions flushed through the ORM
+(JobProcessor, API routes, scheduler) adjust rows in `stat_counters` inside
+the same transaction, so /stats reads a handful of rows instead of scanning
+the jobs and videos tables.
+"""
+from collections import Counter
+from typing import Dict
+from sqlalchemy import event, select, func, case, update, delete, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.models import Job, Video, ScheduledJob, StatCounter, JobStatus, VideoStatus
+from app.core.logging import log
+
+_registered = False
+
+
+def _status(value) -> str:
+    """Plain string for a status that may be assigned as an enum member"""
+    # f"{VideoStatus.PENDING}" is 'VideoStatus.PENDING' on Python 3.11+
+    return getattr(value, 'value', value)
+
+
+def _job_counters(job: Job, sign: int, deltas: Counter, status: str = None):
+    deltas['jobs.total'] += sign
+    deltas[f"jobs.{_status(status or job.status or JobStatus.PENDING)}"] += sign
+
+
+def _video_counters(video: Video, sign: int, deltas: Counter, status: str = None):
+    deltas['videos.total'] += sign
+    deltas[f"videos.{_status(status or video.status or VideoStatus.PENDING)}"] += sign
+    deltas['videos.storage_bytes'] += sign * (video.file_size or 0)
+
+
+def _scheduled_counters(scheduled_job: ScheduledJob, sign: int, deltas: Counter):
+    deltas['scheduled.total'] += sign
+    if scheduled_job.enabled is not False:
+        deltas['scheduled.enabled'] += sign
+
+
+def _changes(obj, attr: str):
+    """(old values, new values) for an attribute changed in this flush"""
+    history = inspect(obj).attrs[attr].history
+    return history.deleted, history.added
+
+
+def _committed(obj, attr: str):
+    """Value of an attribute as stored in the database"""
+    old, _ = _changes(obj, attr)
+    return old[0] if old else getattr(obj, attr)
+
+
+def collect_deltas(session: Session) -> Counter:
+    """Compute counter changes for the objects pending in a session"""
+    deltas = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, Job):
+            _job_counters(obj, 1, deltas)
+        elif isinstance(obj, Video):
+            _video_counters(obj, 1, deltas)
+        elif isinstance(obj, ScheduledJob):
+            _scheduled_counters(obj, 1, deltas)
+
+    for obj in session.deleted:
+        if isinstance(obj, Job):
+            _job_counters(obj, -1, deltas, _committed(obj, 'status'))
+        elif isinstance(obj, Video):
+            _video_counters(obj, -1, deltas, _committed(obj, 'status'))
+        elif isinstance(obj, ScheduledJob):
+            _scheduled_counters(obj, -1, deltas)
+
+    for obj in session.dirty:
+        if obj in session.deleted or not session.is_modified(obj):
+            continue
+
+        if isinstance(obj, (Job, Video)):
+            prefix = 'jobs' if isinstance(obj, Job) else 'videos'
+            old, new = _changes(obj, 'status')
+            if old and new and _status(old[0]) != _status(new[0]):
+                deltas[f"{prefix}.{_status(old[0])}"] -= 1
+                deltas[f"{prefix}.{_status(new[0])}"] += 1
+
+        if isinstance(obj, Video):
+            old, new = _changes(obj, 'file_size')
+            if new:
+                deltas['videos.storage_bytes'] += (new[0] or 0) - ((old[0] if old else 0) or 0)
+
+        if isinstance(obj, ScheduledJob):
+            old, new = _changes(obj, 'enabled')
+            if old and new and bool(old[0]) != bool(new[0]):
+                deltas['scheduled.enabled'] += 1 if new[0] else -1
+
+    return Counter({name: value for name, value in deltas.items() if value})
+
+
+def _before_flush(session: Session, flush_context, instances):
+    """Apply counter deltas in the same transaction as the state change"""
+    deltas = collect_deltas(session)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    for name, delta in deltas.items():
+        result = connection.execute(
+            update(StatCounter.__table__)
+            .where(StatCounter.__table__.c.name == name)
+            .values(value=StatCounter.__table__.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(StatCounter.__table__.insert().values(name=name, value=delta))
+
+
+def register_counters():
+    """Start maintaining counters for every ORM session"""
+    global _registered
+    if not _registered:
+        event.listen(Session, "before_flush", _before_flush)
+        _registered = True
+
+
+async def aggregate_counters(db: AsyncSession) -> Dict[str, int]:
+    """Compute all counters with one GROUP BY query per table"""
+    counters: Dict[str, int] = Counter()
+
+    result = await db.execute(select(Job.status, func.count()).group_by(Job.status))
+    for status, count in result.all():
+        counters[f"jobs.{status}"] = count
+        counters['jobs.total'] += count
+
+    result = await db.execute(
+        select(Video.status, func.count(), func.coalesce(func.sum(Video.file_size), 0))
+        .group_by(Video.status)
+    )
+    for status, count, storage in result.all():
+        counters[f"videos.{status}"] = count
+        counters['videos.total'] += count
+        counters['videos.storage_bytes'] += storage
+
+    result = await db.execute(
+        select(func.count(), func.coalesce(func.sum(case((ScheduledJob.enabled == True, 1), else_=0)), 0))
+    )
+    counters['scheduled.total'], counters['scheduled.enabled'] = result.one()
+
+    return counters
+
+
+async def rebuild_counters(db: AsyncSession):
+    """Recompute stat_counters from the source tables"""
+    counters = await aggregate_counters(db)
+
+    await db.execute(delete(StatCounter))
+    db.add_all([StatCounter(name=name, value=value) for name, value in counters.items()])
+    await db.commit()
+
+    log.info(f"📊 Rebuilt {len(counters)} stats counters")
+
+
+async def read_counters(db: AsyncSession) -> Dict[str, int]:
+    """Read materialized counters"""
+    result = await db.execute(select(StatCounter.name, StatCounter.value))
+    return Counter(dict(result.all()))
@@ -1,15 +1,87 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from pathlib import Path
+from sqlalchemy import Column, Integer, event, inspect
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.logging import log
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-)
 
-# Create async session factory
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+def sqlite_pragmas(read_only: bool = False) -> dict:
+    """Per-connection SQLite settings for the configured performance profile"""
+    pragmas = {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # negative = KiB
+        "mmap_size": settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    if not read_only:
+        # journal_mode is persistent; synchronous=NORMAL is only durable with WAL
+        pragmas["journal_mode"] = settings.SQLITE_JOURNAL_MODE
+        pragmas["synchronous"] = settings.SQLITE_SYNCHRONOUS
+    else:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def make_engine(url: str = None, read_only: bool = False, pragmas: dict = None) -> AsyncEngine:
+    """
+    Create an async engine with the database performance profile applied
+    
+    Args:
+        url: Database URL (default: DATABASE_URL)
+        read_only: Reader engine (SQLite: query_only connections)
+        pragmas: SQLite pragmas to use instead of the configured profile
+    
+    Returns:
+        AsyncEngine
+    """
+    url = url or settings.DATABASE_URL
+    options = {"echo": settings.DATABASE_ECHO, "future": True}
+    
+    if not _is_sqlite(url):
+        # Pooled server connections (asyncpg); pre_ping drops connections the
+        # server closed while idle instead of failing the next request
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+    
+    new_engine = create_async_engine(url, **options)
+    
+    if _is_sqlite(url):
+        pragmas = sqlite_pragmas(read_only) if pragmas is None else pragmas
+        
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    
+    return new_engine
+
+
+# Create async engines: writes go through `engine`, read-only endpoints use
+# `read_engine` (its own pool, optionally pointed at a replica)
+engine = make_engine()
+_read_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
+if _read_url == settings.DATABASE_URL and _is_memory_sqlite(_read_url):
+    read_engine = engine  # a second in-memory engine would be a different database
+else:
+    read_engine = make_engine(_read_url, read_only=True)
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -18,6 +90,14 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -35,10 +115,92 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """Dependency for read-only endpoints (uses the reader connection pool)"""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+# Alembic scripts live at the repository root (alembic.ini points there too)
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "migrations"
+
+# Revision matching the schema that create_all produced before migrations
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = ("jobs", "videos", "video_hashtags", "scheduled_jobs", "stat_counters")
+# Baseline columns that create_all databases from before they were added lack
+BASELINE_ADDED_COLUMNS = {
+    "videos": (("download_progress", Integer),),
+}
+
+
+def _create_missing_indexes(connection, tables):
+    """Create model indexes that don't exist yet on existing tables"""
+    for table in tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _add_missing_columns(connection):
+    """Add BASELINE_ADDED_COLUMNS missing from existing tables"""
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    
+    operations = Operations(MigrationContext.configure(connection))
+    for table, columns in BASELINE_ADDED_COLUMNS.items():
+        existing = {column["name"] for column in inspect(connection).get_columns(table)}
+        for name, column_type in columns:
+            if name not in existing:
+                log.info(f"Adding missing column {table}.{name}")
+                operations.add_column(table, Column(name, column_type, nullable=True))
+
+
+def alembic_config(connection=None):
+    """Alembic config for MIGRATIONS_DIR, optionally bound to an open connection"""
+    from alembic.config import Config
+    
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["connection"] = connection
+    return config
+
+
+def run_migrations(connection):
+    """Upgrade the schema to the latest revision (sync, for run_sync)"""
+    from alembic import command
+    from app.models.search import ensure_search_index
+    
+    config = alembic_config(connection)
+    tables = set(inspect(connection).get_table_names())
+    
+    if "jobs" in tables and "alembic_version" not in tables:
+        # Database created by create_all before migrations existed: bring it
+        # up to the baseline schema, then let Alembic take over
+        log.info("Existing database without migration history, stamping baseline")
+        baseline_tables = [Base.metadata.tables[name] for name in BASELINE_TABLES]
+        Base.metadata.create_all(connection, tables=baseline_tables)
+        _add_missing_columns(connection)
+        _create_missing_indexes(connection, baseline_tables)
+        ensure_search_index(connection)
+        command.stamp(config, BASELINE_REVISION)
+    
+    command.upgrade(config, "head")
+
+
 async def init_db():
-    """Initialize database tables"""
+    """Initialize database schema (runs Alembic migrations)"""
     # Import models to register them with Base
     from app.models import models  # noqa: F401
     
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+    
+    if settings.STATS_USE_COUNTERS:
+        from app.models.counters import register_counters, rebuild_counters
+        
+        # Rebuild first so writes made while counters were off are included
+        async with AsyncSessionLocal() as db:
+            await rebuild_counters(db)
+        register_counters()
@@ -0,0 +1,52 @@
+"""
+Shared video filters for listing, streaming and exporting
+"""
+from typing import Optional
+from sqlalchemy import Select
+from app.models.models import Job, Video, VideoHashtag
+
+
+def apply_video_filters(
+    query: Select,
+    mode: Optional[str] = None,
+    value: Optional[str] = None,
+    author_username: Optional[str] = None,
+    hashtag: Optional[str] = None,
+    status: Optional[str] = None
+) -> Select:
+    """
+    Apply GET /videos filters to a select over the videos table
+    
+    Args:
+        query: select(Video) or a select of videos columns
+        mode: Job scraping mode (profile/hashtag/explore)
+        value: Job username or hashtag
+        author_username: Video author
+        hashtag: Hashtag on the video
+        status: Video status
+    
+    Returns:
+        Filtered select
+    """
+    if author_username:
+        query = query.where(Video.author_username == author_username)
+    
+    if hashtag:
+        # Indexed lookup in video_hashtags (one row per video and tag)
+        tag = (VideoHashtag.normalize([hashtag]) or [''])[0]
+        query = query.join(VideoHashtag, VideoHashtag.video_id == Video.id).where(VideoHashtag.tag == tag)
+    
+    if status:
+        query = query.where(Video.status == status)
+    
+    # Join with Job to filter by mode/value
+    if mode or value:
+        query = query.join(Job, Job.id == Video.job_id)
+        
+        if mode:
+            query = query.where(Job.mode == mode)
+        
+        if value:
+            query = query.where(Job.value == value)
+    
+    return query
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, Text, JSON, ForeignKey, Index, false, inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Optional
 import enum
 from app.models.database import Base
 
 
+# JSON on SQLite, JSONB (indexable, binary) on PostgreSQL
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 class JobStatus(str, enum.Enum):
     """Job status enumeration"""
     PENDING = "pending"
@@ -65,6 +72,13 @@ class Job(Base):
 class Video(Base):
     """Video model for tracking individual videos"""
     __tablename__ = "videos"
+    __table_args__ = (
+        # Keyset pagination for GET /videos (newest first, filtered)
+        Index("ix_videos_status_scraped_at", "status", "scraped_at"),
+        Index("ix_videos_author_scraped_at", "author_username", "scraped_at"),
+        # Containment queries (@>) on PostgreSQL
+        Index("ix_videos_hashtags_gin", "hashtags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(String, primary_key=True, index=True)  # TikTok video ID
     job_id = Column(String, ForeignKey("jobs.id"), nullable=False, index=True)
@@ -76,27 +90,31 @@ class Video(Base):
     author_nickname = Column(String, nullable=True)
     
     # Statistics
-    views = Column(Integer, default=0)
-    likes = Column(Integer, default=0)
-    comments = Column(Integer, default=0)
-    shares = Column(Integer, default=0)
+    views = Column(BigInteger, default=0)
+    likes = Column(BigInteger, default=0)
+    comments = Column(BigInteger, default=0)
+    shares = Column(BigInteger, default=0)
     
     # Timestamps
     created_at_tiktok = Column(DateTime, nullable=True)
     scraped_at = Column(DateTime, default=datetime.utcnow)
     
     # Content
-    hashtags = Column(JSON, default=list)  # List of hashtags
+    hashtags = Column(JSONType, default=list)  # List of hashtags
     music_title = Column(String, nullable=True)
     music_author = Column(String, nullable=True)
     
     # Download info
     video_url = Column(String, nullable=True)  # Direct video URL
     has_watermark = Column(Boolean, default=True)
-    local_path = Column(String, nullable=True)
-    file_size = Column(Integer, nullable=True)  # bytes
+    local_path = Column(String, nullable=True, index=True)  # indexed for the orphan file scan
+    file_size = Column(BigInteger, nullable=True)  # bytes
     duration = Column(Float, nullable=True)  # seconds
     
+    # Retention
+    last_accessed_at = Column(DateTime, nullable=True)  # last /download or /stream
+    pinned = Column(Boolean, default=False, server_default=false(), nullable=False)  # never evicted
+    
     # Google Drive info
     drive_file_id = Column(String, nullable=True, index=True)
     drive_folder_path = Column(String, nullable=True)
@@ -104,14 +122,27 @@ class Video(Base):
     
     # Status
     status = Column(String, default=VideoStatus.PENDING.value, index=True)  # Store as string
+    download_progress = Column(Integer, default=0)  # percent
     download_attempts = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
     
-    # Full metadata JSON
-    raw_metadata = Column(JSON, nullable=True)
-    
     # Relationships
     job = relationship("Job", back_populates="videos")
+    hashtag_rows = relationship("VideoHashtag", cascade="all, delete-orphan")
+    raw_metadata_row = relationship("VideoMetadata", uselist=False, cascade="all, delete-orphan")
+    
+    # Full metadata JSON, stored in video_metadata so `select(Video)` doesn't
+    # load it; eager-load with selectinload(Video.raw_metadata_row) when needed
+    raw_metadata = association_proxy(
+        "raw_metadata_row", "data", creator=lambda data: VideoMetadata(data=data)
+    )
+    
+    @property
+    def loaded_raw_metadata(self) -> Optional[dict]:
+        """raw_metadata if it was eager-loaded, otherwise None (never queries)"""
+        if "raw_metadata_row" in inspect(self).unloaded:
+            return None
+        return self.raw_metadata
     
     def __repr__(self):
         return f"<Video {self.id} - @{self.author_username} - {self.status}>"
@@ -148,10 +179,48 @@ class Video(Base):
                 "folder_path": self.drive_folder_path,
                 "metadata_file_id": self.drive_metadata_file_id,
             },
-            "scraped_at": self.scraped_at.isoformat(),
+            "scraped_at": self.scraped_at.isoformat() if self.scraped_at else None,
         }
 
 
+class VideoMetadata(Base):
+    """Full TikTok item JSON for a video, kept out of the videos table"""
+    __tablename__ = "video_metadata"
+    __table_args__ = (
+        Index("ix_video_metadata_data_gin", "data", postgresql_using="gin",
+              postgresql_ops={"data": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+    )
+    
+    video_id = Column(String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    data = Column(JSONType, nullable=True)
+    
+    def __repr__(self):
+        return f"<VideoMetadata {self.video_id}>"
+
+
+class VideoHashtag(Base):
+    """Normalized hashtags, one row per (video, tag), for indexed lookups"""
+    __tablename__ = "video_hashtags"
+    
+    video_id = Column(String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True, index=True)  # lowercase, without '#'
+    
+    @staticmethod
+    def normalize(tags) -> list:
+        """Lowercase, strip '#' and de-duplicate tags (keeps order)"""
+        normalized = []
+        for tag in tags or []:
+            if not tag:
+                continue
+            tag = str(tag).strip().lstrip('#').lower()
+            if tag and tag not in normalized:
+                normalized.append(tag)
+        return normalized
+    
+    def __repr__(self):
+        return f"<VideoHashtag {self.video_id} #{self.tag}>"
+
+
 class ScheduledJob(Base):
     """Model for scheduled recurring jobs"""
     __tablename__ = "scheduled_jobs"
@@ -180,3 +249,14 @@ class ScheduledJob(Base):
     
     def __repr__(self):
         return f"<ScheduledJob {self.id} - {self.name} - {'Enabled' if self.enabled else 'Disabled'}>"
+
+
+class StatCounter(Base):
+    """Materialized counters for /stats (e.g. 'jobs.pending', 'videos.storage_bytes')"""
+    __tablename__ = "stat_counters"
+    
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<StatCounter {self.name}={self.value}>"
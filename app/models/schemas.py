@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from app.models.models import JobStatus, VideoStatus, ScrapingMode
@@ -73,7 +73,7 @@ class VideoResponse(BaseModel):
     comments: int
     shares: int
     created_at_tiktok: Optional[datetime]
-    scraped_at: datetime
+    scraped_at: Optional[datetime]
     hashtags: List[str]
     music_title: Optional[str]
     music_author: Optional[str]
@@ -82,8 +82,15 @@ class VideoResponse(BaseModel):
     duration: Optional[float]
     drive_file_id: Optional[str]
     drive_folder_path: Optional[str]
+    pinned: bool = False
+    last_accessed_at: Optional[datetime] = None
     status: VideoStatus
+    download_progress: Optional[int] = 0
     error_message: Optional[str]
+    # Only filled when requested with include_raw=true
+    raw_metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("loaded_raw_metadata", "raw_metadata")
+    )
     
     model_config = {"from_attributes": True}
 
@@ -103,8 +110,22 @@ class VideoQuery(BaseModel):
 
 class VideoListResponse(BaseModel):
     """Schema for video list response"""
-    total: int
+    total: Optional[int] = None  # only computed when include_total=true
     videos: List[VideoResponse]
+    next_cursor: Optional[str] = None
+
+
+class VideoSearchResult(BaseModel):
+    """Schema for a full-text search hit"""
+    video: VideoResponse
+    rank: float
+    snippet: Optional[str] = None  # matches wrapped in <mark></mark>
+
+
+class VideoSearchResponse(BaseModel):
+    """Schema for full-text search results"""
+    results: List[VideoSearchResult]
+    next_offset: Optional[int] = None
 
 
 # Scheduled Job Schemas
@@ -0,0 +1,153 @@
+"""
+Full-text search over video descriptions, music and author names
+
+SQLite uses an FTS5 table kept in sync with `videos` by triggers; PostgreSQL
+uses a generated, GIN-indexed tsvector column. Both are created by init_db,
+so every insert/update path (ORM or raw SQL) is indexed automatically.
+"""
+from typing import List, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.logging import log
+
+# Indexed columns, in bm25 weight order (description matches rank highest)
+SEARCH_COLUMNS = ['"desc"', 'music_title', 'music_author', 'author_nickname']
+SQLITE_WEIGHTS = "5.0, 2.0, 1.0, 1.0"
+POSTGRES_WEIGHTS = ['A', 'B', 'B', 'C']
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+
+
+def _sqlite_statements() -> List[str]:
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    delete_old = (f"INSERT INTO videos_fts(videos_fts, rowid, {columns}) "
+                  f"VALUES ('delete', old.rowid, {old_values});")
+    insert_new = f"INSERT INTO videos_fts(rowid, {columns}) VALUES (new.rowid, {new_values});"
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+        f"{columns}, content='videos', content_rowid='rowid', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN {delete_old} END",
+        # Only re-index when searchable text changes, not on status/progress updates
+        f"CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF {columns} ON videos "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgres_statements() -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(SEARCH_COLUMNS, POSTGRES_WEIGHTS)
+    )
+    return [
+        f"ALTER TABLE videos ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_videos_search_vector ON videos USING GIN (search_vector)",
+    ]
+
+
+def ensure_search_index(connection):
+    """Create the search index for the current backend (sync, for run_sync)"""
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        existed = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'videos_fts'"
+        ).first()
+        for statement in _sqlite_statements():
+            connection.exec_driver_sql(statement)
+        if not existed:
+            rebuild_search_index(connection)
+    elif dialect == "postgresql":
+        for statement in _postgres_statements():
+            connection.exec_driver_sql(statement)
+    else:
+        log.warning(f"Full-text search is not supported on {dialect}")
+
+
+def drop_search_index(connection):
+    """Drop the FTS5 table (sync, for run_sync); the tsvector column goes with videos"""
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS videos_fts")
+
+
+def rebuild_search_index(connection):
+    """
+    Re-index every video (sync, for run_sync)
+
+    The FTS5 table references videos by rowid, so run this after a VACUUM.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+        log.info("Rebuilt video search index")
+
+
+def fts5_query(query: str) -> str:
+    """
+    Turn user input into a safe FTS5 MATCH expression
+
+    Every word is quoted (so operators and punctuation are literal) and the
+    last word matches as a prefix, e.g. 'funny ca' -> '"funny" "ca"*'.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if not terms:
+        return ""
+    return " ".join(terms) + "*"
+
+
+async def search_videos(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Tuple[str, float, str]]:
+    """
+    Ranked full-text search
+
+    Args:
+        db: Database session
+        query: Words to search for
+        limit: Maximum results
+        offset: Results to skip
+
+    Returns:
+        List of (video_id, rank, snippet), best match first. Higher rank is
+        better; snippets wrap matches in <mark> tags.
+    """
+    dialect = db.bind.dialect.name
+    params = {'limit': limit, 'offset': offset, 'open': HIGHLIGHT_OPEN, 'close': HIGHLIGHT_CLOSE}
+
+    if dialect == "sqlite":
+        params['query'] = fts5_query(query)
+        if not params['query']:
+            return []
+        statement = text(f"""
+            SELECT videos.id, -bm25(videos_fts, {SQLITE_WEIGHTS}) AS rank,
+                   snippet(videos_fts, -1, :open, :close, '…', 12) AS snippet
+            FROM videos_fts JOIN videos ON videos.rowid = videos_fts.rowid
+            WHERE videos_fts MATCH :query
+            ORDER BY bm25(videos_fts, {SQLITE_WEIGHTS})
+            LIMIT :limit OFFSET :offset
+        """)
+    elif dialect == "postgresql":
+        params['query'] = query
+        statement = text("""
+            SELECT id, ts_rank_cd(search_vector, q) AS rank,
+                   ts_headline('simple',
+                               concat_ws(' ', "desc", music_title, music_author, author_nickname), q,
+                               'StartSel=' || :open || ', StopSel=' || :close || ', MaxWords=24') AS snippet
+            FROM videos, websearch_to_tsquery('simple', :query) AS q
+            WHERE search_vector @@ q
+            ORDER BY rank DESC, id
+            LIMIT :limit OFFSET :offset
+        """)
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+    result = await db.execute(statement, params)
+    return [(row.id, float(row.rank), row.snippet) for row in result]
@@ -0,0 +1,81 @@
+"""
+Access Tracker - Record when videos are downloaded/streamed
+
+Hits are coalesced in memory (one entry per video) and written with a single
+bulk UPDATE at most every ACCESS_FLUSH_SECONDS, so the media endpoints never
+wait on a write. The retention engine flushes before each run.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update
+from app.models.database import AsyncSessionLocal
+from app.models.models import Video
+from app.core.config import settings
+from app.core.logging import log
+
+# Flushes a batch may fail before its access times are dropped
+MAX_FLUSH_ATTEMPTS = 3
+
+
+class AccessTracker:
+    """Batched last_accessed_at updates for the LRU retention policy"""
+
+    def __init__(self, flush_interval: Optional[int] = None):
+        self.flush_interval = flush_interval if flush_interval is not None else settings.ACCESS_FLUSH_SECONDS
+        self.pending: Dict[str, datetime] = {}
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._failed_flushes = 0
+
+    def touch(self, video_id: str):
+        """Mark a video as accessed now (flushes in the background when due)"""
+        self.pending[video_id] = datetime.utcnow()
+
+        due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """
+        Write pending access times
+
+        Returns:
+            Number of videos updated
+        """
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, {}
+        videos = Video.__table__
+        try:
+            async with AsyncSessionLocal() as db:
+                # Core executemany: unlike the ORM bulk UPDATE it doesn't
+                # check matched rows, so videos deleted since the hit are skipped
+                await db.execute(
+                    update(videos)
+                    .where(videos.c.id == bindparam('b_id'))
+                    .values(last_accessed_at=bindparam('b_ts')),
+                    [{'b_id': video_id, 'b_ts': accessed_at} for video_id, accessed_at in batch.items()]
+                )
+                await db.commit()
+        except Exception as e:
+            self._failed_flushes += 1
+            if self._failed_flushes >= MAX_FLUSH_ATTEMPTS:
+                log.error(f"❌ Dropping {len(batch)} video access times after {self._failed_flushes} failed flushes: {e}")
+                self._failed_flushes = 0
+                return 0
+            log.warning(f"Could not record video access times: {e}")
+            # Keep them for the next flush, without overwriting newer hits
+            for video_id, accessed_at in batch.items():
+                self.pending.setdefault(video_id, accessed_at)
+            return 0
+
+        self._failed_flushes = 0
+        return len(batch)
+
+
+# Global access tracker instance
+access_tracker = AccessTracker()
@@ -1,34 +1,68 @@
 """
-Automatic Cleanup Task
-Deletes local video files older than 1 day
+Automatic Cleanup Task - Retention engine for local video files
+
+Two policies, applied least recently used first (last download/stream, or
+scrape time for videos never accessed):
+- Age: files not accessed for RETENTION_MAX_AGE_HOURS are deleted
+- Disk pressure: when the storage volume is above RETENTION_HIGH_WATERMARK,
+  files are evicted until it is below RETENTION_LOW_WATERMARK
+
+Pinned videos are never evicted. Candidates are paged from the database and
+`local_path` is cleared with one UPDATE per batch; dry runs report what would
+be deleted without touching anything. Videos stay reachable through the
+Drive fallback of the media resolver.
 """
 import asyncio
-from pathlib import Path
+import os
+import shutil
+import time
 from datetime import datetime, timedelta
-from sqlalchemy import select
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, update, func, or_, and_
 from app.models.database import AsyncSessionLocal
-from app.models.models import Video, VideoStatus
+from app.models.models import Video
+from app.scheduler.access_tracker import access_tracker
+from app.scheduler.orphan_reconciler import orphan_reconciler
 from app.core.config import settings
 from app.core.logging import log
 
+# Videos listed individually in a report
+REPORT_SAMPLE_SIZE = 50
+
 
 class CleanupTask:
-    """Automatic cleanup of old video files"""
+    """Automatic age- and space-based cleanup of local video files"""
     
     def __init__(self):
-        self.cleanup_interval = 3600  # Run every hour
-        self.max_age_hours = 24  # Keep files for 24 hours
+        self.cleanup_interval = settings.RETENTION_INTERVAL_SECONDS
+        self.check_interval = settings.RETENTION_CHECK_SECONDS
+        self.max_age_hours = settings.RETENTION_MAX_AGE_HOURS
+        self.high_watermark = settings.RETENTION_HIGH_WATERMARK
+        self.low_watermark = settings.RETENTION_LOW_WATERMARK
+        self.batch_size = settings.RETENTION_BATCH_SIZE
         self.running = False
+        self.last_report: Optional[Dict] = None
     
     async def start(self):
         """Start the cleanup task"""
         self.running = True
-        log.info(f"🧹 Cleanup task started - will delete files older than {self.max_age_hours} hours")
+        log.info(
+            f"🧹 Cleanup task started - files unused for {self.max_age_hours} hours, "
+            f"LRU eviction above {self.high_watermark:.0%} disk usage"
+        )
         
+        next_sweep = 0.0
         while self.running:
             try:
-                await self.run_cleanup()
-                await asyncio.sleep(self.cleanup_interval)
+                # Full sweep on the interval; in between, only when the disk fills up
+                if time.monotonic() >= next_sweep or self.disk_usage()[0] >= self.high_watermark:
+                    if settings.ORPHAN_SCAN_ENABLED:
+                        # Orphans are the cheapest bytes to reclaim
+                        await orphan_reconciler.run()
+                    await self.run_cleanup()
+                    next_sweep = time.monotonic() + self.cleanup_interval
+                await asyncio.sleep(self.check_interval)
             except Exception as e:
                 log.error(f"Error in cleanup task: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute on error
@@ -38,60 +72,156 @@ class CleanupTask:
         self.running = False
         log.info("🧹 Cleanup task stopped")
     
-    async def run_cleanup(self):
-        """Run cleanup cycle - delete old files"""
+    def disk_usage(self) -> Tuple[float, int, int]:
+        """
+        Usage of the volume holding LOCAL_STORAGE_PATH
+        
+        Returns:
+            (used fraction, used bytes, total bytes)
+        """
+        usage = shutil.disk_usage(settings.local_storage_path_obj)
+        return usage.used / usage.total, usage.used, usage.total
+    
+    async def run_cleanup(self, dry_run: bool = False) -> Optional[Dict]:
+        """
+        Run one retention cycle
+        
+        Args:
+            dry_run: Report what would be deleted without deleting anything
+        
+        Returns:
+            Report with disk usage and per-policy file/byte counts, or None
+            if the cycle failed
+        """
         try:
-            log.info("🧹 Starting cleanup cycle...")
+            log.info(f"🧹 Starting cleanup cycle{' (dry run)' if dry_run else ''}...")
+            
+            # LRU order needs the latest access times
+            await access_tracker.flush()
             
-            cutoff_time = datetime.utcnow() - timedelta(hours=self.max_age_hours)
-            deleted_count = 0
-            freed_space = 0
+            used_fraction, used, total = self.disk_usage()
+            # Bytes to free to get back under the low watermark
+            to_free = used - int(total * self.low_watermark) if used_fraction >= self.high_watermark else 0
+            cutoff = datetime.utcnow() - timedelta(hours=self.max_age_hours)
             
-            async with AsyncSessionLocal() as db:
-                # Get videos older than cutoff time with local files
-                result = await db.execute(
-                    select(Video).where(
-                        Video.scraped_at < cutoff_time,
-                        Video.local_path.isnot(None)
+            report = {
+                'dry_run': dry_run,
+                'started_at': datetime.utcnow().isoformat(),
+                'disk_used_bytes': used,
+                'disk_total_bytes': total,
+                'disk_pressure': to_free > 0,
+                'bytes_to_free': max(to_free, 0),
+                'expired': {'files': 0, 'bytes': 0},
+                'evicted': {'files': 0, 'bytes': 0},
+                'missing_files': 0,
+                'errors': 0,
+                'videos': [],
+            }
+            
+            last_used = func.coalesce(Video.last_accessed_at, Video.scraped_at)
+            after: Optional[Tuple[datetime, str]] = None
+            done = False
+            
+            while not done:
+                async with AsyncSessionLocal() as db:
+                    query = (
+                        select(Video.id, Video.local_path, last_used.label('last_used'))
+                        .where(Video.local_path.isnot(None), Video.pinned.is_(False))
+                        .order_by(last_used, Video.id)
+                        .limit(self.batch_size)
+                    )
+                    if after:
+                        query = query.where(or_(
+                            last_used > after[0],
+                            and_(last_used == after[0], Video.id > after[1])
+                        ))
+                    rows = (await db.execute(query)).all()
+                    if not rows:
+                        break
+                    after = (rows[-1].last_used, rows[-1].id)
+                    
+                    # File system work off the event loop
+                    cleared, to_free, done = await asyncio.to_thread(
+                        self._evict_batch, rows, cutoff, to_free, dry_run, report
                     )
-                )
-                videos = result.scalars().all()
-                
-                log.info(f"Found {len(videos)} videos older than {self.max_age_hours} hours")
-                
-                for video in videos:
-                    try:
-                        if video.local_path:
-                            video_path = Path(video.local_path)
-                            
-                            if video_path.exists():
-                                # Get file size before deletion
-                                file_size = video_path.stat().st_size
-                                
-                                # Delete the file
-                                video_path.unlink()
-                                
-                                deleted_count += 1
-                                freed_space += file_size
-                                
-                                log.info(f"🗑️ Deleted old video: {video.id} ({file_size / 1024 / 1024:.2f} MB)")
-                                
-                                # Update database - clear local_path
-                                video.local_path = None
-                                await db.commit()
                     
-                    except Exception as e:
-                        log.error(f"Error deleting video {video.id}: {e}")
-                        continue
+                    if cleared and not dry_run:
+                        await db.execute(
+                            update(Video).where(Video.id.in_(cleared)).values(local_path=None)
+                        )
+                        await db.commit()
+                
+                done = done or len(rows) < self.batch_size
             
-            if deleted_count > 0:
-                freed_mb = freed_space / 1024 / 1024
-                log.info(f"✅ Cleanup complete: Deleted {deleted_count} files, freed {freed_mb:.2f} MB")
-            else:
-                log.info("✅ Cleanup complete: No old files to delete")
+            deleted = report['expired']['files'] + report['evicted']['files']
+            freed_mb = (report['expired']['bytes'] + report['evicted']['bytes']) / 1024 / 1024
+            verb = "Would delete" if dry_run else "Deleted"
+            log.info(
+                f"✅ Cleanup complete: {verb} {deleted} files, {freed_mb:.2f} MB "
+                f"({report['evicted']['files']} for disk pressure)"
+            )
+            
+            self.last_report = report
+            return report
         
         except Exception as e:
             log.error(f"Error in cleanup cycle: {e}")
+            return None
+    
+    def _evict_batch(
+        self,
+        rows: List,
+        cutoff: datetime,
+        to_free: int,
+        dry_run: bool,
+        report: Dict
+    ) -> Tuple[List[str], int, bool]:
+        """
+        Delete the files of one candidate batch (sync, runs in a thread)
+        
+        Returns:
+            (video IDs whose local_path should be cleared, bytes still to
+            free for disk pressure, whether no later candidate qualifies)
+        """
+        cleared = []
+        for row in rows:
+            expired = row.last_used is None or row.last_used < cutoff
+            if not expired and to_free <= 0:
+                # Candidates are in LRU order: everything after is newer
+                return cleared, to_free, True
+            
+            try:
+                size = os.stat(row.local_path).st_size
+            except FileNotFoundError:
+                # Already gone; just forget the path
+                report['missing_files'] += 1
+                cleared.append(row.id)
+                continue
+            except OSError as e:
+                log.error(f"Error checking video {row.id}: {e}")
+                report['errors'] += 1
+                continue
+            
+            if not dry_run:
+                try:
+                    Path(row.local_path).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    log.error(f"Error deleting video {row.id}: {e}")
+                    report['errors'] += 1
+                    continue
+            
+            policy = 'expired' if expired else 'evicted'
+            report[policy]['files'] += 1
+            report[policy]['bytes'] += size
+            to_free -= size
+            cleared.append(row.id)
+            
+            if len(report['videos']) < REPORT_SAMPLE_SIZE:
+                report['videos'].append({'id': row.id, 'bytes': size, 'policy': policy})
+        
+        return cleared, to_free, False
 
 
 # Global cleanup task instance
@@ -0,0 +1,204 @@
+"""
+Orphan Reconciler - Reclaim files in the downloads tree the database doesn't know
+
+yt-dlp outputs, `_ar.mp4`/`_subtitled.mp4` variants, leftover `.wav`/`.srt`
+files, `_metadata.json` files and interrupted downloads (`.part`, fragments)
+that no `Video.local_path` points at are deleted once they are older than a
+grace period (so in-flight downloads are left alone).
+
+The tree is walked with os.scandir and handled a batch at a time: each batch
+is matched against `videos.local_path` with one indexed IN query, so memory
+stays bounded by the batch size however many files there are.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import select
+from app.models.database import AsyncReadSessionLocal
+from app.models.models import Video
+from app.core.config import settings
+from app.core.logging import log
+
+# Only these kinds of unreferenced files are reclaimed; anything else is reported
+FILE_KINDS = {
+    '.mp4': 'video', '.webm': 'video', '.mkv': 'video', '.mov': 'video',
+    '.wav': 'audio', '.m4a': 'audio', '.mp3': 'audio',
+    '.srt': 'subtitle', '.vtt': 'subtitle',
+    '.json': 'metadata',
+}
+PARTIAL_SUFFIXES = ('.part', '.ytdl', '.tmp', '.temp')
+
+# (path, size, mtime)
+FileEntry = Tuple[str, int, float]
+
+
+def file_kind(name: str) -> Optional[str]:
+    """Reclaimable kind of a file name, or None to always keep it"""
+    lowered = name.lower()
+    if lowered.endswith(PARTIAL_SUFFIXES) or '.part-frag' in lowered:
+        return 'partial'
+    return FILE_KINDS.get(os.path.splitext(lowered)[1])
+
+
+def walk_files(root: str, exclude: Set[str]) -> Iterator[FileEntry]:
+    """
+    Iterate files under root with os.scandir (no symlinks, no hidden files)
+
+    Args:
+        root: Directory to walk
+        exclude: Absolute paths of files and directories to skip
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith('.') or os.path.abspath(entry.path) in exclude:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            yield entry.path, stat.st_size, stat.st_mtime
+                    except OSError:
+                        continue
+        except OSError as e:
+            log.warning(f"Cannot scan {directory}: {e}")
+
+
+def _path_forms(path: str) -> List[str]:
+    """Spellings a path may be stored under in videos.local_path"""
+    absolute = os.path.abspath(path)
+    forms = {path, os.path.normpath(path), absolute}
+    try:
+        forms.add(os.path.relpath(absolute))
+    except ValueError:
+        pass  # different drive on Windows
+    return list(forms)
+
+
+class OrphanReconciler:
+    """Delete unreferenced and partial files from LOCAL_STORAGE_PATH"""
+
+    def __init__(self):
+        self.root = settings.LOCAL_STORAGE_PATH
+        self.grace_seconds = settings.ORPHAN_GRACE_MINUTES * 60
+        self.batch_size = settings.ORPHAN_BATCH_SIZE
+        self.last_report: Optional[Dict] = None
+
+    def _excluded(self) -> Set[str]:
+        # Managed elsewhere: the re-hydration cache, yt-dlp's archive, transcripts
+        return {
+            os.path.abspath(settings.MEDIA_CACHE_DIR),
+            os.path.abspath(settings.YTDLP_DOWNLOAD_ARCHIVE),
+            os.path.abspath(settings.TRANSCRIPT_CACHE_DIR),
+        }
+
+    async def _referenced(self, entries: List[FileEntry]) -> Set[str]:
+        """Absolute paths of the batch that some video still points at"""
+        forms = [form for path, _, _ in entries for form in _path_forms(path)]
+        async with AsyncReadSessionLocal() as db:
+            result = await db.execute(
+                select(Video.local_path).where(Video.local_path.in_(forms))
+            )
+            return {os.path.abspath(path) for path in result.scalars()}
+
+    def _reclaim(self, entries: List[FileEntry], referenced: Set[str], dry_run: bool, report: Dict):
+        """Delete the orphans of one batch (sync, runs in a thread)"""
+        cutoff = time.time() - self.grace_seconds
+
+        for path, size, mtime in entries:
+            if os.path.abspath(path) in referenced:
+                report['referenced'] += 1
+                continue
+
+            kind = file_kind(os.path.basename(path))
+            if kind is None:
+                report['skipped'] += 1
+                continue
+            if mtime > cutoff:
+                # Possibly still being written or not yet recorded
+                report['too_recent'] += 1
+                continue
+
+            if not dry_run:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    log.error(f"Error deleting orphan {path}: {e}")
+                    report['errors'] += 1
+                    continue
+
+            stats = report['reclaimed'].setdefault(kind, {'files': 0, 'bytes': 0})
+            stats['files'] += 1
+            stats['bytes'] += size
+            report['reclaimed_bytes'] += size
+
+    async def run(self, dry_run: bool = False) -> Optional[Dict]:
+        """
+        Scan the downloads tree and reclaim orphaned files
+
+        Args:
+            dry_run: Report what would be reclaimed without deleting anything
+
+        Returns:
+            Report with scanned/referenced counts and reclaimed files and
+            bytes per kind, or None if the scan failed
+        """
+        try:
+            log.info(f"🔎 Scanning {self.root} for orphaned files{' (dry run)' if dry_run else ''}...")
+            started = time.perf_counter()
+
+            report = {
+                'dry_run': dry_run,
+                'started_at': datetime.utcnow().isoformat(),
+                'scanned': 0,
+                'referenced': 0,
+                'too_recent': 0,
+                'skipped': 0,
+                'errors': 0,
+                'reclaimed': {},
+                'reclaimed_bytes': 0,
+            }
+
+            if not Path(self.root).is_dir():
+                self.last_report = report
+                return report
+
+            files = walk_files(self.root, self._excluded())
+            while True:
+                # Directory reads are blocking: pull each batch in a thread
+                entries = await asyncio.to_thread(lambda: list(islice(files, self.batch_size)))
+                if not entries:
+                    break
+                report['scanned'] += len(entries)
+
+                referenced = await self._referenced(entries)
+                await asyncio.to_thread(self._reclaim, entries, referenced, dry_run, report)
+
+            report['seconds'] = round(time.perf_counter() - started, 2)
+            verb = "would reclaim" if dry_run else "reclaimed"
+            orphans = sum(stats['files'] for stats in report['reclaimed'].values())
+            log.info(
+                f"✅ Orphan scan complete: {report['scanned']} files scanned, {verb} "
+                f"{orphans} files ({report['reclaimed_bytes'] / 1024 / 1024:.2f} MB) in {report['seconds']}s"
+            )
+
+            self.last_report = report
+            return report
+
+        except Exception as e:
+            log.error(f"Error in orphan scan: {e}")
+            return None
+
+
+# Global reconciler instance
+orphan_reconciler = OrphanReconciler()
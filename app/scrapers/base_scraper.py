@@ -1,6 +1,4 @@
 import httpx
-import asyncio
-import random
 import json
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
@@ -8,6 +6,7 @@ from parsel import Selector
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
 
 
@@ -37,6 +36,8 @@ class BaseScraper(ABC):
             'headers': headers,
             'timeout': settings.TIKTOK_TIMEOUT,
             'follow_redirects': True,
+            # Pacing and 429/403 backoff for every request
+            'event_hooks': outbound_governor.httpx_hooks(),
         }
         
         # Add proxy if configured
@@ -70,14 +71,6 @@ class BaseScraper(ABC):
             "Cache-Control": "max-age=0",
         }
     
-    async def _random_delay(self):
-        """Add random delay to mimic human behavior"""
-        delay = random.uniform(
-            settings.TIKTOK_REQUEST_DELAY_MIN,
-            settings.TIKTOK_REQUEST_DELAY_MAX
-        )
-        await asyncio.sleep(delay)
-    
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_exponential(multiplier=2, min=8, max=30)
@@ -90,17 +83,8 @@ class BaseScraper(ABC):
         log.info(f"Fetching URL: {url}")
         
         try:
-            # Add delay before request to avoid rate limiting
-            await self._random_delay()
-            
+            # The outbound governor paces the request and backs off on 429
             response = await self.session.get(url)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                log.warning(f"Rate limited! Waiting 30 seconds...")
-                await asyncio.sleep(30)
-                raise httpx.HTTPStatusError("Rate limited", request=response.request, response=response)
-            
             response.raise_for_status()
             
             return response.text
@@ -15,6 +15,7 @@ if sys.platform == 'win32' and sys.version_info >= (3, 13):
 
 from playwright.async_api import async_playwright, Page
 from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
 
 
@@ -86,7 +87,7 @@ class EnhancedTikTokScraper:
             
             # Navigate to profile
             log.info("   Navigating to profile...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await outbound_governor.goto(page, url, wait_until='domcontentloaded', timeout=30000)
             
             # Wait for page to load
             await asyncio.sleep(3)
@@ -129,7 +130,7 @@ class EnhancedTikTokScraper:
             
             # Navigate to hashtag page
             log.info("   Navigating to hashtag page...")
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await outbound_governor.goto(page, url, wait_until='domcontentloaded', timeout=30000)
             
             # Wait for page to load
             await asyncio.sleep(3)
@@ -4,8 +4,10 @@ Explore Page Scraper - For TikTok Explore categories
 from pathlib import Path
 from typing import List, Dict
 from app.core.logging import log
-import yt_dlp
+from app.scrapers.video_archive import filter_processed
+from app.workers.ytdlp_pool import ytdlp_pool, YtdlpJobCancelled
 import asyncio
+import re
 
 
 def scrape_explore_category_sync(category: str, limit: int = 5) -> List[str]:
@@ -151,6 +153,13 @@ async def download_explore_videos(category: str, limit: int = 5) -> List[Dict]:
         log.warning("⚠️ No video URLs found")
         return []
     
+    # Skip videos already uploaded to Drive before any yt-dlp request
+    url_ids = {url: match.group(1) for url in video_urls if (match := re.search(r'/video/(\d+)', url))}
+    processed = await filter_processed(list(url_ids.values()))
+    if processed:
+        log.info(f"   ⏭️ Skipping {len(processed)} videos already uploaded to Drive")
+        video_urls = [url for url in video_urls if url_ids.get(url) not in processed]
+    
     # Download each video
     output_dir = Path("downloads/explore") / category
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -162,7 +171,6 @@ async def download_explore_videos(category: str, limit: int = 5) -> List[Dict]:
             log.info(f"   Downloading: {url}")
             
             # Extract video ID from URL
-            import re
             video_id_match = re.search(r'/video/(\d+)', url)
             if not video_id_match:
                 log.warning(f"   ⚠️ Invalid URL format: {url}")
@@ -180,40 +188,45 @@ async def download_explore_videos(category: str, limit: int = 5) -> List[Dict]:
                 }
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                
-                if info:
-                    # Find downloaded file
-                    file_path = None
+            # Download in the yt-dlp worker pool so the event loop stays free
+            result = await ytdlp_pool.extract(url, ydl_opts, download=True)
+            info = result['info']
+            
+            if info:
+                # Find downloaded file
+                file_path = result['files'][0] if result['files'] else None
+                if not file_path:
                     for ext in ['mp4', 'webm', 'mkv']:
                         potential_file = output_dir / f"{video_id}.{ext}"
                         if potential_file.exists():
                             file_path = str(potential_file)
                             break
-                    
-                    if file_path:
-                        video_data = {
-                            'video_id': video_id,
-                            'url': url,
-                            'desc': info.get('description', ''),
-                            'author_username': info.get('uploader', ''),
-                            'author_nickname': info.get('uploader', ''),
-                            'views': info.get('view_count', 0),
-                            'likes': info.get('like_count', 0),
-                            'comments': info.get('comment_count', 0),
-                            'shares': 0,
-                            'created_at': None,
-                            'hashtags': [category],
-                            'music_title': None,
-                            'music_author': None,
-                            'video_url': file_path,
-                            'duration': info.get('duration'),
-                            'raw_data': {}
-                        }
-                        videos.append(video_data)
-                        log.info(f"      ✅ Downloaded: {video_id}")
+                
+                if file_path:
+                    video_data = {
+                        'video_id': video_id,
+                        'url': url,
+                        'desc': info.get('description', ''),
+                        'author_username': info.get('uploader', ''),
+                        'author_nickname': info.get('uploader', ''),
+                        'views': info.get('view_count', 0),
+                        'likes': info.get('like_count', 0),
+                        'comments': info.get('comment_count', 0),
+                        'shares': 0,
+                        'created_at': None,
+                        'hashtags': [category],
+                        'music_title': None,
+                        'music_author': None,
+                        'video_url': file_path,
+                        'duration': info.get('duration'),
+                        'raw_data': {}
+                    }
+                    videos.append(video_data)
+                    log.info(f"      ✅ Downloaded: {video_id}")
         
+        except YtdlpJobCancelled as e:
+            log.warning(f"      ⚠️ Timed out: {e}")
+            continue
         except Exception as e:
             log.warning(f"      ⚠️ Failed: {e}")
             continue
@@ -7,6 +7,7 @@ import re
 import json
 from app.scrapers.base_scraper import BaseScraper
 from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
 
 
@@ -84,7 +85,9 @@ class HashtagScraper(BaseScraper):
                 'Referer': 'https://www.tiktok.com/',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, follow_redirects=True, event_hooks=outbound_governor.httpx_hooks()
+            ) as client:
                 # Get hashtag page
                 response = await client.get(url, headers=headers)
                 html = response.text
@@ -235,7 +238,9 @@ class HashtagScraper(BaseScraper):
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             }
             
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, follow_redirects=True, event_hooks=outbound_governor.httpx_hooks()
+            ) as client:
                 response = await client.get(url, headers=headers)
                 html = response.text
                 
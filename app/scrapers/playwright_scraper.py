@@ -13,6 +13,7 @@ if sys.platform == 'win32' and sys.version_info >= (3, 13):
 
 from playwright.async_api import async_playwright, Browser, Page
 from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
 
 
@@ -113,7 +114,7 @@ class PlaywrightScraper:
             page = await self._create_stealth_page()
             
             # Navigate to profile
-            await page.goto(url, wait_until='networkidle', timeout=30000)
+            await outbound_governor.goto(page, url, wait_until='networkidle', timeout=30000)
             
             # Wait for content to load
             await page.wait_for_selector('[data-e2e="user-post-item"]', timeout=10000)
@@ -163,7 +164,7 @@ class PlaywrightScraper:
             page = await self._create_stealth_page()
             
             # Navigate to hashtag page
-            await page.goto(url, wait_until='networkidle', timeout=30000)
+            await outbound_governor.goto(page, url, wait_until='networkidle', timeout=30000)
             
             # Wait for content to load
             await page.wait_for_selector('[data-e2e="challenge-item"]', timeout=10000)
@@ -25,6 +25,8 @@ class ProfileScraper(BaseScraper):
             limit: Maximum number of videos to scrape
             since: Filter videos created after this date
             until: Filter videos created before this date
+            job_id: (keyword) Job the videos belong to, so yt-dlp batch
+                mode can create their rows and report download progress
             
         Returns:
             List of video data dictionaries
@@ -43,7 +45,11 @@ class ProfileScraper(BaseScraper):
                 log.info("🎯 Using yt-dlp (Most Reliable)...")
                 
                 output_dir = Path("downloads/profile") / username
-                results = await scrape_and_download(username, limit, output_dir)
+                results = await scrape_and_download(username, limit, output_dir, job_id=kwargs.get('job_id'))
+                
+                if results and all(r.get('skipped') for r in results):
+                    log.info("⏭️ All videos already downloaded (download archive)")
+                    return []
                 
                 if results:
                     # Convert to expected format
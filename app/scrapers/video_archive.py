@@ -0,0 +1,97 @@
+"""
+Video Archive - yt-dlp download archive backed by the videos table
+
+Videos that are already uploaded to Google Drive are rejected before yt-dlp
+requests their metadata or media.
+"""
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import select
+from app.core.logging import log
+
+# yt-dlp archive entries look like "tiktok 7123456789012345678"
+ARCHIVE_EXTRACTOR = "tiktok"
+
+# Keep IN (...) lists below SQLite's variable limit
+LOOKUP_BATCH_SIZE = 500
+
+
+class VideoArchive:
+    """
+    Set-like yt-dlp download archive
+
+    yt-dlp accepts any object with __contains__/add as `download_archive`
+    and checks it for every playlist entry before extracting it.
+    """
+
+    def __init__(self, video_ids: Iterable[str] = ()):
+        self._ids: Set[str] = set(video_ids)
+
+    @staticmethod
+    def _video_id(archive_id: str) -> str:
+        return archive_id.rsplit(' ', 1)[-1]
+
+    def __contains__(self, archive_id: str) -> bool:
+        return self._video_id(archive_id) in self._ids
+
+    def add(self, archive_id: str):
+        self._ids.add(self._video_id(archive_id))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+async def filter_processed(video_ids: List[str]) -> Set[str]:
+    """
+    Return the subset of video IDs already uploaded to Google Drive
+
+    Uses primary-key lookups in batches, so cost depends on the number of
+    IDs checked rather than the size of the videos table.
+    """
+    from app.models.database import AsyncSessionLocal
+    from app.models.models import Video
+
+    processed = set()
+    if not video_ids:
+        return processed
+
+    try:
+        async with AsyncSessionLocal() as db:
+            for i in range(0, len(video_ids), LOOKUP_BATCH_SIZE):
+                batch = video_ids[i:i + LOOKUP_BATCH_SIZE]
+                result = await db.execute(
+                    select(Video.id).where(
+                        Video.id.in_(batch),
+                        Video.drive_file_id.isnot(None)
+                    )
+                )
+                processed.update(result.scalars().all())
+    except Exception as e:
+        log.warning(f"⚠️ Could not check video archive: {e}")
+
+    return processed
+
+
+async def load_video_archive(author_username: Optional[str] = None) -> VideoArchive:
+    """
+    Snapshot processed video IDs into a VideoArchive for yt-dlp workers
+
+    Args:
+        author_username: Only load this author's videos (uses the author index)
+    """
+    from app.models.database import AsyncSessionLocal
+    from app.models.models import Video
+
+    query = select(Video.id).where(Video.drive_file_id.isnot(None))
+    if author_username:
+        query = query.where(Video.author_username == author_username)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(query)
+            archive = VideoArchive(result.scalars().all())
+    except Exception as e:
+        log.warning(f"⚠️ Could not load video archive: {e}")
+        archive = VideoArchive()
+
+    log.info(f"Loaded video archive with {len(archive)} processed videos")
+    return archive
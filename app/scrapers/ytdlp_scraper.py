@@ -1,41 +1,119 @@
 """
 YT-DLP Scraper - Most reliable method
 """
+import asyncio
+import queue
 import yt_dlp
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple, Callable, Awaitable
+from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
 from app.core.logging import log
+from app.scrapers.video_archive import VideoArchive, filter_processed, load_video_archive
 
+ProgressCallback = Callable[[str, int], Awaitable[None]]
 
-def scrape_and_download_sync(username: str, limit: int = 1, output_dir: Path = None, is_hashtag: bool = False) -> List[Dict]:
-    """
-    Use yt-dlp to download TikTok videos - WORKS PERFECTLY
-    """
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-us,en;q=0.5',
+    'Sec-Fetch-Mode': 'navigate',
+}
+
+
+def _resolve_target(username: str, is_hashtag: bool, output_dir: Optional[Path]) -> Tuple[str, Path]:
+    """Build the TikTok URL and output directory for a profile or hashtag"""
     username = username.lstrip('@').lstrip('#')
     
     if is_hashtag or username.startswith('tag/'):
         # Handle hashtag
         import urllib.parse
-        if username.startswith('tag/'):
-            hashtag = username.replace('tag/', '')
-        else:
-            hashtag = username
+        is_hashtag = True
+        name = username.replace('tag/', '', 1)
         # URL encode hashtag (important for Arabic/special characters)
-        encoded_hashtag = urllib.parse.quote(hashtag)
-        url = f"https://www.tiktok.com/tag/{encoded_hashtag}"
-        log.info(f"🎯 Using yt-dlp for #{hashtag}")
+        url = f"https://www.tiktok.com/tag/{urllib.parse.quote(name)}"
+        log.info(f"🎯 Using yt-dlp for #{name}")
     else:
         # Handle profile
+        name = username
         url = f"https://www.tiktok.com/@{username}"
         log.info(f"🎯 Using yt-dlp for @{username}")
     
     if not output_dir:
-        if is_hashtag:
-            output_dir = Path("downloads/hashtag") / hashtag
-        else:
-            output_dir = Path("downloads/profile") / username
+        output_dir = Path("downloads/hashtag" if is_hashtag else "downloads/profile") / name
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    return url, output_dir
+
+
+def _process_downloaded_file(video_id: str, file_path: str, with_subtitles: bool = True):
+    """Generate Arabic subtitle and upload a downloaded video to Google Drive"""
+    subtitle_file = None
+    video_with_subtitle = None
+    
+    # Generate Arabic subtitle (requires ffmpeg)
+    if with_subtitles:
+        try:
+            import shutil
+            if shutil.which('ffmpeg'):
+                from app.utils.subtitle_generator import generate_arabic_subtitle, embed_subtitle
+            
+                subtitle_path = generate_arabic_subtitle(Path(file_path))
+            
+                if subtitle_path and subtitle_path.exists():
+                    subtitle_file = str(subtitle_path)
+                    # Create version with embedded subtitle
+                    output_with_sub = Path(file_path).parent / f"{video_id}_ar.mp4"
+                    if embed_subtitle(Path(file_path), subtitle_path, output_with_sub):
+                        log.info(f"   ✅ Created version with Arabic subtitle")
+                        video_with_subtitle = str(output_with_sub)
+            else:
+                log.info(f"   ℹ️ ffmpeg not found, skipping subtitle generation")
+        except Exception as e:
+            log.warning(f"   ⚠️ Subtitle generation failed: {e}")
+    
+    # Upload to Google Drive
+    try:
+        from app.uploaders.drive_uploader import DriveUploader
+        
+        uploader = DriveUploader()
+        
+        # Upload original video
+        result = uploader.upload_video(Path(file_path))
+        if result.get('success'):
+            log.info(f"   ✅ Uploaded to Google Drive")
+        
+        # Upload version with subtitle if exists
+        if video_with_subtitle:
+            result_sub = uploader.upload_video(Path(video_with_subtitle))
+            if result_sub.get('success'):
+                log.info(f"   ✅ Uploaded subtitle version to Google Drive")
+    except Exception as e:
+        log.warning(f"   ⚠️ Google Drive upload failed: {e}")
+
+
+def scrape_and_download_sync(
+    username: str,
+    limit: int = 1,
+    output_dir: Path = None,
+    is_hashtag: bool = False,
+    archive: Optional[VideoArchive] = None,
+    with_subtitles: bool = True,
+    cancel_event=None
+) -> List[Dict]:
+    """
+    Use yt-dlp to download TikTok videos - WORKS PERFECTLY
+    
+    Videos in `archive` (already uploaded to Drive) are skipped before
+    yt-dlp requests their metadata. Pass with_subtitles=False when the
+    caller transcribes through the transcription service instead.
+    Setting `cancel_event` (from the worker pool) stops the download at the
+    next progress update and skips the remaining post-processing.
+    """
+    url, output_dir = _resolve_target(username, is_hashtag, output_dir)
+    username = username.lstrip('@').lstrip('#')
+    
     ydl_opts = {
         'format': 'best',
         'outtmpl': str(output_dir / '%(id)s.%(ext)s'),
@@ -45,14 +123,18 @@ def scrape_and_download_sync(username: str, limit: int = 1, output_dir: Path = N
         'playlistend': limit,
         'noplaylist': False,
         'cookiefile': None,
-        'http_headers': {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-us,en;q=0.5',
-            'Sec-Fetch-Mode': 'navigate',
-        }
+        'http_headers': HTTP_HEADERS,
     }
     
+    if archive is not None:
+        ydl_opts['download_archive'] = archive
+    
+    def cancel_hook(progress: Dict):
+        if cancel_event is not None and cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled("Job cancelled")
+    
+    ydl_opts['progress_hooks'] = [cancel_hook]
+    
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             log.info("📥 Downloading with yt-dlp...")
@@ -82,47 +164,8 @@ def scrape_and_download_sync(username: str, limit: int = 1, output_dir: Path = N
                 
                 if success:
                     log.info(f"✅ Downloaded: {video_id}")
-                    
-                    # Generate Arabic subtitle (requires ffmpeg)
-                    subtitle_file = None
-                    video_with_subtitle = None
-                    try:
-                        import shutil
-                        if shutil.which('ffmpeg'):
-                            from app.utils.subtitle_generator import generate_arabic_subtitle, embed_subtitle
-                            
-                            subtitle_path = generate_arabic_subtitle(Path(file_path))
-                            
-                            if subtitle_path and subtitle_path.exists():
-                                subtitle_file = str(subtitle_path)
-                                # Create version with embedded subtitle
-                                output_with_sub = Path(file_path).parent / f"{video_id}_ar.mp4"
-                                if embed_subtitle(Path(file_path), subtitle_path, output_with_sub):
-                                    log.info(f"   ✅ Created version with Arabic subtitle")
-                                    video_with_subtitle = str(output_with_sub)
-                        else:
-                            log.info(f"   ℹ️ ffmpeg not found, skipping subtitle generation")
-                    except Exception as e:
-                        log.warning(f"   ⚠️ Subtitle generation failed: {e}")
-                    
-                    # Upload to Google Drive
-                    try:
-                        from app.uploaders.drive_uploader import DriveUploader
-                        
-                        uploader = DriveUploader()
-                        
-                        # Upload original video
-                        result = uploader.upload_video(Path(file_path))
-                        if result.get('success'):
-                            log.info(f"   ✅ Uploaded to Google Drive")
-                        
-                        # Upload version with subtitle if exists
-                        if video_with_subtitle:
-                            result_sub = uploader.upload_video(Path(video_with_subtitle))
-                            if result_sub.get('success'):
-                                log.info(f"   ✅ Uploaded subtitle version to Google Drive")
-                    except Exception as e:
-                        log.warning(f"   ⚠️ Google Drive upload failed: {e}")
+                    if cancel_event is None or not cancel_event.is_set():
+                        _process_downloaded_file(video_id, file_path, with_subtitles)
                 else:
                     log.warning(f"⚠️ File not found: {video_id}")
                 
@@ -144,8 +187,295 @@ def scrape_and_download_sync(username: str, limit: int = 1, output_dir: Path = N
         return []
 
 
-async def scrape_and_download(username: str, limit: int = 1, output_dir: Path = None, is_hashtag: bool = False) -> List[Dict]:
-    """Async wrapper"""
-    import asyncio
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, scrape_and_download_sync, username, limit, output_dir, is_hashtag)
+def _load_archive_ids(archive_path: Path) -> Set[str]:
+    """Read video IDs from a yt-dlp download archive ('tiktok <id>' per line)"""
+    if not archive_path.exists():
+        return set()
+    
+    ids = set()
+    with open(archive_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2:
+                ids.add(parts[1])
+    return ids
+
+
+async def update_video_progress(video_id: str, percent: int):
+    """Report download progress to the Video row (no-op if the row doesn't exist yet)"""
+    from sqlalchemy import update
+    from app.models.database import AsyncSessionLocal
+    from app.models.models import Video
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Video).where(Video.id == video_id).values(download_progress=percent)
+            )
+            await db.commit()
+    except Exception as e:
+        log.debug(f"Could not update progress for {video_id}: {e}")
+
+
+async def create_pending_videos(job_id: str, username: str, entries: List[Dict]) -> Set[str]:
+    """
+    Insert PENDING rows for videos about to be downloaded, so progress
+    updates have a row to land on (videos that already have one are left alone)
+    
+    Returns:
+        IDs of the rows created
+    """
+    from sqlalchemy import select
+    from app.models.database import AsyncSessionLocal
+    from app.models.models import Video, VideoStatus
+    
+    created = set()
+    try:
+        async with AsyncSessionLocal() as db:
+            ids = [entry['id'] for entry in entries]
+            existing = set((await db.execute(select(Video.id).where(Video.id.in_(ids)))).scalars())
+            for entry in entries:
+                if entry['id'] in existing:
+                    continue
+                db.add(Video(
+                    id=entry['id'],
+                    job_id=job_id,
+                    url=entry.get('url') or f"https://www.tiktok.com/@{username}/video/{entry['id']}",
+                    author_username=username,
+                    status=VideoStatus.PENDING.value,
+                    download_progress=0,
+                ))
+                created.add(entry['id'])
+            await db.commit()
+    except Exception as e:
+        log.warning(f"⚠️ Could not create pending video rows: {e}")
+        return set()
+    return created
+
+
+async def mark_videos_failed(video_ids: List[str], error: str):
+    """Mark video rows FAILED (so a later job retries them)"""
+    from sqlalchemy import select
+    from app.models.database import AsyncSessionLocal
+    from app.models.models import Video, VideoStatus
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            # Through the ORM (not a Core UPDATE) so the stats counters see the change
+            videos = await db.execute(select(Video).where(Video.id.in_(video_ids)))
+            for video in videos.scalars():
+                video.status = VideoStatus.FAILED.value
+                video.error_message = error
+            await db.commit()
+    except Exception as e:
+        log.warning(f"⚠️ Could not mark videos failed: {e}")
+
+
+async def _drain_progress(progress_queue, progress_callback: ProgressCallback, stop: asyncio.Event):
+    """Forward progress updates from worker processes to the callback"""
+    last_reported: Dict[str, int] = {}
+    
+    while True:
+        try:
+            update = progress_queue.get_nowait()
+        except queue.Empty:
+            if stop.is_set():
+                break
+            await asyncio.sleep(0.5)
+            continue
+        
+        video_id = update.get('video_id')
+        if not video_id:
+            continue
+        
+        if update['status'] == 'finished':
+            percent = 100
+        elif update['total_bytes']:
+            percent = int(update['downloaded_bytes'] / update['total_bytes'] * 100)
+        else:
+            continue
+        
+        # Only report every 10% to keep DB writes low
+        if percent == 100 or percent - last_reported.get(video_id, -10) >= 10:
+            last_reported[video_id] = percent
+            await progress_callback(video_id, percent)
+
+
+async def batch_download(
+    username: str,
+    limit: int = 1,
+    output_dir: Path = None,
+    is_hashtag: bool = False,
+    parallelism: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = update_video_progress,
+    job_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    Batch mode: flat extraction first, then download entries concurrently
+    
+    Args:
+        username: TikTok username or hashtag
+        limit: Maximum number of videos
+        output_dir: Download directory
+        is_hashtag: Treat value as a hashtag
+        parallelism: Concurrent downloads (default YTDLP_BATCH_PARALLELISM)
+        progress_callback: Async callback(video_id, percent) for progress updates
+        job_id: Job to create PENDING video rows for before downloading, so
+            the default progress callback can report on them
+        
+    Returns:
+        List of result dicts; IDs already in the download archive are
+        returned with skipped=True and are never requested from TikTok
+    """
+    from app.workers.ytdlp_pool import ytdlp_pool
+    
+    url, output_dir = _resolve_target(username, is_hashtag, output_dir)
+    username = username.lstrip('@').lstrip('#')
+    
+    archive_path = Path(settings.YTDLP_DOWNLOAD_ARCHIVE)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Step 1: Flat extraction - only IDs and URLs, no per-video requests
+    log.info("📋 Listing videos with yt-dlp (flat extraction)...")
+    flat = await ytdlp_pool.extract(url, {
+        'extract_flat': 'in_playlist',
+        'playlistend': limit,
+        'quiet': True,
+        'no_warnings': True,
+        'http_headers': HTTP_HEADERS,
+    }, download=False)
+    
+    info = flat['info'] or {}
+    entries = [e for e in (info.get('entries') or []) if e and e.get('id')][:limit]
+    
+    if not entries:
+        log.warning("⚠️ No entries returned")
+        return []
+    
+    # Step 2: Skip IDs already downloaded (archive file) or uploaded (videos table)
+    known_ids = _load_archive_ids(archive_path)
+    known_ids |= await filter_processed([entry['id'] for entry in entries])
+    results = [{
+        'video_id': entry['id'],
+        'url': entry.get('url') or f"https://www.tiktok.com/@{username}/video/{entry['id']}",
+        'success': False,
+        'skipped': True,
+        'file_path': None,
+        'author_username': username,
+    } for entry in entries if entry['id'] in known_ids]
+    pending = [entry for entry in entries if entry['id'] not in known_ids]
+    
+    if results:
+        log.info(f"⏭️ Skipping {len(results)} videos already downloaded or uploaded")
+    
+    created_ids = set()
+    if job_id and pending:
+        created_ids = await create_pending_videos(job_id, username, pending)
+    
+    # Step 3: Download remaining entries concurrently
+    parallelism = parallelism or settings.YTDLP_BATCH_PARALLELISM
+    semaphore = asyncio.Semaphore(parallelism)
+    progress_queue = await ytdlp_pool.new_progress_queue() if progress_callback else None
+    entry_opts = {
+        'format': 'best',
+        'outtmpl': str(output_dir / '%(id)s.%(ext)s'),
+        'quiet': True,
+        'no_warnings': True,
+        'noplaylist': True,
+        'concurrent_fragment_downloads': settings.YTDLP_CONCURRENT_FRAGMENTS,
+        'download_archive': str(archive_path),
+        'http_headers': HTTP_HEADERS,
+    }
+    
+    async def download_entry(entry: Dict) -> Dict:
+        video_id = entry['id']
+        video_url = entry.get('url') or f"https://www.tiktok.com/@{username}/video/{video_id}"
+        file_path = None
+        
+        async with semaphore:
+            try:
+                result = await ytdlp_pool.extract(
+                    video_url, entry_opts, download=True, progress_queue=progress_queue
+                )
+                file_path = result['files'][0] if result['files'] else None
+            except Exception as e:
+                log.warning(f"⚠️ yt-dlp failed for {video_id}: {e}")
+        
+        if file_path:
+            log.info(f"✅ Downloaded: {video_id}")
+        else:
+            log.warning(f"⚠️ File not found: {video_id}")
+        
+        return {
+            'video_id': video_id,
+            'url': video_url,
+            'success': file_path is not None,
+            'skipped': False,
+            'file_path': file_path,
+            'author_username': username,
+        }
+    
+    log.info(f"📥 Downloading {len(pending)} videos, {parallelism} at a time...")
+    
+    stop = asyncio.Event()
+    drain_task = None
+    if progress_queue is not None:
+        drain_task = asyncio.create_task(_drain_progress(progress_queue, progress_callback, stop))
+    
+    try:
+        results.extend(await asyncio.gather(*(download_entry(entry) for entry in pending)))
+    finally:
+        if drain_task:
+            stop.set()
+            await drain_task
+    
+    failed = [r['video_id'] for r in results if r['video_id'] in created_ids and not r['success']]
+    if failed:
+        await mark_videos_failed(failed, "yt-dlp download failed")
+    
+    log.info(f"✅ Completed: {sum(1 for r in results if r['success'])}/{len(pending)} videos")
+    return results
+
+
+async def scrape_and_download(
+    username: str,
+    limit: int = 1,
+    output_dir: Path = None,
+    is_hashtag: bool = False,
+    job_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    Async wrapper - runs in the yt-dlp worker pool, off the API process
+    
+    Subtitles are left to JobProcessor and the transcription service so
+    each video is transcribed only once. With `job_id`, batch mode creates
+    the job's video rows up front so download progress is visible.
+    """
+    from app.workers.ytdlp_pool import ytdlp_pool, YtdlpJobCancelled
+    
+    try:
+        if not settings.YTDLP_BATCH_MODE:
+            author = None if is_hashtag else username.lstrip('@')
+            archive = await load_video_archive(author_username=author)
+            # One paced start; the legacy single-process job makes its own requests
+            await outbound_governor.acquire("https://www.tiktok.com/")
+            return await ytdlp_pool.run(
+                scrape_and_download_sync, username, limit, output_dir, is_hashtag, archive, False,
+                cancellable=True
+            )
+        
+        results = await batch_download(username, limit, output_dir, is_hashtag, job_id=job_id)
+        
+        # Drive upload for newly downloaded files
+        await asyncio.gather(*(
+            ytdlp_pool.run(_process_downloaded_file, r['video_id'], r['file_path'], False)
+            for r in results if r['success']
+        ), return_exceptions=True)
+        
+        return results
+    except YtdlpJobCancelled as e:
+        log.error(f"❌ yt-dlp job for {username} stopped: {e}")
+        return []
+    except Exception as e:
+        log.error(f"❌ yt-dlp error for {username}: {e}")
+        return []
@@ -0,0 +1,268 @@
+"""
+Media Resolver - Find the best source for a video file
+
+Tiers, in order:
+1. The downloaded file (`Video.local_path`)
+2. The re-hydration cache (videos pulled back from Drive, LRU-evicted)
+3. Google Drive, as a proxied stream that passes Range/conditional headers
+   through, or a redirect to the download link (publicly shared files only)
+
+`MEDIA_DRIVE_FALLBACK` picks the Drive behaviour and `MEDIA_CACHE_MAX_BYTES`
+enables the cache.
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+import anyio
+import httpx
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import RedirectResponse, Response, StreamingResponse
+from app.core.config import settings
+from app.core.logging import log
+from app.models.models import Video
+from app.utils.range_response import CHUNK_SIZE, offload_headers, range_file_response
+
+DRIVE_DOWNLOAD_URL = "https://drive.google.com/uc?export=download&id={file_id}"
+DRIVE_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
+
+# Headers passed through when proxying from Drive
+PROXY_REQUEST_HEADERS = ('range', 'if-range', 'if-none-match', 'if-modified-since')
+PROXY_RESPONSE_HEADERS = ('content-length', 'content-range', 'accept-ranges', 'etag', 'last-modified')
+
+
+def drive_download_url(file_id: str) -> str:
+    """Direct download link for a Drive file (works only if it is publicly shared)"""
+    return DRIVE_DOWNLOAD_URL.format(file_id=file_id)
+
+
+class MediaCache:
+    """
+    Size-bounded directory of videos re-hydrated from Drive
+
+    Hits bump the file's access time (mtime is left alone so ETags stay
+    stable) and eviction removes the least recently accessed files first.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, video_id: str) -> Path:
+        return self.directory / f"{video_id}.mp4"
+
+    def get(self, video_id: str) -> Optional[Path]:
+        """Cached file for a video, marking it as recently used"""
+        path = self.path_for(video_id)
+        try:
+            stat = path.stat()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def evict(self) -> int:
+        """
+        Delete least recently used files until the cache fits in max_bytes
+
+        Returns:
+            Bytes freed
+        """
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.mp4'):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                freed += size
+            except FileNotFoundError:
+                pass
+
+        if freed:
+            log.info(f"🗑️ Media cache evicted {freed / 1024 / 1024:.2f} MB")
+        return freed
+
+
+class MediaResolver:
+    """Serve a video from disk, the re-hydration cache or Google Drive"""
+
+    def __init__(self):
+        self.cache = None
+        if settings.MEDIA_CACHE_MAX_BYTES > 0:
+            self.cache = MediaCache(Path(settings.MEDIA_CACHE_DIR), settings.MEDIA_CACHE_MAX_BYTES)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._uploader = None
+        self._hydrating: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=None), follow_redirects=True)
+        return self._client
+
+    def local_file(self, video: Video) -> Optional[Path]:
+        """Downloaded or cached file for a video, if one is on disk"""
+        if video.local_path:
+            path = Path(video.local_path)
+            if path.exists():
+                return path
+        if self.cache:
+            return self.cache.get(video.id)
+        return None
+
+    async def response(
+        self,
+        request: Request,
+        video: Video,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Response]:
+        """
+        Response serving a video's file from the best available tier
+
+        Args:
+            request: Incoming request (GET or HEAD)
+            video: Video to serve
+            headers: Extra response headers (e.g. Content-Disposition)
+
+        Returns:
+            File, redirect or proxied response, or None if the video is
+            neither on disk nor reachable on Drive
+        """
+        path = self.local_file(video)
+        if path:
+            return self.file_response(request, video, path, headers)
+
+        if not video.drive_file_id or settings.MEDIA_DRIVE_FALLBACK == "none":
+            return None
+
+        # A HEAD probe shouldn't pull the whole file from Drive
+        if self.cache and request.method == 'GET':
+            self._hydrate_later(video)
+
+        if settings.MEDIA_DRIVE_FALLBACK == "proxy":
+            return await self._proxy(request, video, headers)
+
+        return RedirectResponse(drive_download_url(video.drive_file_id), status_code=307)
+
+    def file_response(
+        self,
+        request: Request,
+        video: Video,
+        path: Path,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """Hand the file to nginx/Apache when offload is configured, else serve it from the app"""
+        offload = offload_headers(
+            path,
+            settings.MEDIA_OFFLOAD_MODE,
+            settings.MEDIA_ACCEL_PREFIX,
+            Path(settings.LOCAL_STORAGE_PATH)
+        )
+        if offload:
+            # The web server answers Range/conditional requests itself
+            return Response(headers={**(headers or {}), **offload}, media_type="video/mp4")
+
+        return range_file_response(request, path, media_type="video/mp4", etag_key=video.id, headers=headers)
+
+    async def _access_token(self) -> Optional[str]:
+        if self._uploader is None:
+            from app.uploaders.drive_uploader import DriveUploader
+            self._uploader = DriveUploader()
+        # Token loading/refresh is blocking google-auth I/O
+        return await asyncio.to_thread(self._uploader.access_token)
+
+    async def _proxy(
+        self,
+        request: Request,
+        video: Video,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Response]:
+        """Stream the file from the Drive API, passing Range/conditional headers through"""
+        token = await self._access_token()
+        if not token:
+            log.warning(f"⚠️ Cannot proxy video {video.id}: Google Drive is not set up")
+            return None
+
+        upstream_headers = {
+            name: request.headers[name] for name in PROXY_REQUEST_HEADERS if name in request.headers
+        }
+        upstream_headers['Authorization'] = f"Bearer {token}"
+        upstream_request = self.client.build_request(
+            request.method, DRIVE_MEDIA_URL.format(file_id=video.drive_file_id), headers=upstream_headers
+        )
+        upstream = await self.client.send(upstream_request, stream=True)
+
+        if upstream.status_code not in (200, 206, 304, 416):
+            await upstream.aclose()
+            log.warning(f"⚠️ Drive returned {upstream.status_code} for video {video.id}")
+            return None
+
+        response_headers = {'accept-ranges': 'bytes', **(headers or {})}
+        for name in PROXY_RESPONSE_HEADERS:
+            if name in upstream.headers:
+                response_headers[name] = upstream.headers[name]
+
+        return StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            headers=response_headers,
+            media_type="video/mp4",
+            background=BackgroundTask(upstream.aclose)
+        )
+
+    def _hydrate_later(self, video: Video):
+        """Copy a Drive video into the cache in the background (once per video)"""
+        if video.id in self._hydrating:
+            return
+        self._hydrating.add(video.id)
+        task = asyncio.create_task(self._hydrate(video.id, video.drive_file_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _hydrate(self, video_id: str, file_id: str):
+        target = self.cache.path_for(video_id)
+        partial = target.with_suffix('.part')
+        try:
+            token = await self._access_token()
+            if not token:
+                return
+
+            url = DRIVE_MEDIA_URL.format(file_id=file_id)
+            async with self.client.stream('GET', url, headers={'Authorization': f"Bearer {token}"}) as upstream:
+                upstream.raise_for_status()
+                async with await anyio.open_file(partial, 'wb') as f:
+                    async for chunk in upstream.aiter_bytes(CHUNK_SIZE):
+                        await f.write(chunk)
+
+            os.replace(partial, target)
+            log.info(f"📥 Re-hydrated video {video_id} from Drive")
+            await asyncio.to_thread(self.cache.evict)
+        except Exception as e:
+            log.warning(f"⚠️ Could not re-hydrate video {video_id}: {e}")
+            partial.unlink(missing_ok=True)
+        finally:
+            self._hydrating.discard(video_id)
+
+    async def aclose(self):
+        """Cancel pending re-hydrations and close the HTTP client"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global resolver instance
+media_resolver = MediaResolver()
@@ -20,6 +20,7 @@ class DriveUploader:
     
     def __init__(self):
         self.service = None
+        self.credentials = None
         from app.core.config import settings
         self.folder_id = settings.GOOGLE_DRIVE_ROOT_FOLDER_ID or "1eJ0IpGpy7KrHkh_157n-qBM04WQCCDc_"
         self.credentials_file = Path(settings.GOOGLE_DRIVE_CREDENTIALS_FILE)
@@ -89,6 +90,7 @@ class DriveUploader:
                 with open(self.token_file, 'wb') as token:
                     pickle.dump(creds, token)
             
+            self.credentials = creds
             self.service = build('drive', 'v3', credentials=creds)
             log.info("✅ Google Drive service initialized")
             return self.service
@@ -97,6 +99,24 @@ class DriveUploader:
             log.error(f"❌ Failed to initialize Drive service: {e}")
             return None
     
+    def access_token(self) -> Optional[str]:
+        """
+        OAuth access token for direct Drive API requests (e.g. media downloads)
+        
+        Returns:
+            Bearer token, refreshed if expired, or None if Drive is not set up
+        """
+        if not self.credentials:
+            self.init_service()
+        
+        if not self.credentials:
+            return None
+        
+        if not self.credentials.valid and self.credentials.refresh_token:
+            self.credentials.refresh(Request())
+        
+        return self.credentials.token
+    
     def upload_video(
         self,
         video_path: Path,
@@ -0,0 +1,196 @@
+"""
+Archive Export - Stream the videos/jobs tables as Parquet, Arrow IPC or gzip NDJSON
+
+Rows are read through a server-side cursor in chunks and each chunk is encoded
+and handed to the caller before the next one is fetched, so memory is bounded
+by the chunk size rather than the size of the archive.
+"""
+import asyncio
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Integer, JSON, Table, select
+from app.core.config import settings
+from app.models.filters import apply_video_filters
+from app.models.models import Job, Video
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', '.arrows'),
+    'ndjson.gz': ('application/x-ndjson', '.ndjson.gz'),
+}
+
+EXPORT_TABLES: Dict[str, Table] = {
+    'videos': Video.__table__,
+    'jobs': Job.__table__,
+}
+
+
+def pyarrow_available() -> bool:
+    """Parquet and Arrow exports need pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def arrow_schema(table: Table) -> "pa.Schema":
+    """Arrow schema for a table (JSON columns are exported as JSON strings)"""
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        column_type = column.type
+        if isinstance(column_type, BigInteger):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int32()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+class _ChunkSink:
+    """Writable file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _NdjsonGzipEncoder:
+    """One JSON object per line, gzip-compressed incrementally"""
+
+    def __init__(self, table: Table):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def write(self, rows: List[dict]) -> bytes:
+        lines = ''.join(json.dumps(row, default=_json_default, ensure_ascii=False) + '\n' for row in rows)
+        return self._compressor.compress(lines.encode('utf-8'))
+
+    def close(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ArrowEncoder:
+    """Parquet (one row group per chunk) or Arrow IPC stream (one batch per chunk)"""
+
+    def __init__(self, table: Table, fmt: str):
+        import pyarrow as pa
+
+        self._schema = arrow_schema(table)
+        self._json_columns = [c.name for c in table.columns if isinstance(c.type, JSON)]
+        self._sink = _ChunkSink()
+
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self._sink, self._schema, compression='zstd')
+        else:
+            options = pa.ipc.IpcWriteOptions(compression='zstd')
+            self._writer = pa.ipc.new_stream(self._sink, self._schema, options=options)
+
+    def write(self, rows: List[dict]) -> bytes:
+        import pyarrow as pa
+
+        for row in rows:
+            for name in self._json_columns:
+                if row[name] is not None:
+                    row[name] = json.dumps(row[name], ensure_ascii=False)
+
+        batch = pa.RecordBatch.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(pa.Table.from_batches([batch]))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def build_export_query(table_name: str, **filters):
+    """select over all columns of an export table, with list_videos filters for videos"""
+    table = EXPORT_TABLES[table_name]
+    query = select(*table.columns)
+    if table_name == 'videos':
+        query = apply_video_filters(query, **filters)
+    return query.order_by(*table.primary_key.columns)
+
+
+async def stream_export(
+    table_name: str,
+    fmt: str,
+    chunk_size: Optional[int] = None,
+    **filters
+) -> AsyncIterator[bytes]:
+    """
+    Stream a table in an export format
+
+    Opens its own read session so it can outlive the request that started it.
+
+    Args:
+        table_name: 'videos' or 'jobs'
+        fmt: 'parquet', 'arrow' or 'ndjson.gz'
+        chunk_size: Rows fetched and encoded at a time
+        **filters: list_videos filters (videos only)
+
+    Yields:
+        Encoded bytes, chunk by chunk
+    """
+    from app.models.database import AsyncReadSessionLocal
+
+    table = EXPORT_TABLES[table_name]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    encoder = _NdjsonGzipEncoder(table) if fmt == 'ndjson.gz' else _ArrowEncoder(table, fmt)
+    query = build_export_query(table_name, **filters).execution_options(yield_per=chunk_size)
+
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.mappings().partitions(chunk_size):
+            rows = [dict(row) for row in partition]
+            # Encoding/compression is CPU-bound, keep it off the event loop
+            data = await asyncio.to_thread(encoder.write, rows)
+            if data:
+                yield data
+
+    data = await asyncio.to_thread(encoder.close)
+    if data:
+        yield data
@@ -0,0 +1,51 @@
+"""
+NDJSON streaming responses for list endpoints
+
+Rows are read through a server-side cursor (stream_scalars) and serialized one
+batch at a time, so memory stays flat and the first rows go out before the
+query has finished.
+"""
+from typing import AsyncIterator, Optional, Type
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched from the cursor and written per chunk
+NDJSON_BATCH_SIZE = 500
+
+
+async def iter_ndjson(
+    query: Select,
+    schema: Type[BaseModel],
+    header: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Serialize query results as NDJSON
+    
+    Opens its own read session: the request's session may be closed before a
+    streaming response finishes.
+    
+    Args:
+        query: ORM select returning one entity per row
+        schema: Pydantic model used to serialize each row
+        header: Optional first line (already serialized JSON)
+    
+    Yields:
+        Chunks of newline-terminated JSON documents
+    """
+    from app.models.database import AsyncReadSessionLocal
+    
+    if header:
+        yield header + "\n"
+    
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream_scalars(query.execution_options(yield_per=NDJSON_BATCH_SIZE))
+        async for batch in result.partitions(NDJSON_BATCH_SIZE):
+            yield "".join(schema.model_validate(row).model_dump_json() + "\n" for row in batch)
+
+
+def ndjson_response(query: Select, schema: Type[BaseModel], header: Optional[str] = None) -> StreamingResponse:
+    """StreamingResponse with one `schema` document per line"""
+    return StreamingResponse(iter_ndjson(query, schema, header), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,325 @@
+"""
+Range Response - Byte-range and conditional file responses (RFC 9110)
+
+Serves local files with strong ETags, Last-Modified, 304 Not Modified,
+If-Range, single ranges (206), multiple ranges (multipart/byteranges) and
+416 for unsatisfiable ranges, independent of the installed Starlette version.
+
+Whole files and single ranges are handed to the ASGI server's zero-copy
+extensions (`http.response.pathsend` / `http.response.zerocopysend`) when it
+advertises them. Uvicorn advertises neither, so there the file is read in
+chunks; zero-copy serving in that deployment means a fronting nginx/Apache
+taking over through `offload_headers` (MEDIA_OFFLOAD_MODE).
+"""
+import os
+import secrets
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# Fallback read size when the server has no zero-copy extension: fewer,
+# larger reads keep thread-pool hops per MP4 low
+CHUNK_SIZE = 256 * 1024
+
+# More ranges than this are served as a full 200 response (range-abuse guard)
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    """Range header is valid but no range overlaps the file"""
+
+
+def file_etag(key: str, stat: os.stat_result) -> str:
+    """Strong ETag from a stable key (e.g. video ID) plus file size and mtime"""
+    return f'"{key}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a Range header into sorted, merged, inclusive (start, end) pairs
+
+    Args:
+        header: Range header value, e.g. "bytes=0-499,-500"
+        size: File size in bytes
+
+    Returns:
+        List of ranges, or None if the header is absent, malformed or should
+        be ignored (the full file is served)
+
+    Raises:
+        RangeNotSatisfiable: No range overlaps the file
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec.strip():
+        return None
+
+    ranges = []
+    for part in spec.split(','):
+        start_text, dash, end_text = part.strip().partition('-')
+        start_text, end_text = start_text.strip(), end_text.strip()
+        if not dash or not (start_text or end_text):
+            return None
+        if (start_text and not start_text.isdigit()) or (end_text and not end_text.isdigit()):
+            return None
+
+        if not start_text:
+            # Suffix range: last N bytes
+            length = int(end_text)
+            if length == 0:
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+
+        start = int(start_text)
+        end = int(end_text) if end_text else None
+        if end is not None and end < start:
+            return None
+        if start >= size:
+            continue
+        if end is None:
+            end = size - 1
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    # Merge overlapping and adjacent ranges
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def offload_headers(path: Path, mode: str, accel_prefix: str, root: Path) -> Optional[Dict[str, str]]:
+    """
+    Headers that hand a file over to the fronting web server
+
+    Args:
+        path: File to serve
+        mode: 'x-accel-redirect' (nginx), 'x-sendfile' (Apache/lighttpd) or 'none'
+        accel_prefix: Internal nginx location that aliases `root`
+        root: Storage root mapped by `accel_prefix`
+
+    Returns:
+        Offload headers, or None to serve the file from the app (mode 'none',
+        or an X-Accel-Redirect file outside `root`)
+    """
+    if mode == 'x-sendfile':
+        return {'X-Sendfile': str(path.resolve())}
+    if mode == 'x-accel-redirect':
+        try:
+            relative = path.resolve().relative_to(root.resolve())
+        except ValueError:
+            return None
+        return {'X-Accel-Redirect': accel_prefix.rstrip('/') + '/' + quote(relative.as_posix())}
+    return None
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """Compare an If-None-Match / If-Range header against our ETag"""
+    if header.strip() == '*':
+        return True
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if weak:
+            candidate = candidate.removeprefix('W/')
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    return int(mtime) <= since
+
+
+def _if_range_allows(header: Optional[str], etag: str, mtime: float) -> bool:
+    """If-Range: only honour Range when the validator still matches"""
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('"') or header.startswith('W/'):
+        return not header.startswith('W/') and _etag_matches(header, etag, weak=False)
+    return _not_modified_since(header, mtime)
+
+
+async def _read_ranges(
+    path: Path,
+    ranges: List[Tuple[int, int]],
+    part_headers: Optional[List[bytes]] = None,
+    closing: bytes = b''
+) -> AsyncIterator[bytes]:
+    """Read byte ranges from a file, optionally as multipart/byteranges parts"""
+    async with await anyio.open_file(path, 'rb') as f:
+        for index, (start, end) in enumerate(ranges):
+            if part_headers:
+                yield part_headers[index]
+            await f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+    if closing:
+        yield closing
+
+
+class FileRangeResponse(Response):
+    """
+    One contiguous byte range of a file (the whole file for 200 responses)
+
+    Uses `http.response.pathsend` for whole files and
+    `http.response.zerocopysend` for any range when the server supports them;
+    otherwise falls back to chunked reads in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        start: int,
+        end: int,
+        size: int,
+        status_code: int,
+        headers: Dict[str, str],
+        media_type: str
+    ):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.size = size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get('extensions') or {}
+        count = self.end - self.start + 1
+        
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        
+        if 'http.response.pathsend' in extensions and self.start == 0 and count == self.size:
+            await send({'type': 'http.response.pathsend', 'path': str(self.path)})
+        elif 'http.response.zerocopysend' in extensions:
+            with open(self.path, 'rb') as f:
+                await send({
+                    'type': 'http.response.zerocopysend',
+                    'file': f,
+                    'offset': self.start,
+                    'count': count,
+                })
+        else:
+            async for chunk in _read_ranges(self.path, [(self.start, self.end)]):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        
+        if self.background is not None:
+            await self.background()
+
+
+def range_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    etag_key: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve a file honouring Range, If-Range, If-None-Match and If-Modified-Since
+
+    Args:
+        request: Incoming request (GET or HEAD)
+        path: File to serve
+        media_type: Content type of the file
+        etag_key: Stable identifier for the ETag (e.g. video ID)
+        headers: Extra response headers (e.g. Content-Disposition)
+
+    Returns:
+        200, 206, 304 or 416 response
+    """
+    stat = path.stat()
+    size = stat.st_size
+    etag = file_etag(etag_key, stat)
+    base_headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Accept-Ranges': 'bytes',
+        **(headers or {}),
+    }
+    is_head = request.method == 'HEAD'
+
+    # Conditional GET: If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get('if-none-match')
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=304, headers=base_headers)
+    elif if_modified_since and _not_modified_since(if_modified_since, stat.st_mtime):
+        return Response(status_code=304, headers=base_headers)
+
+    ranges = None
+    if _if_range_allows(request.headers.get('if-range'), etag, stat.st_mtime):
+        try:
+            ranges = parse_range(request.headers.get('range'), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**base_headers, 'Content-Range': f'bytes */{size}'})
+
+    if not ranges:
+        response_headers = {**base_headers, 'Content-Length': str(size)}
+        if is_head or size == 0:
+            return Response(status_code=200, headers=response_headers, media_type=media_type)
+        return FileRangeResponse(
+            path, 0, size - 1, size, status_code=200,
+            headers=response_headers, media_type=media_type
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response_headers = {
+            **base_headers,
+            'Content-Range': f'bytes {start}-{end}/{size}',
+            'Content-Length': str(end - start + 1),
+        }
+        if is_head:
+            return Response(status_code=206, headers=response_headers, media_type=media_type)
+        return FileRangeResponse(
+            path, start, end, size, status_code=206,
+            headers=response_headers, media_type=media_type
+        )
+
+    # Multiple ranges: multipart/byteranges
+    boundary = secrets.token_hex(16)
+    part_headers = [
+        (f'--{boundary}\r\nContent-Type: {media_type}\r\n'
+         f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n').encode('latin-1')
+        for start, end in ranges
+    ]
+    # Every part after the first starts on a new line after the previous body
+    part_headers = part_headers[:1] + [b'\r\n' + header for header in part_headers[1:]]
+    closing = f'\r\n--{boundary}--\r\n'.encode('latin-1')
+    content_length = sum(len(header) + end - start + 1 for header, (start, end) in zip(part_headers, ranges))
+    content_length += len(closing)
+    response_headers = {**base_headers, 'Content-Length': str(content_length)}
+    multipart_type = f'multipart/byteranges; boundary={boundary}'
+
+    if is_head:
+        return Response(status_code=206, headers=response_headers, media_type=multipart_type)
+    return StreamingResponse(
+        _read_ranges(path, ranges, part_headers, closing), status_code=206,
+        headers=response_headers, media_type=multipart_type
+    )
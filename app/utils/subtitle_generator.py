@@ -1,40 +1,251 @@
 """
 Subtitle Generator - Extract audio and generate Arabic subtitles
 """
+import asyncio
+import os
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import settings
 from app.core.logging import log
+from app.utils.transcript_cache import chunks_fingerprint, transcript_cache
 
+# Whisper expects 16 kHz mono audio
+SAMPLE_RATE = 16000
 
-def extract_audio(video_path: Path, audio_path: Path) -> bool:
-    """Extract audio from video using ffmpeg"""
-    try:
-        cmd = [
-            'ffmpeg',
-            '-i', str(video_path),
-            '-vn',  # No video
-            '-acodec', 'pcm_s16le',
-            '-ar', '16000',  # 16kHz sample rate
-            '-ac', '1',  # Mono
-            '-y',  # Overwrite
-            str(audio_path)
-        ]
+# Limits concurrent burn-in encodes (created on first use)
+_burn_slots: Optional[asyncio.Semaphore] = None
+
+# Whisper models loaded in this process, by name
+_models: Dict[str, object] = {}
+
+
+def load_whisper_model(name: Optional[str] = None):
+    """Load a Whisper model once per process and reuse it"""
+    name = name or settings.WHISPER_MODEL
+    
+    if name not in _models:
+        import whisper
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return result.returncode == 0
+        log.info(f"   Loading Whisper model '{name}'...")
+        _models[name] = whisper.load_model(name)
+    
+    return _models[name]
+
+
+def _ffmpeg_audio_command(video_path: Path) -> List[str]:
+    """ffmpeg command that writes 16 kHz mono s16le PCM to stdout"""
+    return [
+        'ffmpeg',
+        '-nostdin',
+        '-loglevel', 'error',
+        '-i', str(video_path),
+        '-vn',  # No video
+        '-f', 's16le',
+        '-acodec', 'pcm_s16le',
+        '-ar', str(SAMPLE_RATE),  # 16kHz sample rate
+        '-ac', '1',  # Mono
+        '-'  # stdout
+    ]
+
+
+def iter_audio_chunks(video_path: Path, chunk_seconds: Optional[float] = None) -> Iterator["np.ndarray"]:
+    """
+    Stream audio from a video as float32 arrays, without a temporary audio file
+    
+    Args:
+        video_path: Path to video file
+        chunk_seconds: Seconds of audio per chunk (default SUBTITLE_CHUNK_SECONDS)
         
-    except Exception as e:
-        log.error(f"Error extracting audio: {e}")
-        return False
+    Yields:
+        float32 numpy arrays in [-1, 1] at 16 kHz
+    """
+    import numpy as np
+    
+    chunk_seconds = chunk_seconds or settings.SUBTITLE_CHUNK_SECONDS
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * 2  # 2 bytes per s16le sample
+    
+    # stderr goes to a file: a pipe we only read after stdout's EOF would
+    # deadlock once ffmpeg fills it with diagnostics (e.g. a corrupt input)
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            _ffmpeg_audio_command(video_path),
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        )
+        try:
+            while True:
+                data = process.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                # Drop a trailing odd byte so frombuffer gets whole samples
+                data = data[:len(data) - len(data) % 2]
+                yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+        finally:
+            process.stdout.close()
+            process.wait()
+        
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors='replace')
+    
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to extract audio: {stderr.strip()}")
+
+
+def load_audio(video_path: Path) -> "np.ndarray":
+    """Decode the whole audio track of a video into one float32 array"""
+    import numpy as np
+    
+    chunks = list(iter_audio_chunks(video_path))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+
+def write_srt(segments: List[Dict], subtitle_path: Path):
+    """Write Whisper segments to an SRT file"""
+    with open(subtitle_path, 'w', encoding='utf-8') as f:
+        for i, segment in enumerate(segments, 1):
+            start = format_timestamp(segment['start'])
+            end = format_timestamp(segment['end'])
+            text = segment['text'].strip()
+            
+            f.write(f"{i}\n")
+            f.write(f"{start} --> {end}\n")
+            f.write(f"{text}\n\n")
+
+
+def transcribe_chunks(model, chunks: Iterable["np.ndarray"]) -> List[Dict]:
+    """Transcribe consecutive audio chunks, shifting timestamps by chunk offset"""
+    segments = []
+    offset = 0.0
+    for chunk in chunks:
+        result = model.transcribe(
+            chunk,
+            language='ar',  # Force Arabic
+            task='translate'  # Translate to Arabic if not already
+        )
+        for segment in result['segments']:
+            segments.append({
+                'start': segment['start'] + offset,
+                'end': segment['end'] + offset,
+                'text': segment['text'],
+            })
+        offset += len(chunk) / SAMPLE_RATE
+    return segments
+
+
+def _split_audio(audio: "np.ndarray") -> List["np.ndarray"]:
+    """Split decoded audio into SUBTITLE_CHUNK_SECONDS pieces"""
+    size = int(settings.SUBTITLE_CHUNK_SECONDS * SAMPLE_RATE)
+    return [audio[i:i + size] for i in range(0, len(audio), size)] or [audio]
+
+
+def _cached_transcribe(
+    chunks: List["np.ndarray"],
+    get_model: Callable,
+    hint: Optional[Tuple[Optional[str], Optional[str]]] = None
+) -> List[Dict]:
+    """
+    Transcribe audio unless the transcript cache already has it
+    
+    The key covers the whole track (its length and every chunk), so clips
+    that only share an opening never get each other's transcripts.
+    """
+    music_title, music_author = hint or (None, None)
+    cache_key = transcript_cache.make_key(chunks_fingerprint(chunks, SAMPLE_RATE), music_title, music_author)
+    
+    segments = transcript_cache.get(cache_key)
+    if segments is not None:
+        log.info("   ♻️ Transcript cache hit, skipping Whisper")
+        return segments
+    
+    segments = transcribe_chunks(get_model(), chunks)
+    transcript_cache.put(cache_key, segments)
+    return segments
+
+
+def generate_arabic_subtitles_batch(
+    video_paths: List[Path],
+    model=None,
+    extract_workers: Optional[int] = None,
+    hints: Optional[Dict[Path, Tuple[Optional[str], Optional[str]]]] = None
+) -> Tuple[Dict[Path, Optional[Path]], Dict]:
+    """
+    Generate Arabic subtitles for several videos in one pass
+    
+    Audio for all videos is decoded concurrently (one ffmpeg per thread)
+    while the model transcribes whichever clip is ready first, so model
+    time overlaps with decoding instead of waiting on it.
+    
+    Args:
+        video_paths: Videos to transcribe
+        model: Loaded Whisper model (defaults to the cached process model)
+        extract_workers: Concurrent ffmpeg decoders (default: cpu count)
+        hints: (music_title, music_author) per video for the transcript cache
+        
+    Returns:
+        (results, stats) - results maps each video to its .srt path or None;
+        stats has videos, audio_seconds, wall_seconds and throughput
+        (audio-seconds per wall-second)
+    """
+    results: Dict[Path, Optional[Path]] = {path: None for path in video_paths}
+    hints = hints or {}
+    audio_seconds = 0.0
+    started = time.perf_counter()
+    
+    def get_model():
+        return model or load_whisper_model()
+    
+    workers = extract_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(workers, len(video_paths) or 1)) as pool:
+        futures = {pool.submit(load_audio, path): path for path in video_paths}
+        
+        for future in as_completed(futures):
+            video_path = futures[future]
+            try:
+                audio = future.result()
+                audio_seconds += len(audio) / SAMPLE_RATE
+                
+                chunks = _split_audio(audio)
+                segments = _cached_transcribe(chunks, get_model, hints.get(video_path))
+                subtitle_path = video_path.parent / f"{video_path.stem}.ar.srt"
+                write_srt(segments, subtitle_path)
+                results[video_path] = subtitle_path
+            except ImportError:
+                log.warning("   Whisper not installed, skipping subtitle generation")
+            except Exception as e:
+                log.error(f"   ❌ Error generating subtitle for {video_path.name}: {e}")
+    
+    wall_seconds = time.perf_counter() - started
+    stats = {
+        'videos': len(results),
+        'audio_seconds': round(audio_seconds, 2),
+        'wall_seconds': round(wall_seconds, 2),
+        'throughput': round(audio_seconds / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+    log.info(f"   ✅ Batch transcription: {stats['videos']} videos, "
+             f"{stats['audio_seconds']}s audio in {stats['wall_seconds']}s "
+             f"({stats['throughput']} audio-s/wall-s)")
+    
+    return results, stats
 
 
-def generate_arabic_subtitle(video_path: Path) -> Optional[Path]:
+def generate_arabic_subtitle(
+    video_path: Path,
+    model=None,
+    music_title: Optional[str] = None,
+    music_author: Optional[str] = None
+) -> Optional[Path]:
     """
     Generate Arabic subtitle for video
     
     Args:
         video_path: Path to video file
+        model: Loaded Whisper model (defaults to the cached process model)
+        music_title: TikTok music title (transcript cache hint)
+        music_author: TikTok music author (transcript cache hint)
         
     Returns:
         Path to generated .srt file or None
@@ -62,47 +273,25 @@ def generate_arabic_subtitle(video_path: Path) -> Optional[Path]:
         
         log.info("   Using Whisper for transcription...")
         
-        # Extract audio first
-        audio_path = video_path.parent / f"{video_id}.wav"
-        if not extract_audio(video_path, audio_path):
-            log.error("   Failed to extract audio")
-            return None
-        
-        # Use Whisper to transcribe
+        # Use Whisper to transcribe audio streamed straight from ffmpeg
         try:
-            import whisper
-            
-            log.info("   Loading Whisper model...")
-            model = whisper.load_model("base")
+            chunks = list(iter_audio_chunks(video_path))
+            if not chunks:
+                log.info("   No audio track, skipping subtitle generation")
+                return None
             
             log.info("   Transcribing audio...")
-            result = model.transcribe(
-                str(audio_path),
-                language='ar',  # Force Arabic
-                task='translate'  # Translate to Arabic if not already
-            )
+            segments = _cached_transcribe(chunks, lambda: model or load_whisper_model(), (music_title, music_author))
             
             # Generate SRT file
             log.info("   Generating SRT file...")
-            with open(subtitle_path, 'w', encoding='utf-8') as f:
-                for i, segment in enumerate(result['segments'], 1):
-                    start = format_timestamp(segment['start'])
-                    end = format_timestamp(segment['end'])
-                    text = segment['text'].strip()
-                    
-                    f.write(f"{i}\n")
-                    f.write(f"{start} --> {end}\n")
-                    f.write(f"{text}\n\n")
-            
-            # Clean up audio file
-            audio_path.unlink(missing_ok=True)
+            write_srt(segments, subtitle_path)
             
             log.info(f"   ✅ Subtitle saved: {subtitle_path.name}")
             return subtitle_path
             
         except ImportError:
             log.warning("   Whisper not installed, skipping subtitle generation")
-            audio_path.unlink(missing_ok=True)
             return None
             
     except Exception as e:
@@ -120,7 +309,49 @@ def format_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
-def embed_subtitle(video_path: Path, subtitle_path: Path, output_path: Path) -> bool:
+def burn_in_workers() -> int:
+    """Concurrent burn-in encodes: one per SUBTITLE_BURN_THREADS cores"""
+    if settings.SUBTITLE_BURN_WORKERS:
+        return settings.SUBTITLE_BURN_WORKERS
+    threads = settings.SUBTITLE_BURN_THREADS or 1
+    return max(1, (os.cpu_count() or 1) // threads)
+
+
+def _subtitle_command(video_path: Path, subtitle_path: Path, output_path: Path, mode: str) -> List[str]:
+    """Build the ffmpeg command for soft (muxed) or burned-in subtitles"""
+    if mode == 'soft':
+        # Mux SRT as a mov_text track - streams are copied, no re-encode
+        return [
+            'ffmpeg',
+            '-i', str(video_path),
+            '-i', str(subtitle_path),
+            '-map', '0',
+            '-map', '1',
+            '-c', 'copy',
+            '-c:s', 'mov_text',
+            '-metadata:s:s:0', 'language=ara',
+            '-y',
+            str(output_path)
+        ]
+    
+    if mode == 'burn':
+        return [
+            'ffmpeg',
+            '-i', str(video_path),
+            '-vf', f"subtitles={str(subtitle_path)}:force_style='FontName=Arial,FontSize=24,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,BorderStyle=3'",
+            '-c:v', 'libx264',
+            '-preset', settings.SUBTITLE_BURN_PRESET,
+            '-crf', str(settings.SUBTITLE_BURN_CRF),
+            '-threads', str(settings.SUBTITLE_BURN_THREADS),
+            '-c:a', 'copy',
+            '-y',
+            str(output_path)
+        ]
+    
+    raise ValueError(f"Invalid subtitle mode: {mode}")
+
+
+def embed_subtitle(video_path: Path, subtitle_path: Path, output_path: Path, mode: Optional[str] = None) -> bool:
     """
     Embed subtitle into video using ffmpeg
     
@@ -128,21 +359,16 @@ def embed_subtitle(video_path: Path, subtitle_path: Path, output_path: Path) ->
         video_path: Original video
         subtitle_path: SRT subtitle file
         output_path: Output video with embedded subtitle
+        mode: 'burn' or 'soft' (mov_text track, no re-encode); default SUBTITLE_MODE
         
     Returns:
         True if successful
     """
     try:
-        log.info(f"   📝 Embedding subtitle into video...")
+        mode = mode or settings.SUBTITLE_MODE
+        log.info(f"   📝 Embedding subtitle into video ({mode})...")
         
-        cmd = [
-            'ffmpeg',
-            '-i', str(video_path),
-            '-vf', f"subtitles={str(subtitle_path)}:force_style='FontName=Arial,FontSize=24,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,BorderStyle=3'",
-            '-c:a', 'copy',
-            '-y',
-            str(output_path)
-        ]
+        cmd = _subtitle_command(video_path, subtitle_path, output_path, mode)
         
         result = subprocess.run(cmd, capture_output=True, text=True)
         
@@ -156,3 +382,28 @@ def embed_subtitle(video_path: Path, subtitle_path: Path, output_path: Path) ->
     except Exception as e:
         log.error(f"   ❌ Error embedding subtitle: {e}")
         return False
+
+
+async def embed_subtitle_async(
+    video_path: Path,
+    subtitle_path: Path,
+    output_path: Path,
+    mode: Optional[str] = None
+) -> bool:
+    """
+    Embed subtitle without blocking the event loop
+    
+    Burn-in encodes are limited to burn_in_workers() ffmpeg processes at a
+    time so concurrent jobs don't oversubscribe the CPU.
+    """
+    global _burn_slots
+    mode = mode or settings.SUBTITLE_MODE
+    
+    if mode != 'burn':
+        return await asyncio.to_thread(embed_subtitle, video_path, subtitle_path, output_path, mode)
+    
+    if _burn_slots is None:
+        _burn_slots = asyncio.Semaphore(burn_in_workers())
+    
+    async with _burn_slots:
+        return await asyncio.to_thread(embed_subtitle, video_path, subtitle_path, output_path, mode)
@@ -0,0 +1,138 @@
+"""
+Transcript Cache - Reuse Whisper segments for audio we've already transcribed
+
+Entries are keyed by an audio fingerprint (plus the TikTok music title/author
+as a hint) and stored as JSON files, so every transcription worker process
+shares the same cache. Least recently used entries are evicted once the cache
+grows past TRANSCRIPT_CACHE_MAX_MB.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from app.core.config import settings
+from app.core.logging import log
+
+
+def audio_fingerprint(audio: "np.ndarray", sample_rate: int = 16000) -> str:
+    """
+    Fast fingerprint of decoded audio
+
+    Hashes the rise/fall pattern of the 100 ms energy envelope plus the frame
+    count. Identical audio, or the same audio at a different volume, gets the
+    same fingerprint; it is an exact match, so a re-encode only matches if
+    every envelope step still rises or falls the same way.
+    """
+    import numpy as np
+
+    frame = sample_rate // 10
+    frames = len(audio) // frame
+    if frames < 2:
+        return hashlib.sha1(audio.tobytes()).hexdigest()
+
+    energy = np.sqrt((audio[:frames * frame].reshape(frames, frame) ** 2).mean(axis=1))
+    pattern = np.packbits(np.diff(energy) > 0)
+    return hashlib.sha1(pattern.tobytes() + frames.to_bytes(4, 'big')).hexdigest()
+
+
+def chunks_fingerprint(chunks: Sequence["np.ndarray"], sample_rate: int = 16000) -> str:
+    """Fingerprint of a whole track decoded in chunks: its length plus every chunk's fingerprint"""
+    samples = sum(len(chunk) for chunk in chunks)
+    parts = [str(samples)] + [audio_fingerprint(chunk, sample_rate) for chunk in chunks]
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()
+
+
+class TranscriptCache:
+    """Disk-backed LRU cache of transcript segments"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.TRANSCRIPT_CACHE_DIR)
+        self.max_bytes = (max_mb if max_mb is not None else settings.TRANSCRIPT_CACHE_MAX_MB) * 1024 * 1024
+        self._approx_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        fingerprint: str,
+        music_title: Optional[str] = None,
+        music_author: Optional[str] = None
+    ) -> str:
+        """Combine the audio fingerprint with the music hint"""
+        hint = f"{music_author or ''}|{music_title or ''}".lower()
+        return hashlib.sha1(f"{hint}|{fingerprint}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached segments or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                segments = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return segments
+
+    def put(self, key: str, segments: List[Dict]):
+        """Store segments and evict old entries if the cache is too large"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        data = json.dumps(segments, ensure_ascii=False)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # atomic, safe across worker processes
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._total_bytes()
+        else:
+            self._approx_bytes += len(data.encode('utf-8'))
+
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _total_bytes(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json'))
+
+    def evict(self):
+        """Delete least recently used entries down to 90% of the size limit"""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+
+        self._approx_bytes = total
+        if removed:
+            log.info(f"Transcript cache: evicted {removed} entries ({total / 1024 / 1024:.1f} MB kept)")
+
+
+# Global transcript cache instance
+transcript_cache = TranscriptCache()
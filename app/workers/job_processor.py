@@ -1,14 +1,15 @@
 import asyncio
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.models import Job, Video, JobStatus, VideoStatus, ScrapingMode
+from app.models.models import Job, Video, VideoHashtag, JobStatus, VideoStatus, ScrapingMode
 from app.scrapers.profile_scraper import ProfileScraper
 from app.scrapers.hashtag_scraper import HashtagScraper
 from app.downloaders.video_downloader import VideoDownloader
 from app.storage.google_drive import GoogleDriveManager
+from app.workers.transcription_pool import transcription_service
 from app.core.config import settings
 from app.core.logging import log
 
@@ -94,7 +95,8 @@ class JobProcessor:
                         username=job.value,
                         limit=job.limit,
                         since=job.since,
-                        until=job.until
+                        until=job.until,
+                        job_id=job.id
                     )
             elif job.mode == ScrapingMode.HASHTAG.value or job.mode == "hashtag":
                 async with HashtagScraper() as scraper:
@@ -142,6 +144,12 @@ class JobProcessor:
                     elif existing_video.drive_file_id:
                         log.info(f"Video {video_data['video_id']} already uploaded to Drive, skipping")
                         continue
+                    # Row created by this job's batch download for progress: fill it in
+                    elif existing_video.job_id == job.id and not existing_video.video_url:
+                        existing_video.url = video_data['url']
+                        existing_video.video_url = video_data.get('video_url')
+                        existing_video.duration = video_data.get('duration')
+                        await self.db.commit()
                     # If video downloaded but not uploaded, will be handled in download phase
                     else:
                         log.info(f"Video {video_data['video_id']} exists but not uploaded, will process")
@@ -178,9 +186,14 @@ class JobProcessor:
                         music_author=video_data.get('music_author'),
                         video_url=video_data.get('video_url'),
                         duration=video_data.get('duration'),
-                        status=VideoStatus.PENDING.value,
-                        raw_metadata=video_data.get('raw_data')
+                        status=VideoStatus.PENDING.value
                     )
+                    if video_data.get('raw_data'):
+                        video.raw_metadata = video_data['raw_data']
+                    video.hashtag_rows = [
+                        VideoHashtag(tag=tag)
+                        for tag in VideoHashtag.normalize(video_data.get('hashtags'))
+                    ]
                     
                     self.db.add(video)
             except Exception as e:
@@ -205,6 +218,9 @@ class JobProcessor:
         
         log.info(f"Processing {len(videos)} videos for job {job.id}")
         
+        # Uploaded videos waiting for a subtitled version: (video, path, uploader)
+        subtitle_jobs = []
+        
         # Check if videos are already downloaded (from WorkingScraper)
         for video in videos:
             try:
@@ -240,33 +256,8 @@ class JobProcessor:
                             video.drive_file_id = upload_result.get('file_id')
                             log.info(f"✅ Uploaded original to Drive: {upload_result.get('web_link')}")
                             
-                            # Generate and upload subtitled version
-                            try:
-                                from app.utils.subtitle_generator import generate_arabic_subtitle, embed_subtitle
-                                
-                                log.info(f"🎬 Generating Arabic subtitle for {video.id}...")
-                                subtitle_path = generate_arabic_subtitle(video_path)
-                                
-                                if subtitle_path and subtitle_path.exists():
-                                    # Create output path for subtitled video
-                                    subtitled_video_path = video_path.parent / f"{video.id}_subtitled.mp4"
-                                    
-                                    if embed_subtitle(video_path, subtitle_path, subtitled_video_path):
-                                        # Upload subtitled version
-                                        subtitled_upload = uploader.upload_video(subtitled_video_path)
-                                        
-                                        if subtitled_upload.get('success'):
-                                            log.info(f"✅ Uploaded subtitled version to Drive: {subtitled_upload.get('web_link')}")
-                                        
-                                        # Clean up subtitled video
-                                        subtitled_video_path.unlink(missing_ok=True)
-                                    
-                                    # Clean up subtitle file
-                                    subtitle_path.unlink(missing_ok=True)
-                                else:
-                                    log.info(f"ℹ️ No subtitle generated for {video.id}")
-                            except Exception as e:
-                                log.warning(f"⚠️ Subtitle generation/upload error: {e}")
+                            # Subtitled version is generated for the whole job after the loop
+                            subtitle_jobs.append((video, video_path, uploader))
                         else:
                             video.status = VideoStatus.DOWNLOADED.value
                             log.warning(f"⚠️ Drive upload failed: {upload_result.get('error')}")
@@ -339,7 +330,7 @@ class JobProcessor:
                     await self.db.commit()
                     
                     log.error(f"Failed to save video {video.id}: {error_msg}")
-                    return
+                    continue
                 
                 # Update video with download info
                 video.status = VideoStatus.DOWNLOADED.value
@@ -368,33 +359,8 @@ class JobProcessor:
                         video.drive_file_id = upload_result.get('file_id')
                         log.info(f"✅ Uploaded original to Drive: {upload_result.get('web_link')}")
                         
-                        # Generate and upload subtitled version
-                        try:
-                            from app.utils.subtitle_generator import generate_arabic_subtitle, embed_subtitle
-                            
-                            log.info(f"🎬 Generating Arabic subtitle for {video.id}...")
-                            subtitle_path = generate_arabic_subtitle(video_path)
-                            
-                            if subtitle_path and subtitle_path.exists():
-                                # Create output path for subtitled video
-                                subtitled_video_path = video_path.parent / f"{video.id}_subtitled.mp4"
-                                
-                                if embed_subtitle(video_path, subtitle_path, subtitled_video_path):
-                                    # Upload subtitled version
-                                    subtitled_upload = uploader.upload_video(subtitled_video_path)
-                                    
-                                    if subtitled_upload.get('success'):
-                                        log.info(f"✅ Uploaded subtitled version to Drive: {subtitled_upload.get('web_link')}")
-                                    
-                                    # Clean up subtitled video
-                                    subtitled_video_path.unlink(missing_ok=True)
-                                
-                                # Clean up subtitle file
-                                subtitle_path.unlink(missing_ok=True)
-                            else:
-                                log.info(f"ℹ️ No subtitle generated for {video.id}")
-                        except Exception as e:
-                            log.warning(f"⚠️ Subtitle generation/upload error: {e}")
+                        # Subtitled version is generated for the whole job after the loop
+                        subtitle_jobs.append((video, video_path, uploader))
                     else:
                         video.status = VideoStatus.DOWNLOADED.value
                         log.warning(f"⚠️ Drive upload failed: {upload_result.get('error')}")
@@ -423,3 +389,47 @@ class JobProcessor:
                 
                 job.failed_downloads += 1
                 await self.db.commit()
+        
+        await self._upload_subtitled_versions(subtitle_jobs)
+    
+    async def _upload_subtitled_versions(self, subtitle_jobs: List[Tuple[Video, Path, object]]):
+        """Transcribe all uploaded videos of a job in one batch and upload subtitled copies"""
+        if not subtitle_jobs:
+            return
+        
+        try:
+            from app.utils.subtitle_generator import embed_subtitle_async
+            
+            log.info(f"🎬 Generating Arabic subtitles for {len(subtitle_jobs)} videos...")
+            subtitles = await transcription_service.transcribe_batch(
+                {video.id: video_path for video, video_path, _ in subtitle_jobs},
+                hints={video.id: (video.music_title, video.music_author) for video, _, _ in subtitle_jobs}
+            )
+        except Exception as e:
+            log.warning(f"⚠️ Subtitle generation error: {e}")
+            return
+        
+        for video, video_path, uploader in subtitle_jobs:
+            try:
+                subtitle_path = subtitles.get(video.id)
+                
+                if subtitle_path and subtitle_path.exists():
+                    # Create output path for subtitled video
+                    subtitled_video_path = video_path.parent / f"{video.id}_subtitled.mp4"
+                    
+                    if await embed_subtitle_async(video_path, subtitle_path, subtitled_video_path):
+                        # Upload subtitled version
+                        subtitled_upload = uploader.upload_video(subtitled_video_path)
+                        
+                        if subtitled_upload.get('success'):
+                            log.info(f"✅ Uploaded subtitled version to Drive: {subtitled_upload.get('web_link')}")
+                        
+                        # Clean up subtitled video
+                        subtitled_video_path.unlink(missing_ok=True)
+                    
+                    # Clean up subtitle file
+                    subtitle_path.unlink(missing_ok=True)
+                else:
+                    log.info(f"ℹ️ No subtitle generated for {video.id}")
+            except Exception as e:
+                log.warning(f"⚠️ Subtitle generation/upload error: {e}")
@@ -0,0 +1,204 @@
+"""
+Transcription Service - Whisper subtitles in dedicated worker processes
+
+Each worker loads the Whisper model once at startup. Jobs are queued to the
+workers and deduplicated by video ID, so the event loop never runs ffmpeg or
+Whisper and a video is never transcribed twice at the same time.
+"""
+import asyncio
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import log
+
+# (music_title, music_author) passed to the transcript cache
+Hint = Tuple[Optional[str], Optional[str]]
+
+
+def _worker_init(model_name: str):
+    """Load the Whisper model once when the worker starts"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app.utils.subtitle_generator import load_whisper_model
+
+    try:
+        load_whisper_model(model_name)
+    except ImportError:
+        log.warning("Whisper not installed, transcription worker will skip jobs")
+
+
+def _transcribe(video_path: str, hint: Optional[Hint] = None) -> Optional[str]:
+    """Generate the SRT for a video inside a worker process"""
+    from app.utils.subtitle_generator import generate_arabic_subtitle
+
+    music_title, music_author = hint or (None, None)
+    subtitle_path = generate_arabic_subtitle(Path(video_path), music_title=music_title, music_author=music_author)
+    return str(subtitle_path) if subtitle_path else None
+
+
+def _transcribe_batch(
+    video_paths: List[str],
+    hints: Optional[Dict[str, Hint]] = None
+) -> Tuple[Dict[str, Optional[str]], Dict]:
+    """Generate SRTs for a group of videos inside a worker process"""
+    from app.utils.subtitle_generator import generate_arabic_subtitles_batch
+
+    hints = {Path(p): hint for p, hint in (hints or {}).items()}
+    results, stats = generate_arabic_subtitles_batch([Path(p) for p in video_paths], hints=hints)
+    return {str(video): str(srt) if srt else None for video, srt in results.items()}, stats
+
+
+class TranscriptionService:
+    """Queue-based Whisper transcription pool with per-video deduplication"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.TRANSCRIPTION_WORKERS
+        self.model_name = settings.WHISPER_MODEL
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.last_batch_stats: Optional[Dict] = None
+
+    def start(self):
+        """Start worker processes (called lazily on first job)"""
+        if self._executor:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(self.model_name,),
+        )
+        log.info(f"Transcription service started with {self.max_workers} workers "
+                 f"(model: {self.model_name})")
+
+    def shutdown(self):
+        """Stop worker processes and cancel queued jobs"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._inflight.clear()
+            log.info("Transcription service stopped")
+
+    def queue_size(self) -> int:
+        """Number of videos queued or being transcribed"""
+        return len(self._inflight)
+
+    async def transcribe(self, video_id: str, video_path: Path, hint: Optional[Hint] = None) -> Optional[Path]:
+        """
+        Generate an Arabic SRT for a video
+
+        Args:
+            video_id: TikTok video ID (deduplication key)
+            video_path: Path to the video file
+            hint: (music_title, music_author) for the transcript cache
+
+        Returns:
+            Path to the .srt file or None
+        """
+        existing = self._inflight.get(video_id)
+        if existing:
+            log.info(f"Transcription for {video_id} already queued, waiting for it")
+        else:
+            self.start()
+            existing = asyncio.wrap_future(self._executor.submit(_transcribe, str(video_path), hint))
+            self._inflight[video_id] = existing
+            existing.add_done_callback(lambda _: self._inflight.pop(video_id, None))
+
+        # Shield so one cancelled caller doesn't cancel the shared job
+        result = await asyncio.shield(existing)
+        return Path(result) if result else None
+
+    async def transcribe_batch(
+        self,
+        videos: Dict[str, Path],
+        hints: Optional[Dict[str, Hint]] = None
+    ) -> Dict[str, Optional[Path]]:
+        """
+        Generate Arabic SRTs for many videos at once
+
+        Videos are split into one group per worker; each worker decodes its
+        group's audio concurrently and transcribes it with its loaded model.
+        Throughput for the call is kept in last_batch_stats.
+
+        Args:
+            videos: Mapping of video ID to video path
+            hints: Mapping of video ID to (music_title, music_author)
+
+        Returns:
+            Mapping of video ID to .srt path (or None)
+        """
+        loop = asyncio.get_running_loop()
+        hints = hints or {}
+        waiting: Dict[str, asyncio.Future] = {}
+        new_jobs: List[Tuple[Path, Optional[Hint], asyncio.Future]] = []
+
+        for video_id, video_path in videos.items():
+            if video_id in self._inflight:
+                waiting[video_id] = self._inflight[video_id]
+                continue
+
+            future = loop.create_future()
+            self._inflight[video_id] = future
+            future.add_done_callback(lambda _, vid=video_id: self._inflight.pop(vid, None))
+            waiting[video_id] = future
+            new_jobs.append((video_path, hints.get(video_id), future))
+
+        if new_jobs:
+            try:
+                self.start()
+                groups = [new_jobs[i::self.max_workers] for i in range(self.max_workers)]
+                started = time.perf_counter()
+                stats = await asyncio.gather(*(self._run_group(group) for group in groups if group))
+
+                audio_seconds = sum(s['audio_seconds'] for s in stats)
+                wall_seconds = time.perf_counter() - started
+                self.last_batch_stats = {
+                    'videos': len(new_jobs),
+                    'audio_seconds': round(audio_seconds, 2),
+                    'wall_seconds': round(wall_seconds, 2),
+                    'throughput': round(audio_seconds / wall_seconds, 2) if wall_seconds else 0.0,
+                }
+                log.info(f"Batch transcription finished: {self.last_batch_stats}")
+            finally:
+                # Cancelled or failed before resolving: fail callers deduplicated
+                # onto these videos with an error (their own tasks weren't
+                # cancelled, so no CancelledError) instead of leaving them waiting
+                for video_path, _, future in new_jobs:
+                    if not future.done():
+                        future.set_exception(RuntimeError("transcription cancelled"))
+                        future.exception()  # nobody may be left to retrieve it
+                for video_id, future in waiting.items():
+                    if future.done() and self._inflight.get(video_id) is future:
+                        del self._inflight[video_id]
+
+        results = {}
+        for video_id, future in waiting.items():
+            result = await asyncio.shield(future)
+            results[video_id] = Path(result) if result else None
+        return results
+
+    async def _run_group(self, group: List[Tuple[Path, Optional[Hint], asyncio.Future]]) -> Dict:
+        """Send one group of videos to a worker and resolve their futures"""
+        paths = [str(path) for path, _, _ in group]
+        hints = {str(path): hint for path, hint, _ in group if hint}
+        try:
+            results, stats = await asyncio.wrap_future(
+                self._executor.submit(_transcribe_batch, paths, hints)
+            )
+        except Exception as e:
+            log.error(f"Batch transcription failed: {e}")
+            results, stats = {}, {'audio_seconds': 0.0}
+
+        for video_path, _, future in group:
+            if not future.done():
+                future.set_result(results.get(str(video_path)))
+        return stats
+
+
+# Global transcription service instance
+transcription_service = TranscriptionService()
@@ -0,0 +1,233 @@
+"""
+YT-DLP Worker Pool - Runs yt-dlp in separate processes
+
+yt-dlp is CPU heavy (extraction, muxing) and holds the GIL for long stretches,
+so every call is shipped to a dedicated process pool instead of running on the
+API event loop or the default thread pool.
+"""
+import asyncio
+import multiprocessing
+import re
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.outbound_governor import outbound_governor
+from app.core.logging import log
+
+
+# yt-dlp reports throttling as e.g. "HTTP Error 429: Too Many Requests"
+HTTP_ERROR_PATTERN = re.compile(r'HTTP Error (\d{3})')
+
+
+class YtdlpJobCancelled(Exception):
+    """Raised when a yt-dlp job is cancelled or times out"""
+
+
+def _worker_init():
+    """Ignore Ctrl+C in workers - the parent process handles shutdown"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _collect_files(info: Dict) -> List[str]:
+    """Collect downloaded file paths from a (possibly playlist) info dict"""
+    files = []
+    entries = info.get('entries') or [info]
+    for entry in entries:
+        if not entry:
+            continue
+        for download in entry.get('requested_downloads') or []:
+            filepath = download.get('filepath')
+            if filepath:
+                files.append(filepath)
+    return files
+
+
+def _run_extract(url: str, ydl_opts: Dict, download: bool, cancel_event, progress_queue=None) -> Dict:
+    """
+    Run yt-dlp extraction inside a worker process
+
+    Returns a picklable dict with sanitized metadata and downloaded file paths.
+    """
+    import yt_dlp
+
+    def cancel_hook(progress: Dict):
+        if cancel_event is not None and cancel_event.is_set():
+            raise yt_dlp.utils.DownloadCancelled("Job cancelled")
+
+    def report_hook(progress: Dict):
+        info = progress.get('info_dict') or {}
+        progress_queue.put({
+            'video_id': info.get('id'),
+            'status': progress.get('status'),
+            'downloaded_bytes': progress.get('downloaded_bytes') or 0,
+            'total_bytes': progress.get('total_bytes') or progress.get('total_bytes_estimate') or 0,
+        })
+
+    hooks = [cancel_hook]
+    if progress_queue is not None:
+        hooks.append(report_hook)
+
+    opts = dict(ydl_opts)
+    opts['progress_hooks'] = list(opts.get('progress_hooks') or []) + hooks
+
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(url, download=download)
+        if not info:
+            return {'info': None, 'files': []}
+
+        info = ydl.sanitize_info(info)
+        return {
+            'info': info,
+            'files': _collect_files(info) if download else [],
+        }
+
+
+class YtdlpWorkerPool:
+    """Process pool for yt-dlp jobs with per-call timeouts and cancellation"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.YTDLP_WORKERS
+        self.default_timeout = settings.YTDLP_JOB_TIMEOUT
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._manager_lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self):
+        """Start worker processes (called lazily on first job)"""
+        if self._executor:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_worker_init,
+        )
+        log.info(f"yt-dlp worker pool started with {self.max_workers} processes")
+
+    def shutdown(self):
+        """Stop worker processes and cancel queued jobs"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            log.info("yt-dlp worker pool stopped")
+
+        if self._manager:
+            self._manager.shutdown()
+            self._manager = None
+
+    def _get_manager(self):
+        """Manager process for objects shared with workers (blocking, call off the loop)"""
+        with self._manager_lock:
+            if not self._manager:
+                self._manager = self._context.Manager()
+            return self._manager
+
+    async def _new_shared(self, kind: str):
+        # Creating a proxy is a round trip to the manager process
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: getattr(self._get_manager(), kind)()
+        )
+
+    async def _new_cancel_event(self):
+        """Create an event that can be shared with a worker process"""
+        return await self._new_shared('Event')
+
+    async def new_progress_queue(self):
+        """Create a queue that workers push yt-dlp progress updates into"""
+        return await self._new_shared('Queue')
+
+    async def run(
+        self,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        cancellable: bool = False
+    ) -> Any:
+        """
+        Run a picklable function in the pool
+
+        Queued jobs are dropped on timeout or cancellation. With
+        cancellable=True the function is called with a `cancel_event`
+        keyword argument that is set at that point, so a job that is
+        already running can stop and free its worker; otherwise it keeps
+        the worker until it returns.
+        """
+        self.start()
+        cancel_event = await self._new_cancel_event() if cancellable else None
+        if cancel_event is not None:
+            future = self._executor.submit(func, *args, cancel_event=cancel_event)
+        else:
+            future = self._executor.submit(func, *args)
+        timeout = timeout if timeout is not None else self.default_timeout
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if cancel_event is not None:
+                cancel_event.set()
+            future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                raise YtdlpJobCancelled(f"Job timed out after {timeout}s")
+            raise
+
+    async def extract(
+        self,
+        url: str,
+        ydl_opts: Dict,
+        download: bool = True,
+        timeout: Optional[float] = None,
+        progress_queue=None
+    ) -> Dict:
+        """
+        Extract (and optionally download) a URL in a worker process
+
+        Args:
+            url: TikTok URL (video, profile or hashtag page)
+            ydl_opts: yt-dlp options
+            download: Download media as well as metadata
+            timeout: Seconds before the job is cancelled (default from settings)
+            progress_queue: Queue from new_progress_queue() for progress updates
+
+        Returns:
+            Dict with 'info' (sanitized metadata) and 'files' (downloaded paths)
+        """
+        self.start()
+        # The first request is paced by the outbound governor; the ones yt-dlp
+        # makes inside the job (playlist pages, formats) at the site's current rate
+        await outbound_governor.acquire(url)
+        ydl_opts = dict(ydl_opts)
+        ydl_opts.setdefault('sleep_interval_requests', outbound_governor.interval(url))
+
+        cancel_event = await self._new_cancel_event()
+        future = self._executor.submit(
+            _run_extract, url, ydl_opts, download, cancel_event, progress_queue
+        )
+        timeout = timeout if timeout is not None else self.default_timeout
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            outbound_governor.record(url, 200)
+            return result
+        except asyncio.TimeoutError:
+            cancel_event.set()
+            future.cancel()
+            log.warning(f"yt-dlp job timed out after {timeout}s: {url}")
+            raise YtdlpJobCancelled(f"Job timed out after {timeout}s")
+        except asyncio.CancelledError:
+            # Running downloads stop at the next progress hook
+            cancel_event.set()
+            future.cancel()
+            log.info(f"yt-dlp job cancelled: {url}")
+            raise
+        except Exception as e:
+            match = HTTP_ERROR_PATTERN.search(str(e))
+            if match:
+                outbound_governor.record(url, int(match.group(1)))
+            raise
+
+
+# Global yt-dlp worker pool instance
+ytdlp_pool = YtdlpWorkerPool()
@@ -0,0 +1,45 @@
+"""
+Alembic environment
+
+Runs on the connection passed by init_db (config.attributes["connection"])
+or, from the alembic CLI, on a new engine for DATABASE_URL.
+"""
+import asyncio
+from logging.config import fileConfig
+from alembic import context
+from app.models.database import Base, make_engine
+from app.models import models  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",  # ALTER TABLE support
+        compare_type=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    engine = make_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    raise RuntimeError("Offline (--sql) migrations are not supported")
+
+connection = config.attributes.get("connection")
+if connection is not None:
+    do_run_migrations(connection)
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,132 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(JSONB(), "postgresql")
+
+
+def upgrade():
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("mode", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("limit", sa.Integer()),
+        sa.Column("no_watermark", sa.Boolean()),
+        sa.Column("since", sa.DateTime()),
+        sa.Column("until", sa.DateTime()),
+        sa.Column("drive_folder_id", sa.String()),
+        sa.Column("status", sa.String()),
+        sa.Column("progress", sa.Integer()),
+        sa.Column("total_videos", sa.Integer()),
+        sa.Column("successful_downloads", sa.Integer()),
+        sa.Column("failed_downloads", sa.Integer()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("completed_at", sa.DateTime()),
+    )
+    for column in ("id", "mode", "value", "status", "created_at"):
+        op.create_index(f"ix_jobs_{column}", "jobs", [column])
+
+    op.create_table(
+        "videos",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("desc", sa.Text()),
+        sa.Column("author_username", sa.String(), nullable=False),
+        sa.Column("author_nickname", sa.String()),
+        sa.Column("views", sa.BigInteger()),
+        sa.Column("likes", sa.BigInteger()),
+        sa.Column("comments", sa.BigInteger()),
+        sa.Column("shares", sa.BigInteger()),
+        sa.Column("created_at_tiktok", sa.DateTime()),
+        sa.Column("scraped_at", sa.DateTime()),
+        sa.Column("hashtags", JSONType),
+        sa.Column("music_title", sa.String()),
+        sa.Column("music_author", sa.String()),
+        sa.Column("video_url", sa.String()),
+        sa.Column("has_watermark", sa.Boolean()),
+        sa.Column("local_path", sa.String()),
+        sa.Column("file_size", sa.BigInteger()),
+        sa.Column("duration", sa.Float()),
+        sa.Column("drive_file_id", sa.String()),
+        sa.Column("drive_folder_path", sa.String()),
+        sa.Column("drive_metadata_file_id", sa.String()),
+        sa.Column("status", sa.String()),
+        sa.Column("download_progress", sa.Integer()),
+        sa.Column("download_attempts", sa.Integer()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("raw_metadata", JSONType),
+    )
+    for column in ("id", "job_id", "author_username", "drive_file_id", "status"):
+        op.create_index(f"ix_videos_{column}", "videos", [column])
+    op.create_index("ix_videos_status_scraped_at", "videos", ["status", "scraped_at"])
+    op.create_index("ix_videos_author_scraped_at", "videos", ["author_username", "scraped_at"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index("ix_videos_hashtags_gin", "videos", ["hashtags"], postgresql_using="gin")
+        op.create_index("ix_videos_raw_metadata_gin", "videos", ["raw_metadata"], postgresql_using="gin",
+                        postgresql_ops={"raw_metadata": "jsonb_path_ops"})
+
+    op.create_table(
+        "video_hashtags",
+        sa.Column("video_id", sa.String(), sa.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("tag", sa.String(), primary_key=True),
+    )
+    op.create_index("ix_video_hashtags_tag", "video_hashtags", ["tag"])
+
+    op.create_table(
+        "scheduled_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("mode", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("limit", sa.Integer()),
+        sa.Column("no_watermark", sa.Boolean()),
+        sa.Column("drive_folder_id", sa.String()),
+        sa.Column("interval_minutes", sa.Integer()),
+        sa.Column("enabled", sa.Boolean()),
+        sa.Column("last_run_at", sa.DateTime()),
+        sa.Column("next_run_at", sa.DateTime()),
+        sa.Column("total_runs", sa.Integer()),
+        sa.Column("successful_runs", sa.Integer()),
+        sa.Column("failed_runs", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_scheduled_jobs_id", "scheduled_jobs", ["id"])
+    op.create_index("ix_scheduled_jobs_enabled", "scheduled_jobs", ["enabled"])
+
+    op.create_table(
+        "stat_counters",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+
+    # FTS5 table + triggers (SQLite) or tsvector column + GIN index (PostgreSQL)
+    from app.models.search import ensure_search_index
+    ensure_search_index(op.get_bind())
+
+
+def downgrade():
+    from app.models.search import drop_search_index
+    drop_search_index(op.get_bind())
+
+    op.drop_table("stat_counters")
+    op.drop_table("scheduled_jobs")
+    op.drop_table("video_hashtags")
+    op.drop_table("videos")
+    op.drop_table("jobs")
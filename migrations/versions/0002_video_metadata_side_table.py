@@ -0,0 +1,67 @@
+"""Move videos.raw_metadata to the video_metadata side table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(JSONB(), "postgresql")
+
+
+def _restore_search_index():
+    # SQLite batch mode rebuilds `videos`, which drops its FTS triggers and
+    # renumbers rowids, so recreate the triggers and re-index
+    from app.models.search import ensure_search_index, rebuild_search_index
+    bind = op.get_bind()
+    ensure_search_index(bind)
+    rebuild_search_index(bind)
+
+
+def upgrade():
+    op.create_table(
+        "video_metadata",
+        sa.Column("video_id", sa.String(), sa.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("data", JSONType),
+    )
+    op.execute(
+        "INSERT INTO video_metadata (video_id, data) "
+        "SELECT id, raw_metadata FROM videos WHERE raw_metadata IS NOT NULL"
+    )
+
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    if is_postgres:
+        op.drop_index("ix_videos_raw_metadata_gin", table_name="videos")
+        op.create_index("ix_video_metadata_data_gin", "video_metadata", ["data"], postgresql_using="gin",
+                        postgresql_ops={"data": "jsonb_path_ops"})
+
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("raw_metadata")
+
+    if not is_postgres:
+        _restore_search_index()
+
+
+def downgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.add_column(sa.Column("raw_metadata", JSONType))
+
+    op.execute(
+        "UPDATE videos SET raw_metadata = "
+        "(SELECT data FROM video_metadata WHERE video_metadata.video_id = videos.id)"
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index("ix_videos_raw_metadata_gin", "videos", ["raw_metadata"], postgresql_using="gin",
+                        postgresql_ops={"raw_metadata": "jsonb_path_ops"})
+    else:
+        _restore_search_index()
+
+    op.drop_table("video_metadata")
@@ -0,0 +1,31 @@
+"""Add videos.last_accessed_at and videos.pinned for the retention engine
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Plain ADD COLUMN on both backends, so SQLite keeps its FTS triggers
+    op.add_column("videos", sa.Column("last_accessed_at", sa.DateTime(), nullable=True))
+    op.add_column("videos", sa.Column("pinned", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table("videos") as batch:
+        batch.drop_column("pinned")
+        batch.drop_column("last_accessed_at")
+
+    if op.get_bind().dialect.name == "sqlite":
+        from app.models.search import ensure_search_index, rebuild_search_index
+        bind = op.get_bind()
+        ensure_search_index(bind)
+        rebuild_search_index(bind)
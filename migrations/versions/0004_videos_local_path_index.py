@@ -0,0 +1,21 @@
+"""Index videos.local_path for the orphan file scan
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases stamped from the legacy schema already get model indexes
+    op.create_index("ix_videos_local_path", "videos", ["local_path"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_videos_local_path", table_name="videos")
@@ -0,0 +1,54 @@
+"""Fill video_hashtags from the videos.hashtags JSON column
+
+Databases stamped from the legacy schema (and any upgraded before hashtag
+rows were written on insert) have videos without rows in video_hashtags, so
+hashtag filters would miss them. Videos that already have rows are skipped.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+videos = sa.table("videos", sa.column("id", sa.String()), sa.column("hashtags", sa.JSON()))
+video_hashtags = sa.table("video_hashtags", sa.column("video_id", sa.String()), sa.column("tag", sa.String()))
+
+
+def upgrade():
+    from app.models.models import VideoHashtag
+
+    bind = op.get_bind()
+    has_rows = sa.exists().where(video_hashtags.c.video_id == videos.c.id)
+    last_id = ""
+
+    while True:
+        batch = bind.execute(
+            sa.select(videos.c.id, videos.c.hashtags)
+            .where(videos.c.id > last_id, ~has_rows)
+            .order_by(videos.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+
+        rows = [
+            {"video_id": video_id, "tag": tag}
+            for video_id, hashtags in batch
+            for tag in VideoHashtag.normalize(hashtags)
+        ]
+        if rows:
+            bind.execute(video_hashtags.insert(), rows)
+        last_id = batch[-1][0]
+
+
+def downgrade():
+    # Rows written by the application are indistinguishable from backfilled ones
+    pass
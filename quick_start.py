@@ -71,8 +71,8 @@ API_PORT=8000
 DATABASE_URL=sqlite+aiosqlite:///./tiktok_scraper.db
 
 TIKTOK_MAX_VIDEOS_PER_REQUEST=50
-TIKTOK_REQUEST_DELAY_MIN=2
-TIKTOK_REQUEST_DELAY_MAX=5
+OUTBOUND_RATE_PER_SECOND=0.25
+OUTBOUND_MAX_RATE=2.0
 """)
         print("✅ .env file created!\n")
 
@@ -0,0 +1,137 @@
+"""
+Benchmark SQLite contention: default rollback journal vs the WAL profile
+
+Simulates job workers updating video rows while API clients page through
+/videos-style queries, and reports throughput, read latency and lock errors
+for each profile.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models.database import Base, make_engine, sqlite_pragmas
+from app.models.models import Job, Video, VideoStatus
+
+# Pre-change behaviour: rollback journal, full sync, no busy timeout
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": 0}
+
+
+async def seed(session_factory, videos: int):
+    """Insert one job and `videos` video rows"""
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        await db.execute(insert(Job), [{'id': 'bench', 'mode': 'profile', 'value': 'bench'}])
+        await db.execute(insert(Video), [
+            {
+                'id': str(i), 'job_id': 'bench', 'url': f'https://tiktok.com/{i}',
+                'author_username': f'author{i % 50}', 'status': VideoStatus.PENDING.value,
+                'scraped_at': now - timedelta(seconds=i),
+            }
+            for i in range(videos)
+        ])
+        await db.commit()
+
+
+async def writer(session_factory, videos: int, stop: float, stats: dict, worker: int):
+    """Job worker: flip video statuses one small transaction at a time"""
+    i = worker
+    while time.perf_counter() < stop:
+        try:
+            async with session_factory() as db:
+                await db.execute(
+                    update(Video).where(Video.id == str(i % videos))
+                    .values(status=VideoStatus.DOWNLOADED.value, download_progress=i % 100)
+                )
+                await db.commit()
+            stats['writes'] += 1
+        except OperationalError:
+            stats['errors'] += 1
+        i += 7
+
+
+async def reader(session_factory, stop: float, stats: dict, latencies: list):
+    """API client: page through the newest videos"""
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(Video).where(Video.status == VideoStatus.PENDING.value)
+                    .order_by(Video.scraped_at.desc()).limit(50)
+                )
+                result.scalars().all()
+            stats['reads'] += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            stats['errors'] += 1
+
+
+async def run_profile(name: str, pragmas: dict, read_pragmas: dict, args) -> dict:
+    """Run the workload against a fresh database file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        write_engine = make_engine(url, pragmas=pragmas)
+        read_engine = make_engine(url, read_only=True, pragmas=read_pragmas)
+
+        async with write_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        write_sessions = async_sessionmaker(write_engine, expire_on_commit=False)
+        read_sessions = async_sessionmaker(read_engine, expire_on_commit=False)
+        await seed(write_sessions, args.videos)
+
+        stats = {'writes': 0, 'reads': 0, 'errors': 0}
+        latencies = []
+        stop = time.perf_counter() + args.seconds
+
+        await asyncio.gather(
+            *(writer(write_sessions, args.videos, stop, stats, w) for w in range(args.writers)),
+            *(reader(read_sessions, stop, stats, latencies) for _ in range(args.readers)),
+        )
+
+        await write_engine.dispose()
+        await read_engine.dispose()
+
+    latencies.sort()
+    return {
+        'profile': name,
+        'writes/s': stats['writes'] / args.seconds,
+        'reads/s': stats['reads'] / args.seconds,
+        'p50 read ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95 read ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        'lock errors': stats['errors'],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite write/read contention")
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent writer tasks")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent reader tasks")
+    parser.add_argument("--videos", type=int, default=20000, help="Rows to seed")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration per profile")
+    args = parser.parse_args()
+
+    results = [
+        await run_profile("default", DEFAULT_PRAGMAS, {"busy_timeout": 0}, args),
+        await run_profile("wal", sqlite_pragmas(), sqlite_pragmas(read_only=True), args),
+    ]
+
+    columns = list(results[0].keys())
+    print(" ".join(f"{c:>12}" for c in columns))
+    for row in results:
+        print(" ".join(f"{v:>12.1f}" if isinstance(v, float) else f"{v:>12}" for v in row.values()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark video serving: app-served (zero-copy/chunked) vs nginx offload
+
+Runs parallel dashboard-style downloads of one video against each target and
+reports throughput plus the CPU seconds the API worker spent doing it.
+
+Start one server per mode first, e.g.:
+
+    MEDIA_OFFLOAD_MODE=none uvicorn app.main:app --port 8000
+    MEDIA_OFFLOAD_MODE=x-accel-redirect uvicorn app.main:app --port 8001  # behind nginx on :8080
+
+then:
+
+    python scripts/benchmark_media_serving.py --video-id 7123... \\
+        --target none http://127.0.0.1:8000 <uvicorn pid> \\
+        --target x-accel http://127.0.0.1:8080 <uvicorn pid>
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from app.core.config import settings
+
+
+def worker_cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process (Linux /proc)"""
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    # utime and stime are fields 14 and 15 of stat(5); fields[0] is field 3
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def download(client: httpx.AsyncClient, url: str, range_header: str) -> int:
+    """Fetch one video (or range of it) and return the bytes received"""
+    headers = {"Range": range_header} if range_header else {}
+    received = 0
+    async with client.stream("GET", url, headers=headers) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            received += len(chunk)
+    return received
+
+
+async def run_target(name: str, base_url: str, pid: int, args) -> dict:
+    """Run `requests` downloads with `concurrency` in flight against one server"""
+    url = f"{base_url.rstrip('/')}/api/v1/videos/{args.video_id}/{args.endpoint}"
+    headers = {settings.API_KEY_HEADER: args.api_key} if args.api_key else {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=120) as client:
+        # Warm up (page cache, connection pool)
+        await download(client, url, args.range)
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                received = await download(client, url, args.range)
+                latencies.append(time.perf_counter() - started)
+                return received
+
+        cpu_before = worker_cpu_seconds(pid)
+        started = time.perf_counter()
+        total = sum(await asyncio.gather(*(one() for _ in range(args.requests))))
+        elapsed = time.perf_counter() - started
+        cpu = worker_cpu_seconds(pid) - cpu_before
+
+    latencies.sort()
+    return {
+        'mode': name,
+        'req/s': args.requests / elapsed,
+        'MB/s': total / elapsed / 1e6,
+        'p50 ms': statistics.median(latencies) * 1000,
+        'p95 ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'worker cpu s': cpu,
+        'cpu ms/GB': cpu * 1000 / (total / 1e9) if total else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark media serving modes")
+    parser.add_argument("--video-id", required=True, help="Downloaded video to fetch")
+    parser.add_argument(
+        "--target", nargs=3, action="append", required=True, metavar=("NAME", "URL", "PID"),
+        help="Mode name, base URL and API worker PID (repeat per mode)"
+    )
+    parser.add_argument("--endpoint", choices=["download", "stream"], default="download")
+    parser.add_argument("--range", default="", help="Range header to send, e.g. bytes=0-1048575")
+    parser.add_argument("--concurrency", type=int, default=32, help="Downloads in flight")
+    parser.add_argument("--requests", type=int, default=500, help="Downloads per mode")
+    parser.add_argument("--api-key", default=None, help="API key, if auth is enabled")
+    args = parser.parse_args()
+
+    results = [await run_target(name, url, int(pid), args) for name, url, pid in args.target]
+
+    columns = list(results[0].keys())
+    print(" ".join(f"{c:>12}" for c in columns))
+    for row in results:
+        print(" ".join(f"{v:>12.1f}" if isinstance(v, float) else f"{v:>12}" for v in row.values()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
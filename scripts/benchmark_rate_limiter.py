@@ -0,0 +1,160 @@
+"""
+Benchmark rate limiting overhead: old sliding window vs GCRA stores
+
+1. Limiter cost per check, with `--window` requests already in the last
+   minute (the sliding window rescans them for every request)
+2. End-to-end latency through the ASGI stack, without rate limiting, with the
+   previous BaseHTTPMiddleware wrapper and with the pure ASGI
+   RateLimitMiddleware on each store, for a trivial JSON endpoint and a
+   streamed response (time to last byte)
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+from app.middleware import RateLimitMiddleware
+from app.middleware.gcra import GCRALimiter, MemoryStore, SQLiteStore, create_store
+
+UNLIMITED = 10 ** 9
+
+
+def sliding_window_check(times: deque, now: float, requests_per_minute: int, burst: int) -> bool:
+    """The pre-GCRA algorithm: prune, count the whole deque for bursts, append"""
+    cutoff = now - 60
+    while times and times[0] < cutoff:
+        times.popleft()
+    if len(times) >= requests_per_minute:
+        return False
+    burst_cutoff = now - 10
+    if sum(1 for t in times if t > burst_cutoff) >= burst:
+        return False
+    times.append(now)
+    return True
+
+
+async def bench_limiters(args) -> list:
+    """Microseconds per check for each algorithm/store"""
+    results = []
+
+    times = deque()
+    now = time.time()
+    times.extend(now - 5 + i * 5 / args.window for i in range(args.window))  # all inside the burst window
+    started = time.perf_counter()
+    for _ in range(args.checks):
+        sliding_window_check(times, time.time(), UNLIMITED, UNLIMITED)
+        times.popleft()  # keep the window size constant
+    results.append(('sliding window', (time.perf_counter() - started) / args.checks * 1e6))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = [('gcra memory', MemoryStore()), ('gcra sqlite', SQLiteStore(str(Path(tmp) / 'rl.db')))]
+        for name, store in stores:
+            limiter = GCRALimiter(UNLIMITED, UNLIMITED, store)
+            started = time.perf_counter()
+            for i in range(args.checks):
+                await limiter.hit(f"10.0.{i % 256}.{i % 7}")
+            results.append((name, (time.perf_counter() - started) / args.checks * 1e6))
+
+    return results
+
+
+class BaseHTTPRateLimitMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI middleware shape: same limiter, behind call_next"""
+
+    def __init__(self, app, storage_url: str):
+        super().__init__(app)
+        self.limiter = GCRALimiter(UNLIMITED, UNLIMITED, create_store(storage_url))
+
+    async def dispatch(self, request: Request, call_next):
+        result = await self.limiter.hit(request.client.host if request.client else "unknown")
+        response = await call_next(request)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        return response
+
+
+def make_app(storage_url: str = None, middleware=RateLimitMiddleware, stream_chunks: int = 64) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            chunk = b"x" * 65536
+            for _ in range(stream_chunks):
+                yield chunk
+        return StreamingResponse(body(), media_type="video/mp4")
+
+    if storage_url:
+        if middleware is RateLimitMiddleware:
+            app.add_middleware(
+                RateLimitMiddleware, requests_per_minute=UNLIMITED, burst=UNLIMITED, storage_url=storage_url
+            )
+        else:
+            app.add_middleware(middleware, storage_url=storage_url)
+    return app
+
+
+async def bench_middleware(args) -> list:
+    """p50/p95 microseconds per request through the ASGI app, per endpoint"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = [
+            ('no limiter', None, RateLimitMiddleware),
+            ('base memory', 'memory://', BaseHTTPRateLimitMiddleware),
+            ('asgi memory', 'memory://', RateLimitMiddleware),
+            ('asgi sqlite', f"sqlite:///{Path(tmp) / 'rl.db'}", RateLimitMiddleware),
+        ]
+        for name, storage_url, middleware in variants:
+            app = make_app(storage_url, middleware, args.stream_chunks)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for endpoint, count in (("/ping", args.requests), ("/stream", args.stream_requests)):
+                    for _ in range(20):
+                        await client.get(endpoint)  # warm up
+                    latencies = []
+                    for _ in range(count):
+                        started = time.perf_counter()
+                        await client.get(endpoint)
+                        latencies.append((time.perf_counter() - started) * 1e6)
+                    latencies.sort()
+                    results.append((
+                        name, endpoint, statistics.median(latencies), latencies[int(len(latencies) * 0.95)]
+                    ))
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter overhead")
+    parser.add_argument("--checks", type=int, default=20000, help="Limiter checks per algorithm")
+    parser.add_argument("--window", type=int, default=1000, help="Requests already in the sliding window")
+    parser.add_argument("--requests", type=int, default=5000, help="/ping requests per middleware variant")
+    parser.add_argument("--stream-requests", type=int, default=500, help="/stream requests per middleware variant")
+    parser.add_argument("--stream-chunks", type=int, default=64, help="64 KiB chunks per streamed response")
+    args = parser.parse_args()
+
+    print(f"{'limiter':>16} {'us/check':>10}")
+    for name, micros in await bench_limiters(args):
+        print(f"{name:>16} {micros:>10.2f}")
+
+    print()
+    print(f"{'middleware':>16} {'endpoint':>10} {'p50 us':>10} {'p95 us':>10}")
+    for name, endpoint, p50, p95 in await bench_middleware(args):
+        print(f"{name:>16} {endpoint:>10} {p50:>10.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark subtitle embedding: soft (mov_text mux) vs burn-in presets
+
+Reports wall time per minute of video for each mode.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.utils.subtitle_generator import embed_subtitle, write_srt
+
+
+def make_test_video(path: Path, duration: int):
+    """Generate a 720x1280 test clip with audio (TikTok-like)"""
+    subprocess.run([
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'testsrc2=size=720x1280:rate=30:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-c:a', 'aac', '-shortest',
+        '-y', str(path)
+    ], check=True)
+
+
+def probe_duration(path: Path) -> float:
+    """Video duration in seconds"""
+    result = subprocess.run([
+        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1', str(path)
+    ], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subtitle embedding modes")
+    parser.add_argument("--video", help="Video to use (default: generated test clip)")
+    parser.add_argument("--duration", type=int, default=60, help="Generated clip length in seconds")
+    parser.add_argument("--presets", default="ultrafast,veryfast,medium", help="Burn-in presets to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+
+        video_path = Path(args.video) if args.video else tmp_dir / "input.mp4"
+        if not args.video:
+            print(f"Generating {args.duration}s test clip...")
+            make_test_video(video_path, args.duration)
+
+        duration = probe_duration(video_path)
+        subtitle_path = tmp_dir / "input.ar.srt"
+        write_srt([
+            {'start': t, 'end': t + 2, 'text': f"سطر الترجمة {t}"}
+            for t in range(0, int(duration), 3)
+        ], subtitle_path)
+
+        modes = [('soft', None)] + [('burn', preset) for preset in args.presets.split(',')]
+
+        print(f"\nVideo: {video_path.name} ({duration:.1f}s), runs: {args.runs}, "
+              f"burn threads: {settings.SUBTITLE_BURN_THREADS}")
+        print(f"{'mode':<20} {'wall (s)':>10} {'s / min of video':>18} {'size (MB)':>10}")
+
+        for mode, preset in modes:
+            if preset:
+                settings.SUBTITLE_BURN_PRESET = preset
+            output_path = tmp_dir / f"output_{mode}.mp4"
+
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                if not embed_subtitle(video_path, subtitle_path, output_path, mode=mode):
+                    print(f"{mode} failed")
+                    break
+                timings.append(time.perf_counter() - start)
+
+            if not timings:
+                continue
+
+            best = min(timings)
+            label = f"{mode} ({preset})" if preset else mode
+            size_mb = output_path.stat().st_size / 1024 / 1024
+            print(f"{label:<20} {best:>10.2f} {best / duration * 60:>18.2f} {size_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Export the videos/jobs tables to Parquet, Arrow IPC or gzip NDJSON
+
+Streams from the database in chunks, so memory use is independent of table size.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.archive_export import EXPORT_FORMATS, EXPORT_TABLES, pyarrow_available, stream_export
+from app.core.logging import log
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export the video archive")
+    parser.add_argument("--table", choices=list(EXPORT_TABLES), default="videos")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--output", help="Output file (default: <table><extension>)")
+    parser.add_argument("--chunk-size", type=int, help="Rows per chunk")
+    parser.add_argument("--mode", help="Filter videos by job mode")
+    parser.add_argument("--value", help="Filter videos by job username/hashtag")
+    parser.add_argument("--author", dest="author_username", help="Filter videos by author")
+    parser.add_argument("--hashtag", help="Filter videos by hashtag")
+    parser.add_argument("--status", help="Filter videos by status")
+    args = parser.parse_args()
+    
+    if args.format != 'ndjson.gz' and not pyarrow_available():
+        log.error("pyarrow is not installed, use --format ndjson.gz")
+        sys.exit(1)
+    
+    output = Path(args.output or f"{args.table}{EXPORT_FORMATS[args.format][1]}")
+    filters = {}
+    if args.table == 'videos':
+        filters = dict(
+            mode=args.mode,
+            value=args.value,
+            author_username=args.author_username,
+            hashtag=args.hashtag,
+            status=args.status
+        )
+    
+    started = time.perf_counter()
+    written = 0
+    try:
+        with open(output, 'wb') as f:
+            async for chunk in stream_export(args.table, args.format, chunk_size=args.chunk_size, **filters):
+                f.write(chunk)
+                written += len(chunk)
+    except Exception as e:
+        log.error(f"Export failed: {str(e)}")
+        sys.exit(1)
+    
+    log.info(f"Exported {args.table} to {output} ({written / 1024 / 1024:.1f} MB "
+             f"in {time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
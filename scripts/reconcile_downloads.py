@@ -0,0 +1,42 @@
+"""
+Reclaim files in the downloads tree that no video points at
+
+Run with --dry-run first to see what would be deleted.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.database import init_db
+from app.scheduler.orphan_reconciler import orphan_reconciler
+from app.core.logging import log
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Delete orphaned and partial files under LOCAL_STORAGE_PATH")
+    parser.add_argument("--dry-run", action="store_true", help="Report without deleting")
+    parser.add_argument("--grace-minutes", type=int, default=None, help="Skip files modified more recently")
+    parser.add_argument("--batch-size", type=int, default=None, help="Files matched against the DB per query")
+    args = parser.parse_args()
+    
+    if args.grace_minutes is not None:
+        orphan_reconciler.grace_seconds = args.grace_minutes * 60
+    if args.batch_size:
+        orphan_reconciler.batch_size = args.batch_size
+    
+    await init_db()
+    report = await orphan_reconciler.run(dry_run=args.dry_run)
+    if report is None:
+        log.error("Orphan scan failed")
+        sys.exit(1)
+    
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import select, text, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models.models import Job, Video, VideoHashtag
+from app.models.search import search_videos
+from tests.postgres.conftest import POSTGRES_URL, create_test_database, drop_test_database
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+
+def _video(video_id: str, **kwargs) -> Video:
+    defaults = dict(job_id="job1", url=f"https://tiktok.com/{video_id}", author_username="someone")
+    defaults.update(kwargs)
+    return Video(id=video_id, **defaults)
+
+
+@pytest.mark.asyncio
+async def test_migrations_create_jsonb_and_gin_indexes():
+    """JSON columns are JSONB with GIN indexes after migrating"""
+    engine, name = await create_test_database()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text(
+                "SELECT table_name || '.' || column_name, data_type FROM information_schema.columns "
+                "WHERE (table_name, column_name) IN (('videos', 'hashtags'), ('video_metadata', 'data'))"
+            ))
+            assert dict(result.all()) == {'videos.hashtags': 'jsonb', 'video_metadata.data': 'jsonb'}
+            
+            result = await conn.execute(text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = 'videos' AND column_name = 'raw_metadata'"
+            ))
+            assert result.first() is None
+            
+            result = await conn.execute(text(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename IN ('videos', 'video_metadata') AND indexdef LIKE '%gin%'"
+            ))
+            indexes = dict(result.all())
+            assert {'ix_videos_hashtags_gin', 'ix_video_metadata_data_gin', 'ix_videos_search_vector'} <= set(indexes)
+            assert 'jsonb_path_ops' in indexes['ix_video_metadata_data_gin']
+            assert 'ix_videos_raw_metadata_gin' not in indexes
+    finally:
+        await drop_test_database(engine, name)
+
+
+@pytest.mark.asyncio
+async def test_hashtag_and_fulltext_queries():
+    """Hashtag lookups, JSONB containment and tsvector search work end to end"""
+    engine, name = await create_test_database()
+    try:
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with Session() as db:
+            db.add(Job(id="job1", mode="profile", value="someone"))
+            first = _video("1", desc="Funny cat compilation", hashtags=["cats"], views=3_000_000_000)
+            first.hashtag_rows = [VideoHashtag(tag="cats")]
+            db.add_all([first, _video("2", desc="Cooking pasta", music_title="Cat song", hashtags=["food"])])
+            await db.commit()
+            
+            result = await db.execute(
+                select(Video.id).join(VideoHashtag).where(VideoHashtag.tag == "cats")
+            )
+            assert result.scalars().all() == ["1"]
+            
+            result = await db.execute(select(Video.id).where(Video.hashtags.op("@>")(literal(["food"], JSONB))))
+            assert result.scalars().all() == ["2"]
+            
+            hits = await search_videos(db, "cat")
+            assert [video_id for video_id, _, _ in hits] == ["1", "2"]  # desc outranks music title
+            assert "<mark>" in hits[0][2]
+    finally:
+        await drop_test_database(engine, name)
@@ -1,6 +1,32 @@
+import json
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
+from app.models import database
+
+
+@pytest.fixture
+def api_db(tmp_path, monkeypatch):
+    """Point the app's sessions at a freshly migrated temporary SQLite database"""
+    from app.models import models  # noqa: F401
+    
+    path = tmp_path / "api.db"
+    migrate_engine = create_engine(f"sqlite:///{path}")
+    with migrate_engine.begin() as conn:
+        database.run_migrations(conn)
+    migrate_engine.dispose()
+    
+    # NullPool: no aiosqlite connection outlives the test's event loop
+    Session = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool),
+        expire_on_commit=False
+    )
+    monkeypatch.setattr(database, "AsyncSessionLocal", Session)
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", Session)
+    return Session
 
 
 @pytest.mark.asyncio
@@ -25,7 +51,7 @@ async def test_health_endpoint():
 
 
 @pytest.mark.asyncio
-async def test_stats_endpoint():
+async def test_stats_endpoint(api_db):
     """Test stats endpoint"""
     async with AsyncClient(app=app, base_url="http://test") as client:
         response = await client.get("/api/v1/stats")
@@ -56,7 +82,7 @@ async def test_create_job_validation():
 
 
 @pytest.mark.asyncio
-async def test_list_jobs():
+async def test_list_jobs(api_db):
     """Test listing jobs"""
     async with AsyncClient(app=app, base_url="http://test") as client:
         response = await client.get("/api/v1/jobs")
@@ -66,7 +92,7 @@ async def test_list_jobs():
 
 
 @pytest.mark.asyncio
-async def test_list_videos():
+async def test_list_videos(api_db):
     """Test listing videos"""
     async with AsyncClient(app=app, base_url="http://test") as client:
         response = await client.get("/api/v1/videos")
@@ -75,3 +101,119 @@ async def test_list_videos():
         assert "total" in data
         assert "videos" in data
         assert isinstance(data["videos"], list)
+
+
+def test_video_cursor_roundtrip():
+    """Keyset cursor encodes (scraped_at, id) of the last video"""
+    from datetime import datetime
+    from app.api.routes.videos import encode_cursor, decode_cursor
+    from app.models.models import Video
+    
+    video = Video(id="7123456789", scraped_at=datetime(2024, 5, 1, 12, 30, 15, 123456))
+    assert decode_cursor(encode_cursor(video)) == (video.scraped_at, video.id)
+
+
+def test_fts5_query_quotes_terms():
+    """User input is quoted so FTS5 operators are matched literally"""
+    from app.models.search import fts5_query
+    
+    assert fts5_query("funny ca") == '"funny" "ca"*'
+    assert fts5_query('say "hi" OR') == '"say" """hi""" "OR"*'
+    assert fts5_query("   ") == ""
+
+
+@pytest.mark.asyncio
+async def test_list_videos_cursor_pages_through_undated_videos(api_db):
+    """Videos without scraped_at come last and the cursor pages across them"""
+    from datetime import datetime
+    from sqlalchemy import update
+    from app.models.models import Job, Video
+    
+    async with api_db() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        db.add_all([
+            Video(id=video_id, job_id="job1", url=f"https://tiktok.com/{video_id}", author_username="someone",
+                  scraped_at=datetime(2024, 5, day))
+            for video_id, day in (("1", 1), ("2", 2), ("3", 3), ("4", 4))
+        ])
+        await db.commit()
+        await db.execute(update(Video).where(Video.id.in_(["1", "3"])).values(scraped_at=None))
+        await db.commit()
+    
+    seen = []
+    params = {"limit": 1}
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        while True:
+            response = await client.get("/api/v1/videos", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen += [video["id"] for video in data["videos"]]
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+    
+    assert seen == ["4", "2", "3", "1"]
+
+
+@pytest.mark.asyncio
+async def test_list_videos_ndjson(api_db):
+    """format=ndjson streams one JSON document per line"""
+    from app.models.models import Job, Video
+    
+    async with api_db() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        db.add_all([
+            Video(id=video_id, job_id="job1", url=f"https://tiktok.com/{video_id}", author_username="someone")
+            for video_id in ("1", "2")
+        ])
+        await db.commit()
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/videos", params={"format": "ndjson", "limit": 5})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        assert sorted(json.loads(line)["id"] for line in lines) == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_tracks_writes_and_ranks(api_db):
+    """FTS5 index follows inserts/updates/deletes; bm25 ranks description hits first"""
+    from sqlalchemy import delete, update
+    from app.models.models import Job, Video
+    
+    def video(video_id, **kwargs):
+        return Video(id=video_id, job_id="job1", url=f"https://tiktok.com/{video_id}",
+                     author_username="someone", **kwargs)
+    
+    async def search(q):
+        response = await client.get("/api/v1/videos/search", params={"q": q})
+        assert response.status_code == 200
+        return response.json()["results"]
+    
+    async with api_db() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        db.add_all([
+            video("1", desc="Cooking pasta", music_title="Cat song"),
+            video("2", desc="Funny cat compilation"),
+            video("3", desc="Dog walk"),
+        ])
+        await db.commit()
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        results = await search("cat")
+        assert [hit["video"]["id"] for hit in results] == ["2", "1"]  # desc outranks music title
+        assert results[0]["rank"] > results[1]["rank"]
+        assert "<mark>cat</mark>" in results[0]["snippet"]
+        assert "<mark>Cat</mark>" in results[1]["snippet"]
+        
+        async with api_db() as db:
+            await db.execute(update(Video).where(Video.id == "3").values(desc="Sleepy cat nap"))
+            await db.execute(update(Video).where(Video.id == "2").values(desc="Dog tricks"))
+            await db.execute(delete(Video).where(Video.id == "1"))
+            await db.commit()
+        
+        assert [hit["video"]["id"] for hit in await search("cat")] == ["3"]
+        assert [hit["video"]["id"] for hit in await search("dog")] == ["2"]
+        assert await search("funny") == []
+        assert await search("pasta") == []
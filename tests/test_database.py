@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import text
+from app.models.database import make_engine
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_applied_on_connect(tmp_path):
+    """Writer connections use WAL; reader connections are query-only"""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    write_engine = make_engine(url)
+    read_engine = make_engine(url, read_only=True)
+    
+    async with write_engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar().lower() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() > 0
+    
+    async with read_engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA query_only"))).scalar() == 1
+    
+    await write_engine.dispose()
+    await read_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_raw_metadata_loaded_only_on_request():
+    """select(Video) skips the metadata side table unless it is eager-loaded"""
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.orm import selectinload
+    from app.models.database import Base
+    from app.models.models import Job, Video
+    from app.models.schemas import VideoResponse
+    
+    engine = make_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    
+    async with Session() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        video = Video(id="1", job_id="job1", url="u", author_username="someone", hashtags=[])
+        video.raw_metadata = {"stats": {"playCount": 10}}
+        db.add(video)
+        await db.commit()
+    
+    async with Session() as db:
+        video = (await db.execute(select(Video))).scalar_one()
+        assert video.loaded_raw_metadata is None
+        assert VideoResponse.model_validate(video).raw_metadata is None
+    
+    async with Session() as db:
+        query = select(Video).options(selectinload(Video.raw_metadata_row))
+        video = (await db.execute(query)).scalar_one()
+        assert VideoResponse.model_validate(video).raw_metadata == {"stats": {"playCount": 10}}
+    
+    await engine.dispose()
+
+
+# videos/jobs as create_all made them before migrations and download_progress
+LEGACY_SCHEMA = [
+    """CREATE TABLE jobs (
+        id VARCHAR NOT NULL PRIMARY KEY, mode VARCHAR NOT NULL, value VARCHAR NOT NULL,
+        "limit" INTEGER, no_watermark BOOLEAN, since DATETIME, until DATETIME,
+        drive_folder_id VARCHAR, status VARCHAR, progress INTEGER, total_videos INTEGER,
+        successful_downloads INTEGER, failed_downloads INTEGER, error_message TEXT,
+        created_at DATETIME, started_at DATETIME, completed_at DATETIME
+    )""",
+    """CREATE TABLE videos (
+        id VARCHAR NOT NULL PRIMARY KEY, job_id VARCHAR NOT NULL REFERENCES jobs (id),
+        url VARCHAR NOT NULL, "desc" TEXT, author_username VARCHAR NOT NULL,
+        author_nickname VARCHAR, views INTEGER, likes INTEGER, comments INTEGER, shares INTEGER,
+        created_at_tiktok DATETIME, scraped_at DATETIME, hashtags JSON, music_title VARCHAR,
+        music_author VARCHAR, video_url VARCHAR, has_watermark BOOLEAN, local_path VARCHAR,
+        file_size INTEGER, duration FLOAT, drive_file_id VARCHAR, drive_folder_path VARCHAR,
+        drive_metadata_file_id VARCHAR, status VARCHAR, download_attempts INTEGER,
+        error_message TEXT, raw_metadata JSON
+    )""",
+    "INSERT INTO jobs (id, mode, value, status) VALUES ('job1', 'profile', 'someone', 'completed')",
+    """INSERT INTO videos (id, job_id, url, author_username, hashtags, status, raw_metadata)
+       VALUES ('1', 'job1', 'u', 'someone', '["Funny", "#cats"]', 'completed', '{"id": "1"}')""",
+]
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_is_upgraded(tmp_path):
+    """A create_all database from before migrations gets every model column and hashtag rows"""
+    from sqlalchemy import select
+    from app.models.database import run_migrations
+    from app.models.models import Video, VideoHashtag
+    
+    engine = make_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
+    
+    async with engine.connect() as conn:
+        video = (await conn.execute(select(Video))).one()
+        assert video.id == "1" and video.download_progress is None and not video.pinned
+        # Hashtag lookup rows are backfilled from the JSON column
+        tags = (await conn.execute(select(VideoHashtag.tag).order_by(VideoHashtag.tag))).scalars().all()
+        assert tags == ["cats", "funny"]
+    
+    await engine.dispose()
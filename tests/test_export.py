@@ -0,0 +1,47 @@
+import gzip
+import io
+import json
+from datetime import datetime
+import pytest
+from app.models.models import Video
+from app.utils.archive_export import _ArrowEncoder, _NdjsonGzipEncoder
+
+
+def _rows(start: int, count: int):
+    return [
+        {column.name: None for column in Video.__table__.columns} | {
+            'id': str(i), 'url': f'https://tiktok.com/{i}', 'views': 3_000_000_000 + i,
+            'hashtags': ['fyp', 'cats'], 'scraped_at': datetime(2024, 1, 1, 12, 0, i % 60),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def test_ndjson_gzip_chunks_concatenate():
+    """Chunks from separate writes form one valid gzip NDJSON stream"""
+    encoder = _NdjsonGzipEncoder(Video.__table__)
+    data = encoder.write(_rows(0, 3)) + encoder.write(_rows(3, 2)) + encoder.close()
+    
+    lines = gzip.decompress(data).decode('utf-8').splitlines()
+    assert len(lines) == 5
+    first = json.loads(lines[0])
+    assert first['hashtags'] == ['fyp', 'cats']
+    assert first['scraped_at'] == '2024-01-01T12:00:00'
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_formats_roundtrip(fmt):
+    """Parquet/Arrow output is written chunk by chunk and reads back intact"""
+    pa = pytest.importorskip("pyarrow")
+    encoder = _ArrowEncoder(Video.__table__, fmt)
+    data = b''.join([encoder.write(_rows(0, 100)), encoder.write(_rows(100, 50)), encoder.close()])
+    
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(io.BytesIO(data))
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    
+    assert table.num_rows == 150
+    assert table.column('views')[0].as_py() == 3_000_000_000
+    assert json.loads(table.column('hashtags')[0].as_py()) == ['fyp', 'cats']
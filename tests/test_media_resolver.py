@@ -0,0 +1,78 @@
+import os
+import pytest
+from starlette.requests import Request
+from app.core.config import settings
+from app.models.models import Video
+from app.storage.media_resolver import MediaCache, MediaResolver, drive_download_url
+
+
+def make_request():
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+def test_media_cache_evicts_least_recently_used(tmp_path):
+    """Hits keep a file warm; the coldest files go first once over budget"""
+    cache = MediaCache(tmp_path, max_bytes=2500)
+    for index, video_id in enumerate(["a", "b", "c"]):
+        path = cache.path_for(video_id)
+        path.write_bytes(b"x" * 1000)
+        os.utime(path, (1000 + index, 1000 + index))
+
+    mtime = cache.path_for("a").stat().st_mtime
+    assert cache.get("a") is not None
+    assert cache.path_for("a").stat().st_mtime == mtime  # ETag stays stable
+
+    assert cache.evict() == 1000
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_resolver_falls_back_to_drive(tmp_path, monkeypatch):
+    """Local file wins; once it is gone the client is redirected to Drive"""
+    monkeypatch.setattr(settings, "MEDIA_DRIVE_FALLBACK", "redirect")
+    monkeypatch.setattr(settings, "MEDIA_CACHE_MAX_BYTES", 0)
+    resolver = MediaResolver()
+
+    video_path = tmp_path / "7123.mp4"
+    video_path.write_bytes(b"video")
+    video = Video(id="7123", url="u", local_path=str(video_path), drive_file_id="drive-1")
+
+    local = await resolver.response(make_request(), video)
+    assert local.status_code == 200
+
+    video.local_path = None
+    redirect = await resolver.response(make_request(), video)
+    assert redirect.status_code == 307
+    assert redirect.headers["location"] == drive_download_url("drive-1")
+
+    video.drive_file_id = None
+    assert await resolver.response(make_request(), video) is None
+
+    monkeypatch.setattr(settings, "MEDIA_DRIVE_FALLBACK", "none")
+    video.drive_file_id = "drive-1"
+    assert await resolver.response(make_request(), video) is None
+
+
+@pytest.mark.asyncio
+async def test_resolver_hydrates_cache_on_get_only(tmp_path, monkeypatch):
+    """HEAD requests are proxied without starting a Drive download into the cache"""
+    monkeypatch.setattr(settings, "MEDIA_DRIVE_FALLBACK", "proxy")
+    monkeypatch.setattr(settings, "MEDIA_CACHE_MAX_BYTES", 1000)
+    monkeypatch.setattr(settings, "MEDIA_CACHE_DIR", str(tmp_path))
+    resolver = MediaResolver()
+    hydrated = []
+    monkeypatch.setattr(resolver, "_hydrate_later", lambda video: hydrated.append(video.id))
+
+    async def proxy(request, video, headers=None):
+        return request.method
+
+    monkeypatch.setattr(resolver, "_proxy", proxy)
+    video = Video(id="7123", url="u", drive_file_id="drive-1")
+    head = Request({"type": "http", "method": "HEAD", "path": "/", "headers": [], "query_string": b""})
+
+    assert await resolver.response(head, video) == "HEAD"
+    assert hydrated == []
+    assert await resolver.response(make_request(), video) == "GET"
+    assert hydrated == ["7123"]
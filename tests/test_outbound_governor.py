@@ -0,0 +1,73 @@
+import pytest
+from app.core.outbound_governor import OutboundGovernor, site_of, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_governor(clock):
+    governor = OutboundGovernor(clock=clock)
+    governor.rate, governor.min_rate, governor.max_rate = 1.0, 0.1, 2.0
+    governor.burst, governor.increase, governor.decrease = 1, 0.5, 0.5
+    governor.backoff_seconds = 30.0
+    governor.site_rates = {"tiktokcdn.com": 10.0}
+    return governor
+
+
+def test_sites_and_retry_after():
+    assert site_of("https://www.tiktok.com/@someone") == "tiktok.com"
+    assert site_of("m.tiktok.com") == "tiktok.com"
+    assert site_of("http://127.0.0.1:8000/x") == "127.0.0.1"
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2026 07:28:00 GMT") is None
+
+
+def test_aimd_rate_and_pause():
+    """Successes add to the rate, a 429 halves it once and pauses the site"""
+    clock = FakeClock()
+    governor = make_governor(clock)
+    bucket = governor.bucket("https://www.tiktok.com/")
+    
+    assert bucket.delay(clock.now) == 0.0
+    assert bucket.delay(clock.now) == pytest.approx(1.0)  # one token per second
+    
+    for _ in range(5):
+        governor.record("https://www.tiktok.com/a", 200)
+    assert bucket.rate == 2.0  # capped at max_rate
+    
+    governor.record("https://m.tiktok.com/b", 429, retry_after=10)
+    governor.record("https://www.tiktok.com/c", 429)  # in flight during the same overload
+    assert bucket.rate == 1.0
+    assert bucket.delay(clock.now) == pytest.approx(30.0)
+    
+    clock.now += 30.0
+    assert bucket.delay(clock.now) == pytest.approx(1.0)  # no tokens saved up while paused
+    
+    cdn = governor.bucket("https://v16-webapp.tiktokcdn.com/video.mp4")
+    assert cdn is not bucket and cdn.rate == cdn.max_rate == 10.0
+
+
+@pytest.mark.asyncio
+async def test_httpx_hooks_pace_requests():
+    """Requests through an httpx client wait for the site's budget"""
+    import time
+    import httpx
+    
+    governor = make_governor(time.monotonic)
+    governor.rate = 50.0  # 20ms between requests
+    governor.jitter = 0.0
+    governor.increase = 0.0
+    
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    async with httpx.AsyncClient(transport=transport, event_hooks=governor.httpx_hooks()) as client:
+        started = time.monotonic()
+        for _ in range(4):
+            await client.get("https://www.tiktok.com/")
+        elapsed = time.monotonic() - started
+    
+    assert elapsed >= 0.06  # first request is free, three more at 20ms each
@@ -0,0 +1,148 @@
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from app.utils.range_response import (
+    FileRangeResponse, RangeNotSatisfiable, offload_headers, parse_range, range_file_response
+)
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def client(tmp_path):
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(CONTENT)
+    
+    app = FastAPI()
+    
+    @app.api_route("/stream", methods=["GET", "HEAD"])
+    async def stream(request: Request):
+        return range_file_response(request, video_path, media_type="video/mp4", etag_key="7123")
+    
+    return AsyncClient(app=app, base_url="http://test")
+
+
+def test_parse_range():
+    """Ranges are clamped, merged and sorted; malformed headers are ignored"""
+    assert parse_range("bytes=0-99", 1000) == [(0, 99)]
+    assert parse_range("bytes=900-", 1000) == [(900, 999)]
+    assert parse_range("bytes=-100", 1000) == [(900, 999)]
+    assert parse_range("bytes=950-2000", 1000) == [(950, 999)]
+    assert parse_range("bytes=500-599, 0-99, 50-149", 1000) == [(0, 149), (500, 599)]
+    assert parse_range("bytes=5-1", 1000) is None
+    assert parse_range("pages=0-1", 1000) is None
+    assert parse_range(None, 1000) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=1000-", 1000)
+
+
+@pytest.mark.asyncio
+async def test_full_response_has_validators(client):
+    async with client:
+        response = await client.get("/stream")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"7123-')
+    assert "last-modified" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_seek_returns_partial_content(client):
+    """Scrubbing to the middle and the end returns exactly the requested bytes"""
+    async with client:
+        middle = await client.get("/stream", headers={"Range": "bytes=5000-5999"})
+        tail = await client.get("/stream", headers={"Range": "bytes=-24"})
+        open_ended = await client.get("/stream", headers={"Range": "bytes=10000-"})
+    
+    assert middle.status_code == 206
+    assert middle.content == CONTENT[5000:6000]
+    assert middle.headers["content-range"] == "bytes 5000-5999/10240"
+    assert middle.headers["content-length"] == "1000"
+    assert tail.content == CONTENT[-24:]
+    assert open_ended.content == CONTENT[10000:]
+
+
+@pytest.mark.asyncio
+async def test_multiple_ranges_multipart(client):
+    async with client:
+        response = await client.get("/stream", headers={"Range": "bytes=0-9,100-109"})
+    assert response.status_code == 206
+    assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert b"Content-Range: bytes 0-9/10240" in response.content
+    assert CONTENT[100:110] in response.content
+
+
+@pytest.mark.asyncio
+async def test_unsatisfiable_range(client):
+    async with client:
+        response = await client.get("/stream", headers={"Range": "bytes=20000-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10240"
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests(client):
+    """Matching validators return 304; a stale If-Range serves the full file"""
+    async with client:
+        first = await client.get("/stream")
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+        
+        by_etag = await client.get("/stream", headers={"If-None-Match": etag})
+        by_date = await client.get("/stream", headers={"If-Modified-Since": last_modified})
+        changed = await client.get("/stream", headers={"If-None-Match": '"other"'})
+        stale_range = await client.get("/stream", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+        fresh_range = await client.get("/stream", headers={"Range": "bytes=0-9", "If-Range": etag})
+        head = await client.head("/stream", headers={"Range": "bytes=0-9"})
+    
+    assert by_etag.status_code == 304 and by_etag.content == b""
+    assert by_date.status_code == 304
+    assert changed.status_code == 200
+    assert stale_range.status_code == 200 and stale_range.content == CONTENT
+    assert fresh_range.status_code == 206 and fresh_range.content == CONTENT[:10]
+    assert head.status_code == 206 and head.content == b""
+
+
+def test_offload_headers(tmp_path):
+    """nginx gets a URL under the internal prefix; files outside the root are served by the app"""
+    video_path = tmp_path / "job 1" / "video.mp4"
+    
+    accel = offload_headers(video_path, "x-accel-redirect", "/protected-media/", tmp_path)
+    assert accel == {"X-Accel-Redirect": "/protected-media/job%201/video.mp4"}
+    assert offload_headers(video_path, "x-sendfile", "", tmp_path) == {"X-Sendfile": str(video_path.resolve())}
+    assert offload_headers(video_path, "x-accel-redirect", "/p/", tmp_path / "other") is None
+    assert offload_headers(video_path, "none", "/p/", tmp_path) is None
+
+
+@pytest.mark.asyncio
+async def test_zero_copy_extensions(tmp_path):
+    """Servers advertising pathsend/zerocopysend get the file handed over, not read in Python"""
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(CONTENT)
+    size = len(CONTENT)
+    
+    async def run(response, extensions):
+        messages = []
+        
+        async def send(message):
+            if message["type"] == "http.response.zerocopysend":
+                message = {**message, "file": message["file"].name}
+            messages.append(message)
+        
+        await response({"type": "http", "extensions": extensions}, None, send)
+        return messages
+    
+    whole = FileRangeResponse(video_path, 0, size - 1, size, 200, {}, "video/mp4")
+    pathsend = await run(whole, {"http.response.pathsend": {}})
+    assert pathsend[1] == {"type": "http.response.pathsend", "path": str(video_path)}
+    
+    part = FileRangeResponse(video_path, 100, 199, size, 206, {}, "video/mp4")
+    zerocopy = await run(part, {"http.response.zerocopysend": {}})
+    assert zerocopy[1] == {
+        "type": "http.response.zerocopysend", "file": str(video_path), "offset": 100, "count": 100
+    }
+    
+    fallback = await run(part, {})
+    assert b"".join(m.get("body", b"") for m in fallback[1:]) == CONTENT[100:200]
+    assert fallback[-1]["more_body"] is False
@@ -0,0 +1,125 @@
+import pytest
+from app.middleware.gcra import GCRALimiter, MemoryStore, SQLiteStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_gcra_burst_then_sustained_rate():
+    """A full burst is allowed at once, then one request per interval"""
+    clock = FakeClock()
+    limiter = GCRALimiter(rate_per_minute=60, burst=5, store=MemoryStore(), clock=clock)
+    
+    results = [await limiter.hit("1.2.3.4") for _ in range(5)]
+    assert all(r.allowed for r in results)
+    assert [r.remaining for r in results] == [4, 3, 2, 1, 0]
+    
+    denied = await limiter.hit("1.2.3.4")
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(1.0, abs=1e-3)
+    assert (await limiter.hit("5.6.7.8")).allowed  # other clients are unaffected
+    
+    clock.now += 1.0
+    assert (await limiter.hit("1.2.3.4")).allowed
+    assert not (await limiter.hit("1.2.3.4")).allowed
+    
+    # Weighted requests use up more of the burst
+    clock.now += 10.0
+    heavy = await limiter.hit("1.2.3.4", cost=3)
+    assert heavy.allowed and heavy.remaining == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_is_shared_between_workers(tmp_path):
+    """Two limiters on the same file (as two uvicorn workers) share one budget"""
+    clock = FakeClock()
+    path = str(tmp_path / "ratelimit.db")
+    worker_a = GCRALimiter(60, 4, SQLiteStore(path), clock=clock)
+    worker_b = GCRALimiter(60, 4, SQLiteStore(path), clock=clock)
+    
+    assert (await worker_a.hit("ip")).allowed
+    assert (await worker_b.hit("ip")).allowed
+    assert (await worker_a.hit("ip")).allowed
+    assert (await worker_b.hit("ip")).remaining == 0
+    
+    denied = await worker_a.hit("ip")
+    assert not denied.allowed and denied.retry_after == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_does_not_block_event_loop(tmp_path, monkeypatch):
+    """Store queries run in a worker thread, off the event loop"""
+    import asyncio
+    import threading
+    
+    store = SQLiteStore(str(tmp_path / "ratelimit.db"))
+    loop_thread = threading.get_ident()
+    threads = []
+    update = store._update
+    
+    def record_thread(*args):
+        threads.append(threading.get_ident())
+        return update(*args)
+    
+    monkeypatch.setattr(store, "_update", record_thread)
+    limiter = GCRALimiter(60, 100, store, clock=FakeClock())
+    results = await asyncio.gather(*(limiter.hit("ip") for _ in range(20)))
+    
+    assert all(result.allowed for result in results)
+    assert sorted(result.remaining for result in results) == list(range(80, 100))
+    assert threads and loop_thread not in threads
+
+
+def test_parse_cost_rules():
+    from app.middleware.rate_limiter import parse_cost_rules
+    
+    rules = parse_cost_rules("GET /api/v1/videos/*/download=5, /health=0,")
+    assert [(method, cost) for method, _, cost in rules] == [("GET", 5), (None, 0)]
+    assert rules[0][1].match("/api/v1/videos/123/download")
+    assert not rules[0][1].match("/api/v1/videos/123/stream")
+
+
+@pytest.mark.asyncio
+async def test_middleware_exemptions_and_route_costs():
+    """Exempt paths are free, weighted routes use more of the burst, streams pass through"""
+    import httpx
+    from fastapi import FastAPI
+    from starlette.responses import StreamingResponse
+    from app.middleware import RateLimitMiddleware
+    
+    app = FastAPI()
+    
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+    
+    @app.get("/api/v1/videos/{video_id}/download")
+    async def download(video_id: str):
+        async def body():
+            for _ in range(3):
+                yield b"x" * 1000
+        return StreamingResponse(body(), media_type="video/mp4")
+    
+    app.add_middleware(
+        RateLimitMiddleware, requests_per_minute=60, burst=6,
+        exempt_paths="/health", route_costs="GET /api/v1/videos/*/download=5"
+    )
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(10):
+            response = await client.get("/health")
+            assert response.status_code == 200 and "x-ratelimit-limit" not in response.headers
+        
+        first = await client.get("/api/v1/videos/1/download")
+        assert first.status_code == 200 and len(first.content) == 3000
+        assert first.headers["x-ratelimit-remaining"] == "1"
+        
+        second = await client.head("/api/v1/videos/1/download")  # HEAD costs the same as GET
+        assert second.status_code == 429 and "retry-after" in second.headers
@@ -0,0 +1,148 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.models.database import Base
+from app.models.models import Job, Video
+from app.scheduler import access_tracker as access_tracker_module
+from app.scheduler import cleanup_task as cleanup_task_module
+from app.scheduler.cleanup_task import CleanupTask
+
+
+async def make_retention(tmp_path, monkeypatch):
+    """CleanupTask over an in-memory database with five 1000-byte videos"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(cleanup_task_module, "AsyncSessionLocal", Session)
+    monkeypatch.setattr(access_tracker_module, "AsyncSessionLocal", Session)
+
+    now = datetime.utcnow()
+    videos = {
+        "old": dict(scraped_at=now - timedelta(days=3)),
+        "old_pinned": dict(scraped_at=now - timedelta(days=3), pinned=True),
+        "old_but_watched": dict(scraped_at=now - timedelta(days=3), last_accessed_at=now - timedelta(hours=1)),
+        "recent": dict(scraped_at=now - timedelta(hours=2)),
+        "newest": dict(scraped_at=now - timedelta(minutes=5)),
+    }
+    async with Session() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        for video_id, fields in videos.items():
+            path = tmp_path / f"{video_id}.mp4"
+            path.write_bytes(b"x" * 1000)
+            db.add(Video(id=video_id, job_id="job1", url="u", author_username="someone",
+                         local_path=str(path), **fields))
+        await db.commit()
+
+    task = CleanupTask()
+    task.max_age_hours = 24
+    task.batch_size = 2  # exercise keyset paging
+    return task, Session, engine
+
+
+async def local_paths(Session):
+    async with Session() as db:
+        videos = (await db.execute(Video.__table__.select())).all()
+    return {video.id: video.local_path for video in videos}
+
+
+@pytest.mark.asyncio
+async def test_age_policy_respects_access_and_pins(tmp_path, monkeypatch):
+    task, Session, engine = await make_retention(tmp_path, monkeypatch)
+    monkeypatch.setattr(task, "disk_usage", lambda: (0.5, 500, 1000))
+
+    dry = await task.run_cleanup(dry_run=True)
+    assert dry["expired"] == {"files": 1, "bytes": 1000}
+    assert (tmp_path / "old.mp4").exists()
+
+    report = await task.run_cleanup()
+    paths = await local_paths(Session)
+    assert report["expired"]["files"] == 1 and not report["disk_pressure"]
+    assert paths["old"] is None and not (tmp_path / "old.mp4").exists()
+    assert all(paths[v] for v in ("old_pinned", "old_but_watched", "recent", "newest"))
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_disk_pressure_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Above the high watermark, files go in LRU order until under the low watermark"""
+    task, Session, engine = await make_retention(tmp_path, monkeypatch)
+    task.high_watermark, task.low_watermark = 0.9, 0.8
+    # 9500 of 10000 bytes used: 1500 bytes to free -> the expired file plus one LRU eviction
+    monkeypatch.setattr(task, "disk_usage", lambda: (0.95, 9500, 10000))
+
+    access_tracker_module.access_tracker.touch("recent")
+    report = await task.run_cleanup()
+    paths = await local_paths(Session)
+
+    assert report["disk_pressure"] and report["bytes_to_free"] == 1500
+    assert report["expired"]["files"] == 1 and report["evicted"]["files"] == 1
+    assert paths["old"] is None and paths["old_but_watched"] is None
+    assert paths["recent"] and paths["newest"] and paths["old_pinned"]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_access_flush_skips_deleted_videos(tmp_path, monkeypatch):
+    """A video deleted after it was accessed doesn't block the rest of the batch"""
+    from app.scheduler.access_tracker import AccessTracker
+    
+    _, Session, engine = await make_retention(tmp_path, monkeypatch)
+    tracker = AccessTracker(flush_interval=3600)
+    tracker.touch("recent")
+    tracker.touch("deleted")
+    
+    assert await tracker.flush() == 2
+    assert tracker.pending == {}
+    async with Session() as db:
+        video = await db.get(Video, "recent")
+        assert video.last_accessed_at is not None
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_orphan_reconciler_reclaims_unreferenced_files(tmp_path, monkeypatch):
+    """Referenced, recent and unknown files stay; orphans and partials go"""
+    import os
+    from app.scheduler import orphan_reconciler as orphan_module
+    from app.scheduler.orphan_reconciler import OrphanReconciler
+
+    task, Session, engine = await make_retention(tmp_path, monkeypatch)
+    monkeypatch.setattr(orphan_module, "AsyncReadSessionLocal", Session)
+
+    nested = tmp_path / "hashtag" / "funny"
+    nested.mkdir(parents=True)
+    orphans = [
+        tmp_path / "old_ar.mp4",
+        tmp_path / "old_subtitled.mp4",
+        nested / "7001.mp4",
+        nested / "7001_metadata.json",
+        nested / "7002.wav",
+        nested / "7003.mp4.part",
+    ]
+    for path in orphans:
+        path.write_bytes(b"x" * 10)
+    recent = nested / "7004.mp4"
+    recent.write_bytes(b"x" * 10)
+    notes = tmp_path / "ytdlp_archive.txt"
+    notes.write_text("tiktok 7001\n")
+
+    old = 1_000_000_000
+    for path in orphans + [notes]:
+        os.utime(path, (old, old))
+
+    reconciler = OrphanReconciler()
+    reconciler.root = str(tmp_path)
+    reconciler.batch_size = 3
+
+    dry = await reconciler.run(dry_run=True)
+    assert dry["reclaimed_bytes"] == 60 and all(path.exists() for path in orphans)
+
+    report = await reconciler.run()
+    assert report["scanned"] == 13  # 5 videos + 6 orphans + recent + archive
+    assert report["referenced"] == 5
+    assert report["too_recent"] == 1 and report["skipped"] == 1
+    assert report["reclaimed"]["partial"] == {"files": 1, "bytes": 10}
+    assert not any(path.exists() for path in orphans)
+    assert recent.exists() and notes.exists() and (tmp_path / "old.mp4").exists()
+    await engine.dispose()
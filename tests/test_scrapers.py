@@ -93,3 +93,98 @@ async def test_date_filtering():
         # Test until filter
         assert scraper._filter_video(video, since=None, until=tomorrow) == True
         assert scraper._filter_video(video, since=None, until=yesterday) == False
+
+
+def test_download_archive_ids(tmp_path):
+    """Test yt-dlp download archive parsing"""
+    from app.scrapers.ytdlp_scraper import _load_archive_ids
+    
+    archive = tmp_path / "archive.txt"
+    assert _load_archive_ids(archive) == set()
+    
+    archive.write_text("tiktok 7123456789\ntiktok 7987654321\n\n", encoding="utf-8")
+    assert _load_archive_ids(archive) == {"7123456789", "7987654321"}
+
+
+@pytest.mark.asyncio
+async def test_scrape_and_download_swallows_ytdlp_errors(monkeypatch):
+    """Test yt-dlp failures are logged and reported as no videos"""
+    from app.scrapers import ytdlp_scraper
+    
+    async def failing_batch(*args, **kwargs):
+        raise RuntimeError("ERROR: [TikTok] Unable to extract")
+    
+    monkeypatch.setattr(ytdlp_scraper.settings, "YTDLP_BATCH_MODE", True)
+    monkeypatch.setattr(ytdlp_scraper, "batch_download", failing_batch)
+    assert await ytdlp_scraper.scrape_and_download("someone") == []
+
+
+@pytest.mark.asyncio
+async def test_batch_download_reports_progress_on_new_videos(tmp_path, monkeypatch):
+    """Rows exist before downloading, so progress lands; failed downloads are marked"""
+    import queue
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.models import database
+    from app.models.database import Base
+    from app.models.models import Job, Video
+    from app.scrapers import ytdlp_scraper
+    from app.workers.ytdlp_pool import ytdlp_pool
+    
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'videos.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", Session)
+    monkeypatch.setattr(ytdlp_scraper.settings, "YTDLP_DOWNLOAD_ARCHIVE", str(tmp_path / "archive.txt"))
+    async with Session() as db:
+        db.add(Job(id="job1", mode="profile", value="someone"))
+        await db.commit()
+    
+    async def fake_queue():
+        return queue.Queue()
+    
+    async def fake_extract(url, opts, download=True, progress_queue=None, **kwargs):
+        if not download:
+            return {'info': {'entries': [{'id': '1'}, {'id': '2'}]}, 'files': []}
+        video_id = url.rsplit('/', 1)[-1]
+        if video_id == '2':
+            raise RuntimeError("HTTP Error 404")
+        async with Session() as db:  # the row is there while downloading
+            assert (await db.get(Video, video_id)).download_progress == 0
+        progress_queue.put({'video_id': video_id, 'status': 'finished',
+                            'downloaded_bytes': 10, 'total_bytes': 10})
+        return {'info': {'id': video_id}, 'files': [str(tmp_path / f"{video_id}.mp4")]}
+    
+    monkeypatch.setattr(ytdlp_pool, "new_progress_queue", fake_queue)
+    monkeypatch.setattr(ytdlp_pool, "extract", fake_extract)
+    
+    results = await ytdlp_scraper.batch_download("someone", 2, tmp_path, job_id="job1")
+    assert [r['success'] for r in results] == [True, False]
+    
+    async with Session() as db:
+        videos = {v.id: v for v in (await db.execute(select(Video))).scalars()}
+    assert videos['1'].download_progress == 100 and videos['1'].status == "pending"
+    assert videos['2'].status == "failed"
+    await engine.dispose()
+
+
+def test_video_archive_matches_ytdlp_ids():
+    """Test VideoArchive understands yt-dlp archive IDs"""
+    from app.scrapers.video_archive import VideoArchive
+    
+    archive = VideoArchive(["7123456789"])
+    assert "tiktok 7123456789" in archive
+    assert "tiktok 7987654321" not in archive
+    
+    archive.add("tiktok 7987654321")
+    assert "tiktok 7987654321" in archive
+    assert len(archive) == 2
+
+
+def test_hashtag_normalization():
+    """Hashtags are stored lowercase, without '#', once per video"""
+    from app.models.models import VideoHashtag
+    
+    assert VideoHashtag.normalize(["#FYP", "fyp", " Comedy ", "", None]) == ["fyp", "comedy"]
+    assert VideoHashtag.normalize(None) == []
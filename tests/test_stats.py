@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.models.database import Base
+from app.models.models import Job, Video, ScheduledJob, JobStatus, VideoStatus
+from app.models.counters import register_counters, aggregate_counters, read_counters
+
+
+@pytest.mark.asyncio
+async def test_counters_match_aggregates():
+    """Counters maintained on flush match a full GROUP BY recount"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    register_counters()
+
+    async with Session() as db:
+        job = Job(id="job1", mode="user", value="someone")
+        db.add(job)
+        db.add(ScheduledJob(id="s1", name="hourly", mode="user", value="someone", enabled=False))
+        db.add_all([
+            Video(id=f"v{i}", job_id="job1", url="u", author_username="someone", file_size=100)
+            for i in range(3)
+        ])
+        await db.commit()
+
+        job.status = JobStatus.COMPLETED.value
+        video = await db.get(Video, "v0")
+        video.status = VideoStatus.UPLOADED.value
+        video.file_size = 250
+        await db.delete(await db.get(Video, "v1"))
+        await db.commit()
+
+        counters = await read_counters(db)
+        expected = await aggregate_counters(db)
+
+    await engine.dispose()
+
+    assert counters['jobs.completed'] == 1
+    assert counters['videos.total'] == 2
+    assert counters['videos.storage_bytes'] == 350
+    assert counters['scheduled.enabled'] == 0
+    for name, value in expected.items():
+        assert counters[name] == value
+
+
+@pytest.mark.asyncio
+async def test_counters_accept_enum_statuses():
+    """Statuses assigned as enum members count under their string value"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    register_counters()
+
+    async with Session() as db:
+        db.add(Job(id="job1", mode="user", value="someone", status=JobStatus.RUNNING))
+        db.add(Video(id="v0", job_id="job1", url="u", author_username="someone",
+                     status=VideoStatus.FAILED.value))
+        await db.commit()
+
+        # As retry_video_download does
+        video = await db.get(Video, "v0")
+        video.status = VideoStatus.PENDING
+        await db.commit()
+
+        counters = await read_counters(db)
+        expected = await aggregate_counters(db)
+
+    await engine.dispose()
+
+    assert counters['videos.failed'] == 0 and counters['videos.pending'] == 1
+    assert counters['jobs.running'] == 1
+    assert not any('Status.' in name for name in counters)
+    for name, value in expected.items():
+        assert counters[name] == value
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_batch_download_failures(monkeypatch):
+    """Placeholder rows created and failed by batch_download keep counters in step"""
+    from app.models import database
+    from app.scrapers.ytdlp_scraper import create_pending_videos, mark_videos_failed
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", Session)
+    register_counters()
+
+    async with Session() as db:
+        db.add(Job(id="job1", mode="user", value="someone"))
+        await db.commit()
+
+    created = await create_pending_videos("job1", "someone", [{'id': "v0"}, {'id': "v1"}])
+    await mark_videos_failed(sorted(created), "yt-dlp download failed")
+
+    async with Session() as db:
+        counters = await read_counters(db)
+        expected = await aggregate_counters(db)
+
+    await engine.dispose()
+
+    assert counters['videos.pending'] == 0 and counters['videos.failed'] == 2
+    for name, value in expected.items():
+        assert counters[name] == value
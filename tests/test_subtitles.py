@@ -0,0 +1,128 @@
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from app.utils.subtitle_generator import iter_audio_chunks, load_audio, format_timestamp, SAMPLE_RATE
+
+requires_ffmpeg = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg not installed")
+
+
+@pytest.fixture
+def tone_video(tmp_path):
+    """3 second test clip with a sine tone"""
+    path = tmp_path / "tone.mp4"
+    subprocess.run([
+        "ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=3",
+        "-f", "lavfi", "-i", "color=c=black:s=64x64:d=3", "-shortest", "-y", str(path)
+    ], check=True)
+    return path
+
+
+@requires_ffmpeg
+def test_load_audio_streams_without_temp_file(tone_video):
+    """Test audio is decoded to float32 in memory with no .wav left behind"""
+    audio = load_audio(tone_video)
+    
+    assert audio.dtype.name == "float32"
+    assert abs(len(audio) / SAMPLE_RATE - 3) < 0.1
+    assert abs(audio).max() <= 1.0
+    assert not list(tone_video.parent.glob("*.wav"))
+
+
+@requires_ffmpeg
+def test_iter_audio_chunks(tone_video):
+    """Test long audio is split into fixed-size chunks"""
+    chunks = list(iter_audio_chunks(tone_video, chunk_seconds=1))
+    
+    assert len(chunks) == 3
+    assert len(chunks[0]) == SAMPLE_RATE
+
+
+def test_iter_audio_chunks_survives_noisy_stderr(monkeypatch):
+    """Test a decoder flooding stderr can't deadlock the stdout reader"""
+    import sys
+    import threading
+    from app.utils import subtitle_generator
+    
+    script = (
+        "import sys; sys.stderr.write('corrupt frame\\n' * 20000); sys.stderr.flush(); "
+        "sys.stdout.buffer.write(bytes(SAMPLE_RATE * 2)); sys.exit(1)"
+    ).replace("SAMPLE_RATE", str(SAMPLE_RATE))
+    monkeypatch.setattr(subtitle_generator, "_ffmpeg_audio_command", lambda path: [sys.executable, "-c", script])
+    
+    outcome = {}
+    
+    def decode():
+        try:
+            outcome['chunks'] = list(iter_audio_chunks(Path("corrupt.mp4"), chunk_seconds=1))
+        except RuntimeError as e:
+            outcome['error'] = str(e)
+    
+    thread = threading.Thread(target=decode, daemon=True)
+    thread.start()
+    thread.join(10)
+    
+    assert not thread.is_alive()
+    assert "corrupt frame" in outcome['error']
+
+
+def test_format_timestamp():
+    """Test SRT timestamp formatting"""
+    assert format_timestamp(0) == "00:00:00,000"
+    assert format_timestamp(3725.5) == "01:02:05,500"
+
+
+def test_transcript_cache_roundtrip(tmp_path):
+    """Test cached segments are returned for the same key"""
+    from app.utils.transcript_cache import TranscriptCache
+    
+    cache = TranscriptCache(cache_dir=str(tmp_path), max_mb=1)
+    key = cache.make_key("abc123", "Original Sound", "someone")
+    segments = [{'start': 0.0, 'end': 1.5, 'text': "مرحبا"}]
+    
+    assert cache.get(key) is None
+    cache.put(key, segments)
+    assert cache.get(key) == segments
+    
+    # Music hint is part of the key
+    assert cache.make_key("abc123") != key
+
+
+def test_transcript_cache_lru_eviction(tmp_path):
+    """Test least recently used entries are evicted past the size limit"""
+    import os
+    from app.utils.transcript_cache import TranscriptCache
+    
+    cache = TranscriptCache(cache_dir=str(tmp_path), max_mb=0)
+    cache.max_bytes = 3000
+    segments = [{'start': 0.0, 'end': 1.0, 'text': "x" * 900}]
+    
+    for i, key in enumerate(["old", "used", "new"]):
+        cache.put(key, segments)
+        os.utime(tmp_path / f"{key}.json", (i, i))
+    
+    # Touch "used" so it becomes most recent
+    assert cache.get("used") is not None
+    cache.put("newest", segments)
+    
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("newest") is not None
+
+
+def test_chunks_fingerprint_covers_whole_track():
+    """Test tracks sharing an opening chunk get different fingerprints"""
+    import numpy as np
+    from app.utils.transcript_cache import chunks_fingerprint
+    
+    rng = np.random.default_rng(0)
+    opening = rng.standard_normal(SAMPLE_RATE * 2).astype(np.float32)
+    ending_a = rng.standard_normal(SAMPLE_RATE).astype(np.float32)
+    ending_b = rng.standard_normal(SAMPLE_RATE).astype(np.float32)
+    
+    track = chunks_fingerprint([opening, ending_a])
+    assert track != chunks_fingerprint([opening, ending_b])
+    assert track != chunks_fingerprint([opening])
+    assert track != chunks_fingerprint([opening, ending_a[:SAMPLE_RATE // 2]])
+    # Volume changes keep the envelope's rise/fall pattern
+    assert track == chunks_fingerprint([opening * 0.5, ending_a * 0.5])
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.workers import transcription_pool
+from app.workers.transcription_pool import TranscriptionService
+
+
+@pytest.mark.asyncio
+async def test_transcription_deduplicates_by_video_id(monkeypatch):
+    """Test concurrent requests for the same video share one job"""
+    calls = []
+    
+    def fake_transcribe(video_path: str, hint=None):
+        calls.append(video_path)
+        time.sleep(0.2)
+        return video_path.replace(".mp4", ".ar.srt")
+    
+    monkeypatch.setattr(transcription_pool, "_transcribe", fake_transcribe)
+    
+    service = TranscriptionService(max_workers=2)
+    service._executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        results = await asyncio.gather(
+            service.transcribe("123", Path("/tmp/123.mp4")),
+            service.transcribe("123", Path("/tmp/123.mp4")),
+            service.transcribe("456", Path("/tmp/456.mp4")),
+        )
+    finally:
+        service.shutdown()
+    
+    assert results[0] == results[1] == Path("/tmp/123.ar.srt")
+    assert results[2] == Path("/tmp/456.ar.srt")
+    assert sorted(calls) == ["/tmp/123.mp4", "/tmp/456.mp4"]
+    assert service.queue_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_transcription_batch_reports_throughput(monkeypatch):
+    """Test batch API returns one SRT per video and throughput stats"""
+    def fake_transcribe_batch(video_paths, hints=None):
+        results = {p: p.replace(".mp4", ".ar.srt") for p in video_paths}
+        return results, {'audio_seconds': 30.0 * len(video_paths)}
+    
+    monkeypatch.setattr(transcription_pool, "_transcribe_batch", fake_transcribe_batch)
+    
+    service = TranscriptionService(max_workers=2)
+    service._executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        results = await service.transcribe_batch({
+            "1": Path("/tmp/1.mp4"),
+            "2": Path("/tmp/2.mp4"),
+            "3": Path("/tmp/3.mp4"),
+        })
+    finally:
+        service.shutdown()
+    
+    assert results == {
+        "1": Path("/tmp/1.ar.srt"),
+        "2": Path("/tmp/2.ar.srt"),
+        "3": Path("/tmp/3.ar.srt"),
+    }
+    assert service.last_batch_stats['videos'] == 3
+    assert service.last_batch_stats['audio_seconds'] == 90.0
+    assert service.last_batch_stats['throughput'] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_releases_deduplicated_callers(monkeypatch):
+    """Test callers waiting on a cancelled batch's videos get an error, not a cancellation"""
+    def slow_transcribe_batch(video_paths, hints=None):
+        time.sleep(0.5)
+        return {}, {'audio_seconds': 0.0}
+    
+    monkeypatch.setattr(transcription_pool, "_transcribe_batch", slow_transcribe_batch)
+    
+    service = TranscriptionService(max_workers=1)
+    service._executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        batch = asyncio.create_task(service.transcribe_batch({"1": Path("/tmp/1.mp4")}))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(service.transcribe("1", Path("/tmp/1.mp4")))
+        await asyncio.sleep(0.05)
+        
+        batch.cancel()
+        with pytest.raises(RuntimeError, match="transcription cancelled"):
+            await asyncio.wait_for(waiter, 1)
+        assert not waiter.cancelled()
+        assert service.queue_size() == 0
+    finally:
+        service.shutdown()
@@ -0,0 +1,62 @@
+import os
+import time
+import pytest
+from app.workers.ytdlp_pool import YtdlpWorkerPool, YtdlpJobCancelled, _collect_files
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_in_separate_process():
+    """Test jobs run outside the API process"""
+    pool = YtdlpWorkerPool(max_workers=1)
+    try:
+        worker_pid = await pool.run(os.getpid, timeout=60)
+        assert worker_pid != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout():
+    """Test per-call timeout raises YtdlpJobCancelled"""
+    pool = YtdlpWorkerPool(max_workers=1)
+    try:
+        with pytest.raises(YtdlpJobCancelled):
+            await pool.run(time.sleep, 5, timeout=0.5)
+    finally:
+        pool.shutdown()
+
+
+def wait_for_cancel(seconds, cancel_event=None):
+    """Worker job that runs until cancelled"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if cancel_event.is_set():
+            return "cancelled"
+        time.sleep(0.05)
+    return "finished"
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout_frees_running_worker():
+    """A cancellable job that times out stops and frees its worker"""
+    pool = YtdlpWorkerPool(max_workers=1)
+    try:
+        await pool.run(os.getpid, timeout=60)  # worker process is up
+        with pytest.raises(YtdlpJobCancelled):
+            await pool.run(wait_for_cancel, 30, timeout=0.5, cancellable=True)
+        # Only one worker: this runs only once the cancelled job has returned
+        assert await pool.run(os.getpid, timeout=10) != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+def test_collect_files_from_playlist():
+    """Test downloaded file paths are collected from playlist entries"""
+    info = {
+        'entries': [
+            {'id': '1', 'requested_downloads': [{'filepath': '/tmp/1.mp4'}]},
+            None,
+            {'id': '2', 'requested_downloads': [{'filepath': '/tmp/2.mp4'}]},
+        ]
+    }
+    assert _collect_files(info) == ['/tmp/1.mp4', '/tmp/2.mp4']